@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Plik: ai_cache.py
+# ai_cache.py - Trwały cache odpowiedzi AI dla SmartFlowAI
+
+"""
+Cache odpowiedzi OpenAI adresowany treścią zapytania.
+
+Klucz to skrót SHA-256 z w pełni wyrenderowanego promptu, modelu,
+max_tokens i temperature - identyczna analiza (ten sam proces, głębokość,
+kontekst firmy) zwraca zapisaną odpowiedź bez wywołania API.
+
+Wpisy przechowywane są w lokalnej bazie SQLite, mają TTL i są usuwane
+według zasady LRU po przekroczeniu maksymalnej liczby wpisów.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Domyślne ustawienia cache (nadpisywane zmiennymi środowiskowymi)
+DEFAULT_CACHE_PATH = os.path.join("data", "ai_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # 7 dni
+DEFAULT_MAX_ENTRIES = 1000
+
+
+class AICache:
+    """Trwały cache odpowiedzi AI z TTL i ograniczeniem rozmiaru (LRU)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        # Jedno połączenie współdzielone przez wątki Streamlit (chronione lockiem)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ai_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ai_cache_last_access ON ai_cache(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, max_tokens: int, temperature: float, response_format: dict = None) -> str:
+        """Buduje klucz cache z pełnego promptu i parametrów modelu"""
+        params = {"prompt": prompt, "model": model, "max_tokens": max_tokens, "temperature": temperature}
+        if response_format is not None:
+            # Odpowiedź w innym formacie (np. JSON schema) to inny wpis
+            params["response_format"] = response_format
+        payload = json.dumps(params, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Zwraca zapisaną odpowiedź lub None (brak wpisu / wpis przeterminowany)"""
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM ai_cache WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                response, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.misses += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE ai_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                    (now, key)
+                )
+                self._conn.commit()
+                self.hits += 1
+                return response
+            except sqlite3.Error as e:
+                # Awaria cache nie może blokować analizy - traktuj jak chybienie
+                logger.error(f"AI_CACHE_GET_ERROR: {str(e)}")
+                self.misses += 1
+                return None
+
+    def set(self, key: str, response: str):
+        """Zapisuje odpowiedź i usuwa najdawniej używane wpisy ponad limit"""
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ai_cache (key, response, created_at, last_access, hit_count) "
+                    "VALUES (?, ?, ?, ?, 0)",
+                    (key, response, now, now)
+                )
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"AI_CACHE_SET_ERROR: {str(e)}")
+
+    def _evict(self):
+        """Usuwa przeterminowane wpisy oraz nadmiarowe wpisy LRU (wywoływane pod lockiem)"""
+        self._conn.execute("DELETE FROM ai_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.execute("""
+            DELETE FROM ai_cache WHERE key IN (
+                SELECT key FROM ai_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def clear(self):
+        """Czyści cały cache i liczniki"""
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Zwraca statystyki cache: trafienia, chybienia, liczba wpisów"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries
+        }
+
+
+def cache_from_env() -> Optional[AICache]:
+    """Tworzy cache na podstawie zmiennych środowiskowych (None gdy wyłączony)"""
+    if os.getenv("AI_CACHE_ENABLED", "true").lower() in ("0", "false", "no", "off"):
+        return None
+
+    return AICache(
+        path=os.getenv("AI_CACHE_PATH", DEFAULT_CACHE_PATH),
+        ttl_seconds=int(os.getenv("AI_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    )
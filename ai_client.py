@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+# Plik: ai_client.py
+# ai_client.py - Współdzielony klient OpenAI z pulą połączeń
+
+"""
+Klienci OpenAI (synchroniczny i asynchroniczny) z pulą połączeń keep-alive.
+
+Jeden klient na proces oznacza, że kolejne analizy - z różnych sesji
+Streamlit, wątków workera czy CLI - korzystają z już otwartych połączeń
+TLS zamiast nawiązywać nowe przy każdym zapytaniu.
+
+- request_timeout: limit czasu zależny od głębokości analizy
+- concurrency_slot / async_concurrency_slot: ograniczenie liczby równoległych
+  zapytań do API w obrębie procesu (nadmiar czeka na wolne miejsce)
+- call_with_retry / acall_with_retry: ponowienia błędów przejściowych (429,
+  5xx, zerwane połączenie) z uwzględnieniem Retry-After i wykładniczym
+  opóźnieniem z losowym rozrzutem, poprzedzone limiterem RPM/TPM wspólnym
+  dla wszystkich sesji procesu; po wyczerpaniu prób zgłaszany jest
+  AnalysisError - błąd nigdy nie jest zwracany jako tekst analizy
+
+Konfiguracja (zmienne środowiskowe): OPENAI_MAX_CONNECTIONS,
+OPENAI_MAX_KEEPALIVE, OPENAI_MAX_CONCURRENCY, OPENAI_CONNECT_TIMEOUT,
+OPENAI_MAX_RETRIES, OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT (0 wyłącza limit).
+
+Pakiety openai i httpx (ok. 0,5 s importu) ładowane są dopiero przy
+tworzeniu pierwszego klienta - import modułu ich nie wymaga, a LazyClient
+odkłada utworzenie klienta do pierwszego zapytania.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Tylko adnotacje typów - w czasie działania pakiety ładowane są leniwie
+    import httpx
+    import openai
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_CONNECT_TIMEOUT = 10.0
+KEEPALIVE_EXPIRY = 120.0
+
+# Limit czasu odpowiedzi (odczytu) w sekundach dla głębokości analizy
+DEPTH_TIMEOUTS = {
+    "Podstawowa (szybka)": 60.0,
+    "Pogłębiona (z wyszukiwaniem)": 120.0,
+    "Ekspercka (pełna analiza)": 180.0,
+}
+DEFAULT_READ_TIMEOUT = 120.0
+
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+MAX_RETRY_AFTER = 60.0
+# Limity konta OpenAI (gpt-4o, tier 1) - do nadpisania zmiennymi środowiskowymi
+DEFAULT_RPM_LIMIT = 500
+DEFAULT_TPM_LIMIT = 30000
+# Kody HTTP, po których ponowienie ma sens
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisError(Exception):
+    """Analiza AI nie powiodła się (po wyczerpaniu ponowień lub przy błędzie trwałym)"""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        # Czy ponowienie później ma szansę powodzenia (np. 429, a nie błędny klucz API)
+        self.retryable = retryable
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def connection_limits() -> "httpx.Limits":
+    """Limity puli połączeń HTTP"""
+    import httpx
+    return httpx.Limits(
+        max_connections=_env_int("OPENAI_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=_env_int("OPENAI_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE),
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+def request_timeout(analysis_depth: str) -> "openai.Timeout":
+    """Limit czasu zapytania - dłuższy dla głębszej analizy, krótki na nawiązanie połączenia"""
+    import openai
+    read_timeout = DEPTH_TIMEOUTS.get(analysis_depth, DEFAULT_READ_TIMEOUT)
+    connect_timeout = float(os.getenv("OPENAI_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+    return openai.Timeout(read_timeout, connect=connect_timeout)
+
+
+def create_openai_client(api_key: str) -> "openai.OpenAI":
+    """Synchroniczny klient z pulą połączeń keep-alive"""
+    import openai
+    return openai.OpenAI(
+        api_key=api_key,
+        timeout=openai.Timeout(DEFAULT_READ_TIMEOUT, connect=DEFAULT_CONNECT_TIMEOUT),
+        max_retries=0,  # Ponowienia obsługuje call_with_retry
+        http_client=openai.DefaultHttpxClient(limits=connection_limits())
+    )
+
+
+def create_async_openai_client(api_key: str) -> "openai.AsyncOpenAI":
+    """Asynchroniczny klient z pulą połączeń keep-alive"""
+    import openai
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        timeout=openai.Timeout(DEFAULT_READ_TIMEOUT, connect=DEFAULT_CONNECT_TIMEOUT),
+        max_retries=0,
+        http_client=openai.DefaultAsyncHttpxClient(limits=connection_limits())
+    )
+
+
+class LazyClient:
+    """Klient tworzony przy pierwszym użyciu atrybutu (np. chat) przez podaną fabrykę"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+
+    def __getattr__(self, name):
+        # Sprawdzenia typu (mock.patch, inspect, copy) pytają o atrybuty prywatne i __dunder__ -
+        # nie mogą tworzyć klienta (bez OPENAI_API_KEY fabryka zgłosiłaby błąd)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._client is None:
+            self._client = self._factory()
+        return getattr(self._client, name)
+
+
+# Ograniczenie równoległych zapytań - wspólne dla wszystkich wątków procesu
+_semaphore = threading.BoundedSemaphore(_env_int("OPENAI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+
+
+@contextmanager
+def concurrency_slot():
+    """Zajmuje jedno z OPENAI_MAX_CONCURRENCY miejsc na czas zapytania"""
+    with _semaphore:
+        yield
+
+
+# Klient asynchroniczny i semafor są związane z pętlą zdarzeń - jeden na pętlę
+_async_clients = weakref.WeakKeyDictionary()
+_async_semaphores = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def get_async_openai_client(api_key: str) -> "openai.AsyncOpenAI":
+    """Klient asynchroniczny współdzielony w obrębie bieżącej pętli zdarzeń"""
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = create_async_openai_client(api_key)
+        return client
+
+
+@asynccontextmanager
+async def async_concurrency_slot():
+    """Asynchroniczny odpowiednik concurrency_slot (limit na pętlę zdarzeń)"""
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        semaphore = _async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = _async_semaphores[loop] = asyncio.Semaphore(
+                _env_int("OPENAI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+            )
+    async with semaphore:
+        yield
+
+
+class TokenBucket:
+    """Wiadro tokenów uzupełniane liniowo do `per_minute` na minutę.
+
+    Rezerwacja zawsze się udaje (poziom może spaść poniżej zera) i zwraca
+    czas oczekiwania - dzięki temu kolejne zapytania ustawiają się w kolejce
+    bez trzymania blokady podczas czekania.
+    """
+
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Pobiera `amount` z wiadra, zwraca ile sekund trzeba odczekać"""
+        self._refill()
+        # Zapytanie większe niż całe wiadro czekałoby w nieskończoność
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float):
+        """Koryguje poziom o różnicę między szacunkiem a faktycznym zużyciem"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Limiter zapytań/min i tokenów/min po stronie klienta, wspólny dla wątków procesu"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, clock=time.monotonic):
+        self.clock = clock
+        self.requests = TokenBucket(requests_per_minute, clock) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, clock) if tokens_per_minute > 0 else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Rezerwuje miejsce na jedno zapytanie, zwraca czas oczekiwania w sekundach"""
+        with self._lock:
+            wait = max(0.0, self._paused_until - self.clock())
+            if self.requests:
+                wait = max(wait, self.requests.reserve(1))
+            if self.tokens:
+                wait = max(wait, self.tokens.reserve(tokens))
+            return wait
+
+    def settle(self, estimated: int, actual):
+        """Rozlicza faktyczne zużycie tokenów z odpowiedzi (usage.total_tokens)"""
+        if self.tokens and isinstance(actual, int):
+            with self._lock:
+                self.tokens.refund(estimated - actual)
+
+    def pause(self, seconds: float):
+        """Wstrzymuje wszystkie zapytania - np. po 429 z nagłówkiem Retry-After"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+    def acquire(self, tokens: int, sleep=time.sleep):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            sleep(wait)
+
+    async def acquire_async(self, tokens: int):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+rate_limiter = RateLimiter(
+    _env_int("OPENAI_RPM_LIMIT", DEFAULT_RPM_LIMIT),
+    _env_int("OPENAI_TPM_LIMIT", DEFAULT_TPM_LIMIT)
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Błędy przejściowe: limit zapytań, przeciążenie, timeout, zerwane połączenie"""
+    import openai
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def retry_after(error: Exception):
+    """Czas oczekiwania z nagłówków Retry-After / retry-after-ms (None gdy brak)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return min(MAX_RETRY_AFTER, max(0.0, float(value) / 1000))
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            # Retry-After może też być datą HTTP
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        return min(MAX_RETRY_AFTER, max(0.0, seconds))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Wykładnicze opóźnienie z losowym rozrzutem (połowa stała, połowa losowa)"""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _max_retries(max_retries):
+    return _env_int("OPENAI_MAX_RETRIES", DEFAULT_MAX_RETRIES) if max_retries is None else max_retries
+
+
+def _next_delay(error: Exception, attempt: int, max_retries: int) -> float:
+    """Opóźnienie przed kolejną próbą albo AnalysisError, gdy ponawiać nie należy"""
+    retryable = is_retryable(error)
+    if not retryable or attempt >= max_retries:
+        raise AnalysisError(f"Błąd analizy: {str(error)}", retryable=retryable) from error
+
+    delay = retry_after(error)
+    if delay is not None:
+        # Serwer wskazał czas - wstrzymujemy wszystkie sesje, nie tylko tę
+        rate_limiter.pause(delay)
+    else:
+        delay = backoff_delay(attempt)
+    logger.warning(f"OPENAI_RETRY: próba {attempt + 1}/{max_retries + 1}, ponowienie za {delay:.1f}s: {str(error)}")
+    return delay
+
+
+def call_with_retry(request, estimated_tokens: int, max_retries: int = None, hold_slot: bool = True, sleep=time.sleep):
+    """Wywołuje request() z limiterem, ograniczeniem równoległości i ponowieniami.
+
+    estimated_tokens - tokeny promptu + max_tokens (OpenAI wlicza max_tokens do limitu TPM).
+
+    hold_slot=False - wywołujący sam trzyma concurrency_slot (np. na czas strumienia).
+    """
+    max_retries = _max_retries(max_retries)
+    attempt = 0
+    while True:
+        rate_limiter.acquire(estimated_tokens, sleep)
+        try:
+            if hold_slot:
+                with concurrency_slot():
+                    response = request()
+            else:
+                response = request()
+        except Exception as e:
+            sleep(_next_delay(e, attempt, max_retries))
+            attempt += 1
+            continue
+        rate_limiter.settle(estimated_tokens, getattr(getattr(response, "usage", None), "total_tokens", None))
+        return response
+
+
+async def acall_with_retry(request, estimated_tokens: int, max_retries: int = None):
+    """Asynchroniczny odpowiednik call_with_retry - request to funkcja zwracająca korutynę"""
+    max_retries = _max_retries(max_retries)
+    attempt = 0
+    while True:
+        await rate_limiter.acquire_async(estimated_tokens)
+        try:
+            async with async_concurrency_slot():
+                response = await request()
+        except Exception as e:
+            await asyncio.sleep(_next_delay(e, attempt, max_retries))
+            attempt += 1
+            continue
+        rate_limiter.settle(estimated_tokens, getattr(getattr(response, "usage", None), "total_tokens", None))
+        return response
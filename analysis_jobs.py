@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: analysis_jobs.py
+# analysis_jobs.py - Kolejka analiz AI wykonywanych w tle
+
+"""
+Kolejka zadań analizy AI oparta o tabelę business_processes.
+
+Zgłoszenie zapisuje proces ze statusem 'pending' (bez analizy), worker
+przejmuje go atomowym UPDATE ... WHERE analysis_status = 'pending',
+wykonuje zapytanie do OpenAI i zapisuje ai_analysis ze statusem
+'completed' (lub 'failed' z opisem błędu). Interfejs jedynie odpytuje
+status - odświeżenie przeglądarki nie przerywa analizy.
+
+Worker co HEARTBEAT_SECONDS odświeża analysis_started_at wykonywanych zadań,
+więc jako porzucone wracają do kolejki tylko zadania workera, który przestał
+działać - nie analizy trwające długo (ponowienia, głęboka analiza).
+
+Worker może działać w procesie Streamlit (wątek w tle) albo osobno:
+python analysis_jobs.py [--workers 4] [--poll-interval 2]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import process_views
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+DEFAULT_WORKERS = 4
+DEFAULT_POLL_INTERVAL = 2.0
+# Zadanie 'running' bez odświeżenia analysis_started_at przez tyle sekund uznajemy za porzucone (np. restart workera)
+STALE_JOB_SECONDS = 600
+# Co ile sekund worker odświeża analysis_started_at swoich zadań - wielokrotnie częściej niż STALE_JOB_SECONDS
+HEARTBEAT_SECONDS = STALE_JOB_SECONDS / 10
+MAX_ATTEMPTS = 3
+
+TABLE = "business_processes"
+PARAM_FIELDS = ("analysis_depth", "company_size", "industry", "budget")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def enqueue_analysis(client, user_id: str, title: str, description: str, analysis_depth: str,
+                     company_size: str = "", industry: str = "", budget: str = ""):
+    """Zapisuje proces oczekujący na analizę, zwraca jego id (None przy błędzie)"""
+    try:
+        result = client.table(TABLE).insert({
+            'user_id': user_id,
+            'title': title,
+            'description': description,
+            'analysis_depth': analysis_depth,
+            'industry': industry or None,
+            'analysis_status': STATUS_PENDING,
+            'analysis_params': {
+                'analysis_depth': analysis_depth,
+                'company_size': company_size,
+                'industry': industry,
+                'budget': budget
+            }
+        }).execute()
+        return result.data[0]['id'] if result.data else None
+    except Exception as e:
+        logger.error(f"ENQUEUE_ANALYSIS_ERROR: {str(e)}")
+        return None
+
+
+def get_job_statuses(client, user_id: str, job_ids) -> dict:
+    """Zwraca {id: wiersz ze statusem} dla zadań użytkownika"""
+    if not job_ids:
+        return {}
+    try:
+        query = client.table(TABLE).select(process_views.columns(process_views.JOB_STATUS))
+        result = query.eq('user_id', user_id).in_('id', list(job_ids)).execute()
+        return {row['id']: row for row in result.data or []}
+    except Exception as e:
+        logger.error(f"JOB_STATUS_ERROR: {str(e)}")
+        return {}
+
+
+def retry_job(client, user_id: str, job_id) -> bool:
+    """Ponownie kolejkuje zadanie zakończone błędem"""
+    try:
+        result = client.table(TABLE).update({
+            'analysis_status': STATUS_PENDING,
+            'analysis_error': None,
+            'analysis_attempts': 0
+        }).eq('id', job_id).eq('user_id', user_id).eq('analysis_status', STATUS_FAILED).execute()
+        return bool(result.data)
+    except Exception as e:
+        logger.error(f"RETRY_JOB_ERROR: {str(e)}")
+        return False
+
+
+def fetch_pending(client, limit: int):
+    """Najstarsze oczekujące zadania"""
+    query = client.table(TABLE).select(process_views.columns(process_views.JOB_QUEUE))
+    result = query.eq('analysis_status', STATUS_PENDING).order('created_at').limit(limit).execute()
+    return result.data or []
+
+
+def claim_job(client, job: dict) -> bool:
+    """Atomowo przejmuje zadanie - tylko jeden worker zmieni status z 'pending'"""
+    result = client.table(TABLE).update({
+        'analysis_status': STATUS_RUNNING,
+        'analysis_started_at': _now(),
+        'analysis_attempts': (job.get('analysis_attempts') or 0) + 1
+    }).eq('id', job['id']).eq('analysis_status', STATUS_PENDING).execute()
+    return bool(result.data)
+
+
+def touch_jobs(client, job_ids):
+    """Odświeża analysis_started_at zadań wciąż wykonywanych przez ten worker (heartbeat)"""
+    query = client.table(TABLE).update({'analysis_started_at': _now()})
+    query.in_('id', list(job_ids)).eq('analysis_status', STATUS_RUNNING).execute()
+
+
+def requeue_stale_jobs(client, stale_seconds: int = STALE_JOB_SECONDS):
+    """Zwraca do kolejki zadania porzucone przez worker, który przestał działać"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)).isoformat()
+    requeue = client.table(TABLE).update({'analysis_status': STATUS_PENDING}).eq('analysis_status', STATUS_RUNNING)
+    requeue.lt('analysis_started_at', cutoff).lt('analysis_attempts', MAX_ATTEMPTS).execute()
+    give_up = client.table(TABLE).update({
+        'analysis_status': STATUS_FAILED,
+        'analysis_error': 'Przekroczono limit prób analizy'
+    }).eq('analysis_status', STATUS_RUNNING)
+    give_up.lt('analysis_started_at', cutoff).gte('analysis_attempts', MAX_ATTEMPTS).execute()
+
+
+def run_job(client, job: dict, analyze_fn) -> bool:
+    """Wykonuje analizę przejętego zadania i zapisuje wynik (lub błąd)"""
+    params = job.get('analysis_params') or {}
+    try:
+        # Błąd API (po ponowieniach w ai_client) zgłaszany jest wyjątkiem - nie trafia do ai_analysis
+        analysis = analyze_fn(job['title'], job['description'], *(params.get(field, "") for field in PARAM_FIELDS))
+        if not analysis:
+            raise RuntimeError("Pusta odpowiedź AI")
+
+        update = {'ai_analysis': str(analysis), 'analysis_status': STATUS_COMPLETED, 'analysis_error': None}
+        # Metryki z ustrukturyzowanej odpowiedzi (analysis_output.AnalysisResult)
+        update.update(getattr(analysis, 'metrics', {}))
+        succeeded = True
+    except Exception as e:
+        logger.error(f"ANALYSIS_JOB_ERROR: zadanie {job['id']}: {str(e)}")
+        update = {'analysis_status': STATUS_FAILED, 'analysis_error': str(e)[:1000]}
+        succeeded = False
+
+    # Warunek na 'running' - proces usunięty lub przejęty ponownie nie zostanie nadpisany
+    client.table(TABLE).update(update).eq('id', job['id']).eq('analysis_status', STATUS_RUNNING).execute()
+    return succeeded
+
+
+class AnalysisWorker:
+    """Pula wątków wykonująca zadania z kolejki"""
+
+    def __init__(self, client, analyze_fn, workers: int = DEFAULT_WORKERS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.client = client
+        self.analyze_fn = analyze_fn
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis-job")
+        self._running = set()  # id zadań wykonywanych przez ten worker
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_stale_check = None  # Pierwszy cykl od razu podejmuje zadania porzucone przed restartem
+        self._last_heartbeat = time.monotonic()
+
+    def notify(self):
+        """Budzi worker od razu po dodaniu zadania (bez czekania na kolejny cykl)"""
+        self._wakeup.set()
+
+    def _job_finished(self, job_id):
+        with self._lock:
+            self._running.discard(job_id)
+        self._wakeup.set()
+
+    def _execute(self, job):
+        try:
+            return run_job(self.client, job, self.analyze_fn)
+        except Exception as e:
+            # Np. brak połączenia przy zapisie wyniku - zadanie wróci do kolejki jako porzucone
+            logger.error(f"ANALYSIS_JOB_ERROR: zadanie {job['id']}: {str(e)}")
+            return False
+
+    def poll_once(self) -> int:
+        """Przejmuje tyle zadań, ile jest wolnych wątków; zwraca liczbę uruchomionych"""
+        now = time.monotonic()
+        with self._lock:
+            running = set(self._running)
+        if running and now - self._last_heartbeat >= HEARTBEAT_SECONDS:
+            self._last_heartbeat = now
+            touch_jobs(self.client, running)
+        if self._last_stale_check is None or now - self._last_stale_check > HEARTBEAT_SECONDS:
+            self._last_stale_check = now
+            requeue_stale_jobs(self.client)
+
+        free = self.workers - len(running)
+        if free <= 0:
+            return 0
+
+        started = 0
+        for job in fetch_pending(self.client, free):
+            if not claim_job(self.client, job):
+                continue  # Przejęte przez inny worker
+            with self._lock:
+                self._running.add(job['id'])
+            self._executor.submit(self._execute, job).add_done_callback(lambda _, job_id=job['id']: self._job_finished(job_id))
+            started += 1
+        return started
+
+    def run_forever(self):
+        """Pętla workera - do wywołania stop()"""
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"ANALYSIS_WORKER_ERROR: {str(e)}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def start(self):
+        """Uruchamia pętlę w wątku w tle (tryb wbudowany w proces Streamlit)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="analysis-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        self._wakeup.set()
+        self._executor.shutdown(wait=wait)
+
+
+def worker_mode() -> str:
+    """ANALYSIS_WORKER_MODE: 'inprocess' (wątek w procesie Streamlit) lub 'external' (osobny proces)"""
+    return os.getenv("ANALYSIS_WORKER_MODE", "inprocess").lower()
+
+
+def main(argv=None):
+    """Punkt wejścia osobnego procesu workera"""
+    parser = argparse.ArgumentParser(description="SmartFlowAI - worker analiz AI w tle")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ANALYSIS_WORKERS", DEFAULT_WORKERS)),
+                        help="Liczba równoległych analiz")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Co ile sekund sprawdzać kolejkę")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Import aplikacji dopiero tutaj - inicjalizuje klientów Supabase i OpenAI
+    from smartflowai.ai import analyze_with_ai
+    from smartflowai.storage import supabase
+
+    worker = AnalysisWorker(supabase, analyze_with_ai, args.workers, args.poll_interval)
+    print(f"🤖 Worker analiz uruchomiony ({args.workers} wątków), Ctrl+C aby zakończyć")
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        print("\nZatrzymywanie workera - kończę rozpoczęte analizy...")
+        worker.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
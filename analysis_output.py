@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Plik: analysis_output.py
+# analysis_output.py - Ustrukturyzowana odpowiedź analizy AI (JSON schema)
+
+"""
+Odpowiedź analizy AI w formacie JSON zgodnym ze schematem.
+
+Model zwraca obiekt z polem "analysis" (pełna analiza w markdown, jak
+dotąd) oraz metrykami zapisywanymi do osobnych kolumn business_processes:
+automation_potential, time_savings_hours, cost_savings_annual,
+implementation_difficulty, recommended_tools, next_steps. Dzięki temu
+sortowanie i agregacje wykonuje baza, bez parsowania tekstu analizy.
+
+- parse_analysis: walidacja odpowiedzi; tekst, który nie jest JSON-em
+  (np. stare wpisy cache), traktowany jest jako sama analiza bez metryk
+- AnalysisStreamExtractor: wyciąga tekst pola "analysis" z fragmentów
+  strumienia na bieżąco - użytkownik widzi analizę, nie surowy JSON
+"""
+
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTY_LEVELS = ["Łatwa", "Średnia", "Trudna"]
+
+# Zakresy kolumn w business_processes (DECIMAL(10,2), DECIMAL(15,2), VARCHAR(50))
+MAX_TIME_SAVINGS_HOURS = 99999999.99
+MAX_COST_SAVINGS = 9999999999999.99
+MAX_DIFFICULTY_LENGTH = 50
+
+# Pole "analysis" jest pierwsze - przy strumieniowaniu tekst pojawia się od razu
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {
+            "type": "string",
+            "description": "Pełna analiza procesu w markdown, w formacie opisanym w instrukcji"
+        },
+        "automation_potential": {
+            "type": "integer",
+            "description": "Potencjał automatyzacji procesu w procentach (0-100)"
+        },
+        "time_savings_hours": {
+            "type": "number",
+            "description": "Szacowana oszczędność czasu w godzinach miesięcznie"
+        },
+        "cost_savings_annual": {
+            "type": "number",
+            "description": "Szacowana roczna oszczędność netto w złotych"
+        },
+        "implementation_difficulty": {
+            "type": "string",
+            "enum": DIFFICULTY_LEVELS,
+            "description": "Trudność wdrożenia rekomendowanego rozwiązania"
+        },
+        "recommended_tools": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Nazwy rekomendowanych narzędzi"
+        },
+        "next_steps": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Pierwsze konkretne kroki wdrożenia"
+        }
+    },
+    "required": ["analysis", "automation_potential", "time_savings_hours", "cost_savings_annual",
+                 "implementation_difficulty", "recommended_tools", "next_steps"],
+    "additionalProperties": False
+}
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "process_analysis", "strict": True, "schema": ANALYSIS_SCHEMA}
+}
+
+METRIC_COLUMNS = ("automation_potential", "time_savings_hours", "cost_savings_annual",
+                  "implementation_difficulty", "recommended_tools", "next_steps")
+
+
+class AnalysisResult(str):
+    """Tekst analizy (zachowuje się jak str) z metrykami do zapisu w kolumnach"""
+
+    def __new__(cls, analysis: str, metrics: dict = None):
+        result = super().__new__(cls, analysis or "")
+        result.metrics = metrics or {}
+        return result
+
+
+def _number(value, maximum: float):
+    """Liczba nieujemna przycięta do zakresu kolumny (None dla innych typów)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return round(min(max(float(value), 0.0), maximum), 2)
+
+
+def _text_list(value, separator: str):
+    if isinstance(value, list):
+        items = [str(item).strip() for item in value if str(item).strip()]
+        return separator.join(items) or None
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+def extract_metrics(data: dict) -> dict:
+    """Zwalidowane metryki do zapisu (pomija brakujące i niepoprawne wartości)"""
+    metrics = {}
+
+    potential = _number(data.get("automation_potential"), 100)
+    if potential is not None:
+        metrics["automation_potential"] = int(round(potential))
+
+    hours = _number(data.get("time_savings_hours"), MAX_TIME_SAVINGS_HOURS)
+    if hours is not None:
+        metrics["time_savings_hours"] = hours
+
+    savings = _number(data.get("cost_savings_annual"), MAX_COST_SAVINGS)
+    if savings is not None:
+        metrics["cost_savings_annual"] = savings
+
+    difficulty = data.get("implementation_difficulty")
+    if isinstance(difficulty, str) and difficulty.strip():
+        metrics["implementation_difficulty"] = difficulty.strip()[:MAX_DIFFICULTY_LENGTH]
+
+    tools = _text_list(data.get("recommended_tools"), ", ")
+    if tools:
+        metrics["recommended_tools"] = tools
+
+    steps = _text_list(data.get("next_steps"), "\n")
+    if steps:
+        metrics["next_steps"] = steps
+
+    return metrics
+
+
+def parse_analysis(content: str) -> AnalysisResult:
+    """Odpowiedź modelu -> AnalysisResult; tekst spoza schematu to sama analiza"""
+    if not isinstance(content, str) or not content:
+        # Brak treści (np. odmowa modelu) - pusta analiza, wywołujący traktuje ją jako błąd
+        return AnalysisResult("")
+
+    stripped = content.lstrip()
+    if not stripped.startswith("{"):
+        return AnalysisResult(content)
+
+    try:
+        data = json.loads(stripped)
+    except ValueError:
+        # Np. odpowiedź ucięta przez max_tokens - ratujemy tekst analizy, bez metryk
+        logger.error("ANALYSIS_PARSE_ERROR: niepoprawny JSON odpowiedzi, zapis bez metryk")
+        extractor = AnalysisStreamExtractor()
+        text = extractor.feed(stripped)
+        return AnalysisResult(text if extractor.found else content)
+
+    if not isinstance(data, dict) or not isinstance(data.get("analysis"), str):
+        return AnalysisResult(content)
+    return AnalysisResult(data["analysis"], extract_metrics(data))
+
+
+_ANALYSIS_KEY = re.compile(r'"analysis"\s*:\s*"')
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class AnalysisStreamExtractor:
+    """Przyrostowo dekoduje wartość pola "analysis" z kolejnych fragmentów JSON.
+
+    feed(fragment) zwraca nowy tekst analizy z tego fragmentu. Gdy odpowiedź
+    nie jest obiektem JSON, fragmenty przekazywane są bez zmian.
+    """
+
+    def __init__(self):
+        self.mode = None  # None (jeszcze nie wiadomo), "plain", "json"
+        self.found = False  # Napotkano początek pola "analysis"
+        self.done = False  # Pole "analysis" zakończone
+        self._buffer = ""
+        self._pending = ""
+
+    def feed(self, fragment: str) -> str:
+        if self.mode == "plain":
+            return fragment
+        if self.done:
+            return ""
+
+        if self.mode is None:
+            self._buffer += fragment
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                return ""
+            if not stripped.startswith("{"):
+                self.mode = "plain"
+                text, self._buffer = self._buffer, ""
+                return text
+            self.mode = "json"
+            fragment, self._buffer = self._buffer, ""
+
+        if not self.found:
+            self._buffer += fragment
+            match = _ANALYSIS_KEY.search(self._buffer)
+            if not match:
+                return ""
+            self.found = True
+            fragment, self._buffer = self._buffer[match.end():], ""
+
+        return self._decode(fragment)
+
+    def _decode(self, fragment: str) -> str:
+        data = self._pending + fragment
+        self._pending = ""
+        out = []
+        i = 0
+        while i < len(data):
+            char = data[i]
+            if char == '"':
+                self.done = True
+                break
+            if char != '\\':
+                out.append(char)
+                i += 1
+                continue
+
+            # Sekwencja ucieczki może być rozcięta między fragmenty
+            if i + 1 >= len(data):
+                self._pending = data[i:]
+                break
+            escape = data[i + 1]
+            if escape != 'u':
+                out.append(_ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if i + 6 > len(data):
+                self._pending = data[i:]
+                break
+            code = int(data[i + 2:i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # Para surogatów (np. emoji) - potrzebna druga połowa
+                if i + 8 > len(data) or (data[i + 6:i + 8] == '\\u' and i + 12 > len(data)):
+                    self._pending = data[i:]
+                    break
+                if data[i + 6:i + 8] == '\\u':
+                    low = int(data[i + 8:i + 12], 16)
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                    continue
+                out.append('\ufffd')
+            else:
+                out.append(chr(code))
+            i += 6
+        return "".join(out)
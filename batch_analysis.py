@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: batch_analysis.py
+# batch_analysis.py - Wsadowa analiza wielu procesów SmartFlowAI
+
+"""
+Wsadowa analiza procesów biznesowych.
+
+Wiersze z pliku CSV/JSON są rozdzielane na ograniczoną pulę wątków
+(zakładka Streamlit) lub korutyn w jednej pętli zdarzeń (CLI, AsyncOpenAI),
+każdy wiersz analizowany jest przez analyze_with_ai (z ponowieniami
+wiersza ponad ponowienia zapytań w ai_client),
+a wyniki zapisywane są jednym zbiorczym insertem do business_processes.
+
+Użycie (CLI):
+python batch_analysis.py procesy.csv --user-email test@smartflowai.com [--concurrency 4] [--retries 2]
+
+Wymagane kolumny: title, description
+Opcjonalne kolumny: analysis_depth, company_size, industry, budget
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from text_sanitizer import clean_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANALYSIS_DEPTH = "Pogłębiona (z wyszukiwaniem)"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 2
+MIN_DESCRIPTION_LENGTH = 20  # Jak w formularzu nowego procesu
+OPTIONAL_FIELDS = ("analysis_depth", "company_size", "industry", "budget")
+
+
+def parse_batch_file(data, filename: str):
+    """Wczytuje procesy z pliku CSV lub JSON.
+
+    Zwraca krotkę (wiersze, błędy) - błędne wiersze są pomijane z opisem przyczyny.
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+
+    if filename.lower().endswith(".json"):
+        records = json.loads(data)
+        if isinstance(records, dict):
+            records = records.get("processes", [])
+    else:
+        # Excel w polskiej wersji zapisuje CSV ze średnikiem
+        try:
+            dialect = csv.Sniffer().sniff(data[:4096], delimiters=",;")
+        except csv.Error:
+            dialect = csv.excel
+        records = list(csv.DictReader(io.StringIO(data), dialect=dialect))
+
+    rows = []
+    errors = []
+    for index, record in enumerate(records, 1):
+        title = str(record.get("title") or "").strip()
+        description = str(record.get("description") or "").strip()
+
+        if not title or not description:
+            errors.append(f"Wiersz {index}: brak nazwy lub opisu procesu")
+            continue
+        if len(description) < MIN_DESCRIPTION_LENGTH:
+            errors.append(f"Wiersz {index}: opis musi mieć co najmniej {MIN_DESCRIPTION_LENGTH} znaków")
+            continue
+
+        row = {"row": index, "title": title, "description": description}
+        for field in OPTIONAL_FIELDS:
+            value = str(record.get(field) or "").strip()
+            if value:
+                row[field] = value
+        rows.append(row)
+
+    return rows, errors
+
+
+def row_args(row: dict, default_depth: str) -> tuple:
+    """Argumenty analyze_with_ai (i kolejki analiz w tle) dla wiersza"""
+    return (
+        row["title"],
+        row["description"],
+        row.get("analysis_depth", default_depth),
+        row.get("company_size", ""),
+        row.get("industry", ""),
+        row.get("budget", "")
+    )
+
+
+def _new_result(row: dict, default_depth: str) -> dict:
+    return {"row": row["row"], "title": row["title"], "description": row["description"],
+            "analysis_depth": row.get("analysis_depth", default_depth), "industry": row.get("industry", ""),
+            "ai_analysis": None, "metrics": {}, "error": None, "attempts": 0}
+
+
+def _check_analysis(analysis):
+    """Pusta odpowiedź AI traktowana jest jak błąd wiersza"""
+    if not analysis:
+        raise RuntimeError("Pusta odpowiedź AI")
+    return analysis
+
+
+def _should_retry(error: Exception, attempt: int, retries: int) -> bool:
+    """Błąd trwały (np. nieprawidłowy klucz API, AnalysisError.retryable=False) nie jest ponawiany"""
+    return attempt < retries and getattr(error, "retryable", True)
+
+
+def _analyze_row(row: dict, analyze_fn, default_depth: str, retries: int, retry_delay: float) -> dict:
+    """Analizuje jeden wiersz z ponowieniami przy błędzie"""
+    result = _new_result(row, default_depth)
+
+    for attempt in range(retries + 1):
+        result["attempts"] = attempt + 1
+        try:
+            analysis = _check_analysis(analyze_fn(*row_args(row, default_depth)))
+            result["ai_analysis"] = str(analysis)
+            result["metrics"] = getattr(analysis, "metrics", {})
+            result["error"] = None
+            return result
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error(f"BATCH_ROW_ERROR: wiersz {row['row']}, próba {attempt + 1}: {str(e)}")
+            if not _should_retry(e, attempt, retries):
+                break
+            time.sleep(retry_delay * (2 ** attempt))
+
+    return result
+
+
+async def _analyze_row_async(row: dict, analyze_fn, default_depth: str, retries: int, retry_delay: float) -> dict:
+    """Asynchroniczny odpowiednik _analyze_row"""
+    result = _new_result(row, default_depth)
+
+    for attempt in range(retries + 1):
+        result["attempts"] = attempt + 1
+        try:
+            analysis = _check_analysis(await analyze_fn(*row_args(row, default_depth)))
+            result["ai_analysis"] = str(analysis)
+            result["metrics"] = getattr(analysis, "metrics", {})
+            result["error"] = None
+            return result
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error(f"BATCH_ROW_ERROR: wiersz {row['row']}, próba {attempt + 1}: {str(e)}")
+            if not _should_retry(e, attempt, retries):
+                break
+            await asyncio.sleep(retry_delay * (2 ** attempt))
+
+    return result
+
+
+def run_batch(rows, analyze_fn, concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+              default_depth: str = DEFAULT_ANALYSIS_DEPTH, retry_delay: float = 1.0, progress_callback=None):
+    """Analizuje wiersze równolegle w puli co najwyżej `concurrency` wątków.
+
+    progress_callback(ukończone, wszystkie, wynik) wywoływany jest w wątku
+    wywołującym, więc może bezpiecznie aktualizować elementy Streamlit.
+    Wyniki zwracane są w kolejności wierszy wejściowych.
+    """
+    results = []
+    total = len(rows)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            executor.submit(_analyze_row, row, analyze_fn, default_depth, retries, retry_delay)
+            for row in rows
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if progress_callback:
+                progress_callback(done, total, result)
+
+    return sorted(results, key=lambda r: r["row"])
+
+
+async def run_batch_async(rows, analyze_fn, concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                          default_depth: str = DEFAULT_ANALYSIS_DEPTH, retry_delay: float = 1.0, progress_callback=None):
+    """Wersja run_batch dla korutyn (analyze_with_ai_async) - jedna pętla zdarzeń zamiast puli wątków"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    total = len(rows)
+    results = []
+
+    async def analyze(row):
+        async with semaphore:
+            return await _analyze_row_async(row, analyze_fn, default_depth, retries, retry_delay)
+
+    for done, task in enumerate(asyncio.as_completed([analyze(row) for row in rows]), 1):
+        result = await task
+        results.append(result)
+        if progress_callback:
+            progress_callback(done, total, result)
+
+    return sorted(results, key=lambda r: r["row"])
+
+
+def main(argv=None):
+    """Punkt wejścia CLI - analiza wsadowa bez interfejsu Streamlit"""
+    parser = argparse.ArgumentParser(description="SmartFlowAI - wsadowa analiza procesów z pliku CSV/JSON")
+    parser.add_argument("file", help="Plik CSV lub JSON z procesami")
+    parser.add_argument("--user-email", required=True, help="Email użytkownika, do którego zostaną przypisane procesy")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Liczba równoległych analiz")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Liczba ponowień dla wiersza")
+    parser.add_argument("--depth", default=DEFAULT_ANALYSIS_DEPTH, help="Domyślna głębokość analizy")
+    parser.add_argument("--dry-run", action="store_true", help="Tylko analiza, bez zapisu do bazy")
+    parser.add_argument("--output", help="Zapisz wyniki do pliku JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.file, "rb") as f:
+        rows, errors = parse_batch_file(f.read(), args.file)
+
+    for error in errors:
+        print(f"⚠️ {error}")
+    if not rows:
+        print("❌ Brak poprawnych wierszy do analizy")
+        return 1
+
+    # Import aplikacji dopiero tutaj - inicjalizuje klientów Supabase i OpenAI
+    from smartflowai.ai import analyze_with_ai_async
+    from smartflowai.storage import save_processes_bulk
+
+    def print_progress(done, total, result):
+        status = "✅" if result["ai_analysis"] else "❌"
+        print(f"[{done}/{total}] {status} {clean_text(result['title'])}")
+
+    # Asynchronicznie - wszystkie analizy w jednej pętli, na wspólnej puli połączeń
+    results = asyncio.run(run_batch_async(rows, analyze_with_ai_async, args.concurrency, args.retries, args.depth,
+                                          progress_callback=print_progress))
+    succeeded = [r for r in results if r["ai_analysis"]]
+    failed = [r for r in results if not r["ai_analysis"]]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    saved = 0
+    if succeeded and not args.dry_run:
+        saved = save_processes_bulk(succeeded, user_email=args.user_email)
+        if not saved:
+            print("❌ Błąd zapisu do bazy danych")
+            return 1
+
+    print(f"\nPrzeanalizowano: {len(succeeded)}, błędy: {len(failed)}, zapisano: {saved}")
+    return 0 if not failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
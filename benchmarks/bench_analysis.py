@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/bench_analysis.py
+# bench_analysis.py - Przepustowość analiz AI przy N równoległych sesjach
+
+"""
+Przepustowość analiz przy N równoległych sesjach (wątkach, jak sesje Streamlit
+w jednym procesie) na lokalnym serwerze fake_openai.py.
+
+Każda sesja wykonuje kolejno --per-session analiz przez smartflowai.ai
+(analyze_with_ai lub stream_analysis_with_ai) - pełna ścieżka aplikacji:
+budżet tokenów, limit równoległości OPENAI_MAX_CONCURRENCY, pula połączeń,
+parsowanie JSON / strumienia SSE. Cache odpowiedzi jest wyłączony, limiter
+RPM/TPM domyślnie też (--rpm/--tpm włączają go - opóźnienia limitera nie są
+skalowane przez --time-scale).
+
+Wyniki: analizy/s, p50/p95 czasu analizy, p50 czasu do pierwszego fragmentu
+(tryb stream) i największa liczba zapytań jednocześnie na serwerze.
+
+Użycie:
+python benchmarks/bench_analysis.py [--sessions 1 4 16] [--per-session 3] [--mode sync stream] [--time-scale 0.05]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_openai import FakeOpenAIServer, LatencyProfile
+from harness import metric
+
+SAMPLE_DEPTHS = ("Podstawowa (szybka)", "Pogłębiona (z wyszukiwaniem)", "Ekspercka (pełna analiza)")
+
+
+def configure_env(base_url: str, args):
+    """Zmienne czytane przy imporcie ai_client - ustawiane przed importem smartflowai.ai"""
+    os.environ.update({
+        "ENVIRONMENT": "benchmark",  # Nie "test" - w trybie testowym analiza zwraca mock bez zapytania
+        "DATABASE_BACKEND": "sqlite",
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": base_url,
+        "AI_CACHE_ENABLED": "false",
+        "OPENAI_RPM_LIMIT": str(args.rpm),
+        "OPENAI_TPM_LIMIT": str(args.tpm),
+        "OPENAI_MAX_CONCURRENCY": str(args.max_concurrency),
+    })
+
+
+def run_sessions(ai, mode: str, sessions: int, per_session: int, seed: int) -> dict:
+    """sessions wątków po per_session analiz, zwraca czasy poszczególnych analiz"""
+    durations, first_chunk, errors = [], [], []
+    lock = threading.Lock()
+
+    def session(index: int):
+        rng = random.Random(seed * 1000 + index)
+        for i in range(per_session):
+            depth = rng.choice(SAMPLE_DEPTHS)
+            title = f"Fakturowanie #{index}-{i}"
+            description = "Faktury wystawiane ręcznie w Excelu i wysyłane e-mailem do klientów. " * rng.randint(1, 5)
+            start = time.perf_counter()
+            try:
+                if mode == "stream":
+                    first = None
+                    for _ in ai.stream_analysis_with_ai(title, description, depth):
+                        first = first or time.perf_counter() - start
+                else:
+                    ai.analyze_with_ai(title, description, depth)
+                    first = None
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                durations.append((time.perf_counter() - start) * 1000)
+                if first is not None:
+                    first_chunk.append(first * 1000)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"seconds": time.perf_counter() - start, "durations": durations,
+            "first_chunk": first_chunk, "errors": errors}
+
+
+def run(args) -> list:
+    profile = LatencyProfile(time_scale=args.time_scale, rate_limit_ratio=args.rate_limit_ratio)
+    results = []
+    with FakeOpenAIServer(profile, seed=args.seed) as server:
+        configure_env(server.base_url, args)
+        import telemetry
+        from smartflowai import ai
+
+        for mode in args.mode:
+            for sessions in args.sessions:
+                before = server.stats()["requests"]
+                server.max_in_flight = 0
+                run_stats = run_sessions(ai, mode, sessions, args.per_session, args.seed)
+                if run_stats["errors"]:
+                    raise RuntimeError(f"Błędy analiz ({mode}, {sessions} sesji): {run_stats['errors'][:3]}")
+                summary = telemetry.summarize(run_stats["durations"])
+                params = {"mode": mode, "sessions": sessions}
+                results += [
+                    metric("analyses_per_second", len(run_stats["durations"]) / run_stats["seconds"],
+                           "1/s", lower_is_better=False, **params),
+                    metric("analysis_p50", summary["p50_ms"], "ms", **params),
+                    metric("analysis_p95", summary["p95_ms"], "ms", **params),
+                    metric("server_max_in_flight", server.stats()["max_in_flight"], "", lower_is_better=None, **params),
+                    metric("server_requests", server.stats()["requests"] - before, "", lower_is_better=None, **params),
+                ]
+                if run_stats["first_chunk"]:
+                    results.append(metric("first_chunk_p50", telemetry.summarize(run_stats["first_chunk"])["p50_ms"],
+                                          "ms", **params))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Przepustowość analiz AI przy N równoległych sesjach")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="Liczby równoległych sesji")
+    parser.add_argument("--per-session", type=int, default=3, help="Analiz na sesję")
+    parser.add_argument("--mode", nargs="+", choices=["sync", "stream"], default=["sync", "stream"])
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Mnożnik opóźnień serwera (1.0 - jak gpt-4o)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Część odpowiedzi 429 z serwera")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="OPENAI_MAX_CONCURRENCY")
+    parser.add_argument("--rpm", type=int, default=0, help="OPENAI_RPM_LIMIT (0 - bez limitu)")
+    parser.add_argument("--tpm", type=int, default=0, help="OPENAI_TPM_LIMIT (0 - bez limitu)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Wynik jako lista metryk JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results))
+        return 0
+    for item in results:
+        params = item["params"]
+        print(f"{params['mode']:>6} {params['sessions']:>3} sesji  {item['name']:<22} {item['value']:>10.2f} {item['unit']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
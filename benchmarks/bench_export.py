@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/bench_export.py
+# bench_export.py - Przepustowość eksportu zestawienia do PDF i TXT
+
+"""
+Eksport zestawienia procesów z lokalnej bazy SQLite do PDF i TXT - ta sama
+ścieżka co przyciski w zakładce "Zestawienie w PDF": procesy pobierane
+porcjami (process_repository.iter_pages, widok EXPORT) prosto do
+smartflowai.reports.write_pdf_report / write_text_report.
+
+Wyniki dla każdego rozmiaru bazy: czas eksportu (mediana z --repeat
+powtórzeń), procesy/s i MB/s wyniku.
+
+Użycie:
+python benchmarks/bench_export.py [--sizes 100 1000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import metric, seeded_repository, timings
+
+import process_views
+from process_repository import iter_pages
+from smartflowai import reports
+
+HEADER = "Zestawienie przeanalizowanych procesów SmartFlowAI"
+FOOTER = "Wygenerowano przez SmartFlowAI"
+
+
+def run(sizes: list, repeat: int, seed: int) -> list:
+    with tempfile.TemporaryDirectory() as directory:
+        # storage tworzy klienta bazy przy imporcie - lokalna baza zamiast Supabase z .env
+        os.environ.update({"DATABASE_BACKEND": "sqlite", "SQLITE_PATH": os.path.join(directory, "app.sqlite3")})
+        from smartflowai.storage import REPORT_CHUNK_SIZE
+
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            repository, user_id = seeded_repository(os.path.join(directory, "bench.sqlite3"), size, seed)
+            exports = {
+                "pdf": lambda: reports.write_pdf_report(
+                    iter_pages(repository, user_id, process_views.EXPORT, REPORT_CHUNK_SIZE), HEADER, FOOTER)[0],
+                "txt": lambda: reports.write_text_report(
+                    iter_pages(repository, user_id, process_views.EXPORT, REPORT_CHUNK_SIZE), HEADER, FOOTER),
+            }
+            for name, export in exports.items():
+                size_mb = len(export()) / 2**20  # Pierwsze wywołanie ładuje też fpdf - poza pomiarem
+                milliseconds = timings(export, repeat)["p50_ms"]
+                seconds = milliseconds / 1000
+                results += [
+                    metric(f"{name}_export", milliseconds, "ms", processes=size),
+                    metric(f"{name}_processes_per_second", size / seconds, "1/s", lower_is_better=False, processes=size),
+                    metric(f"{name}_mb_per_second", size_mb / seconds, "MB/s", lower_is_better=False, processes=size),
+                ]
+            repository.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Przepustowość eksportu zestawienia do PDF i TXT")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="Liczby procesów w bazie")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Wynik jako lista metryk JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results))
+        return 0
+    for item in results:
+        print(f"{item['params']['processes']:>6} procesów  {item['name']:<28} {item['value']:>10.2f} {item['unit']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
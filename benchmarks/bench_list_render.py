@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/bench_list_render.py
+# bench_list_render.py - Czas renderowania dashboardu przy 10-10000 procesach
+
+"""
+Renderowanie dashboardu (lista procesów, statystyki, podgląd zestawienia PDF)
+dla użytkownika z 10/100/1000/10000 procesami w lokalnej bazie SQLite.
+
+- cold: przebieg po "🔄 Odśwież listę" - cache sesji unieważniony, wszystkie
+  zapytania idą do bazy
+- warm: zwykły ponowny przebieg (każda interakcja) - odczyty z cache sesji
+- repo.*: same zapytania repozytorium (pierwsza strona listy, statystyki,
+  lista do podglądu PDF) bez Streamlit
+
+Każdy rozmiar mierzony jest w osobnym procesie (klient bazy aplikacji jest
+współdzielony w procesie przez st.cache_resource), baza generowana ze stałym
+ziarnem (sqlite_backend.sample_processes), analiza AI w trybie testowym.
+
+Użycie:
+python benchmarks/bench_list_render.py [--sizes 10 100 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import BENCH_USER_EMAIL, ROOT, metric, run_child, seeded_repository, timings
+
+REFRESH_LABEL = "🔄 Odśwież listę"
+
+
+def app_timings(repeat: int) -> dict:
+    """Czasy przebiegów AppTest po zalogowaniu: cold (po odświeżeniu listy) i warm"""
+    from streamlit.testing.v1 import AppTest
+
+    import sqlite_backend
+
+    at = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=600).run()
+    at.text_input[0].input(BENCH_USER_EMAIL)
+    at.text_input[1].input(os.getenv("TEST_USER_PASSWORD") or sqlite_backend.DEFAULT_TEST_PASSWORD)
+    at.button[0].click().run()
+    if at.exception:
+        raise RuntimeError(f"Błąd aplikacji: {at.exception[0].message}")
+
+    def refresh():
+        next(button for button in at.button if button.label == REFRESH_LABEL).click().run()
+
+    return {"cold": timings(refresh, repeat), "warm": timings(at.run, repeat)}
+
+
+def run_size(size: int, repeat: int, seed: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.environ["SQLITE_PATH"] = os.path.join(directory, "bench.sqlite3")
+        repository, user_id = seeded_repository(path, size, seed)
+        # Import po ustawieniu SQLITE_PATH - storage tworzy klienta bazy przy imporcie
+        import process_views
+        from smartflowai import storage
+
+        queries = {
+            "repo.list_page": lambda: repository.list_page(user_id, process_views.LIST, None, storage.DEFAULT_PAGE_SIZE),
+            "repo.stats": lambda: repository.stats(user_id, storage.STATS_MONTHS, storage.STATS_TOP_INDUSTRIES),
+            "repo.list_processes": lambda: repository.list_processes(user_id, process_views.LIST),
+        }
+        for name, query in queries.items():
+            results.append(metric(name, timings(query, repeat)["p50_ms"], "ms", processes=size))
+        repository.close()
+
+        for name, times in app_timings(repeat).items():
+            results.append(metric(f"dashboard_{name}", times["p50_ms"], "ms", processes=size))
+    return results
+
+
+def child_env() -> dict:
+    """Bez sieci: lokalna baza SQLite, mock OpenAI, bez cache AI i telemetrii"""
+    env = dict(os.environ)
+    env.update({"ENVIRONMENT": "test", "AI_CACHE_ENABLED": "false", "TELEMETRY_ENABLED": "false",
+                "OPENAI_API_KEY": env.get("OPENAI_API_KEY", "sk-test")})
+    return env
+
+
+def run(sizes: list, repeat: int, seed: int) -> list:
+    results = []
+    for size in sizes:
+        results += run_child("bench_list_render.py", ["--size", size, "--repeat", repeat, "--seed", seed], child_env())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Czas renderowania dashboardu przy rosnącej liczbie procesów")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Liczby procesów")
+    parser.add_argument("--size", type=int, help="Tylko jeden rozmiar (w bieżącym procesie)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Wynik jako lista metryk JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_size(args.size, args.repeat, args.seed) if args.size else run(args.sizes, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results))
+        return 0
+    for item in results:
+        print(f"{item['params']['processes']:>6} procesów  {item['name']:<22} {item['value']:>10.1f} {item['unit']}")
+    print(f"\nCzas pomiaru: {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/bench_pdf_report.py
+# bench_pdf_report.py - Benchmark generowania raportu PDF
+
+"""
+Benchmark raportu PDF: strony/s i szczytowe RSS.
+
+Porównuje strumieniowy pdf_report.write_process_report (plik tymczasowy)
+z budowaniem całego dokumentu w FPDF w pamięci. Każdy tryb uruchamiany
+jest w osobnym procesie, żeby szczytowe RSS nie mieszało się między trybami.
+
+Użycie:
+python benchmarks/bench_pdf_report.py [--processes 2000] [--words 400] [--mode stream|fpdf]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_report
+from text_sanitizer import safe_text, flatten_text
+
+
+def make_processes(count: int, words: int):
+    """Syntetyczne procesy generowane w locie (jak porcje z bazy)"""
+    for i in range(count):
+        yield {
+            "title": f"Proces biznesowy numer {i}",
+            "description": " ".join(f"opis{w}" for w in range(words)),
+            "ai_analysis": "🔍 " + " ".join(f"rekomendacja{w}" for w in range(words * 2))
+        }
+
+
+def run_stream(count: int, words: int) -> dict:
+    with tempfile.SpooledTemporaryFile(max_size=5 * 1024 * 1024) as output:
+        stats = pdf_report.write_process_report(make_processes(count, words), "Benchmark", "Stopka", output)
+        stats["bytes"] = output.tell()
+    return stats
+
+
+def run_fpdf(count: int, words: int) -> dict:
+    """Dotychczasowe podejście - cały dokument w pamięci FPDF"""
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    processes = list(make_processes(count, words))
+    for i, p in enumerate(processes, 1):
+        pdf.set_font("Helvetica", "B", size=11)
+        pdf.cell(0, 8, safe_text(f"{i}. {p['title']}"), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font("Helvetica", "", size=9)
+        pdf.multi_cell(0, 5, safe_text(flatten_text(p['description'])),
+                       new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.multi_cell(0, 5, safe_text(flatten_text(p['ai_analysis'])),
+                       new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    data = pdf.output()
+    return {"processes": count, "pages": pdf.page_no(), "bytes": len(data)}
+
+
+def run_mode(mode: str, count: int, words: int) -> dict:
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    stats = run_stream(count, words) if mode == "stream" else run_fpdf(count, words)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss: KB na Linuksie, bajty na macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    stats.update({
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(stats["pages"] / elapsed, 1),
+        "peak_rss_mb": round(peak_rss * scale / 2**20, 1),
+        "rss_growth_mb": round((peak_rss - baseline_rss) * scale / 2**20, 1)
+    })
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark raportu PDF SmartFlowAI")
+    parser.add_argument("--processes", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--mode", choices=["stream", "fpdf"], help="Tylko jeden tryb (w bieżącym procesie)")
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.processes, args.words)))
+        return 0
+
+    for mode in ("stream", "fpdf"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode,
+             "--processes", str(args.processes), "--words", str(args.words)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        print(f"{mode:>6}: {result['pages']} stron w {result['seconds']} s "
+              f"({result['pages_per_second']} stron/s), szczytowe RSS {result['peak_rss_mb']} MB "
+              f"(+{result['rss_growth_mb']} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
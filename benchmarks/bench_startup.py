@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/bench_startup.py
+# bench_startup.py - Pomiar zimnego startu i ponownych przebiegów aplikacji
+
+"""
+Zimny start streamlit_app.py - każdy pomiar w nowym procesie Pythona.
+
+- import: czas importu streamlit_app (bez samego pakietu streamlit,
+  importowanego wcześniej) oraz razem ze streamlit
+- login: pierwsze wykonanie skryptu w AppTest (strona logowania)
+- rerun: czas CPU ponownego wykonania skryptu na dashboardzie (każda
+  interakcja użytkownika) - po zalogowaniu kontem testowym
+- najdroższe moduły zaimportowane przez aplikację (python -X importtime)
+
+Aplikacja działa na lokalnej bazie SQLite w katalogu tymczasowym
+(ENVIRONMENT=test), więc pomiar nie wymaga sieci.
+
+Użycie:
+python benchmarks/bench_startup.py [--repeat 5] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMPORT_SCRIPT = "import streamlit, streamlit_app"
+TOTAL_SCRIPT = "import streamlit_app"
+LOGIN_SCRIPT = (
+    "import time; from streamlit.testing.v1 import AppTest; start = time.perf_counter(); "
+    "AppTest.from_file('streamlit_app.py', default_timeout=60).run(); "
+    "print(f'LOGIN_MS {(time.perf_counter() - start) * 1000:.1f}')"
+)
+RERUN_SCRIPT = (
+    "import time; from streamlit.testing.v1 import AppTest; "
+    "at = AppTest.from_file('streamlit_app.py', default_timeout=60).run(); "
+    "at.text_input[0].input('test@smartflowai.com'); at.text_input[1].input('test123456'); "
+    "at.button[0].click().run(); start = time.process_time(); at.run(); "
+    "print(f'RERUN_MS {(time.process_time() - start) * 1000:.1f}')"
+)
+
+
+def app_env(directory: str) -> dict:
+    """Środowisko bez sieci: lokalna baza SQLite, mock OpenAI"""
+    env = dict(os.environ)
+    env.update({
+        "ENVIRONMENT": "test",
+        "SQLITE_PATH": os.path.join(directory, "startup.sqlite3"),
+        "AI_CACHE_ENABLED": "false",
+        "OPENAI_API_KEY": env.get("OPENAI_API_KEY", "sk-test"),
+    })
+    return env
+
+
+def import_times(env: dict, script: str) -> dict:
+    """Skumulowany czas importu (ms) każdego modułu z python -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def process_time(env: dict, script: str) -> float:
+    """Czas wykonania skryptu w nowym procesie (ms)"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import time; start = time.perf_counter(); {script}; "
+                               f"print(f'TOTAL_MS {{(time.perf_counter() - start) * 1000:.1f}}')"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.split("TOTAL_MS")[-1])
+
+
+def login_time(env: dict) -> float:
+    result = subprocess.run([sys.executable, "-c", LOGIN_SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.split("LOGIN_MS")[-1])
+
+
+def rerun_time(env: dict) -> float:
+    result = subprocess.run([sys.executable, "-c", RERUN_SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.split("RERUN_MS")[-1])
+
+
+def summary(values: list) -> str:
+    return f"mediana {statistics.median(values):8.1f} ms, min {min(values):8.1f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zimny start i ponowne przebiegi streamlit_app.py")
+    parser.add_argument("--repeat", type=int, default=5, help="Liczba pomiarów (nowy proces za każdym razem)")
+    parser.add_argument("--top", type=int, default=10, help="Ile najdroższych modułów wypisać")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = app_env(directory)
+        # Pierwsze uruchomienie zakłada bazę i konta testowe - nie jest wliczane
+        import_times(env, IMPORT_SCRIPT)
+
+        app_import = [import_times(env, IMPORT_SCRIPT)["streamlit_app"] for _ in range(args.repeat)]
+        total = [process_time(env, TOTAL_SCRIPT) for _ in range(args.repeat)]
+        login = [login_time(env) for _ in range(args.repeat)]
+        rerun = [rerun_time(env) for _ in range(args.repeat)]
+        modules = import_times(env, IMPORT_SCRIPT)
+
+    print(f"Import streamlit_app (bez streamlit): {summary(app_import)}")
+    print(f"Import streamlit + streamlit_app:     {summary(total)}")
+    print(f"Strona logowania (AppTest):           {summary(login)}")
+    print(f"Ponowny przebieg dashboardu (CPU):    {summary(rerun)}")
+    print("\nNajdroższe moduły ładowane przez aplikację (bez pakietu streamlit):")
+    streamlit_modules = import_times(app_env(ROOT), "import streamlit")
+    app_modules = {name: ms for name, ms in modules.items()
+                   if name not in streamlit_modules and name != "streamlit_app" and "." not in name}
+    for name, ms in sorted(app_modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<30} {ms:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/fake_openai.py
+# fake_openai.py - Lokalny serwer HTTP udający API OpenAI (chat.completions)
+
+"""
+Lokalny zamiennik POST /v1/chat/completions do benchmarków - bez sieci i kosztów.
+
+Odtwarza czasy typowe dla gpt-4o: czas do pierwszego tokenu z rozkładu
+log-normalnego, generowanie z zadaną liczbą tokenów/s, długość odpowiedzi
+jako część max_tokens. Odpowiedź to JSON zgodny z analysis_output.RESPONSE_FORMAT
+(pole "analysis" + metryki), a przy stream=True - strumień SSE z fragmentami
+tokenów i końcowym fragmentem usage (stream_options.include_usage), więc
+aplikacja przechodzi pełną ścieżkę: limiter, pula połączeń, parsowanie.
+
+time_scale skraca wszystkie opóźnienia proporcjonalnie (0.02 - analiza
+trwająca 30 s zajmuje 0,6 s), rate_limit_ratio zwraca część odpowiedzi jako
+429 z Retry-After (ścieżka ponowień).
+
+Użycie z aplikacją:
+python benchmarks/fake_openai.py --port 8099 --time-scale 0.1
+OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=sk-bench ENVIRONMENT=local streamlit run streamlit_app.py
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHARS_PER_TOKEN = 4
+SAMPLE_SENTENCES = (
+    "Proces można zautomatyzować integrując formularz zamówień z systemem księgowym.",
+    "Rekomendowane narzędzia to Make lub Zapier oraz iFirma z dostępem przez API.",
+    "Największą stratą czasu jest ręczne przepisywanie danych między arkuszami.",
+    "Wdrożenie zajmie około trzech tygodni i zwróci się w ciągu dwóch miesięcy.",
+    "Warto zacząć od pilotażu na jednym dziale i zmierzyć czas obsługi przed zmianą.",
+)
+
+
+class LatencyProfile:
+    """Model czasu odpowiedzi: TTFT log-normalny, stałe tempo generowania, długość jako ułamek max_tokens"""
+
+    def __init__(self, ttft_median: float = 0.6, ttft_sigma: float = 0.35, tokens_per_second: float = 60.0,
+                 completion_ratio: tuple = (0.35, 0.7), time_scale: float = 1.0, rate_limit_ratio: float = 0.0):
+        self.ttft_median = ttft_median
+        self.ttft_sigma = ttft_sigma
+        self.tokens_per_second = tokens_per_second
+        self.completion_ratio = completion_ratio
+        self.time_scale = time_scale
+        self.rate_limit_ratio = rate_limit_ratio
+
+
+class FakeOpenAIServer:
+    """Serwer w wątku w tle; adres API w base_url (także jako context manager)"""
+
+    def __init__(self, profile: LatencyProfile = None, seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or LatencyProfile()
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "rate_limited": self.rate_limited, "max_in_flight": self.max_in_flight}
+
+    def plan(self, max_tokens: int) -> tuple:
+        """Losuje (czy 429, TTFT w s, liczba tokenów odpowiedzi) - pod lockiem, powtarzalnie dla seed"""
+        profile = self.profile
+        with self._lock:
+            self.requests += 1
+            limited = self.rng.random() < profile.rate_limit_ratio
+            self.rate_limited += limited
+            ttft = profile.ttft_median * math.exp(self.rng.gauss(0, profile.ttft_sigma))
+            tokens = max(1, int(max_tokens * self.rng.uniform(*profile.completion_ratio)))
+            sentences = [self.rng.choice(SAMPLE_SENTENCES) for _ in range(tokens * CHARS_PER_TOKEN // 60 + 1)]
+        return limited, ttft, tokens, sentences
+
+    def track(self, delta: int):
+        with self._lock:
+            self.in_flight += delta
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+
+def analysis_content(sentences: list, tokens: int) -> str:
+    """Treść odpowiedzi w formacie analysis_output (ok. tokens tokenów)"""
+    text = " ".join(sentences)[:max(1, tokens * CHARS_PER_TOKEN - 200)]
+    return json.dumps({
+        "analysis": f"🔍 **ANALIZA:** {text}",
+        "automation_potential": 70,
+        "time_savings_hours": 12.5,
+        "cost_savings_annual": 18000,
+        "implementation_difficulty": "Średnia",
+        "recommended_tools": ["Make", "iFirma"],
+        "next_steps": ["Pilotaż w jednym dziale", "Pomiar czasu obsługi"]
+    }, ensure_ascii=False)
+
+
+def _handler_for(server: FakeOpenAIServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive jak w API OpenAI - pula połączeń klienta jest używana
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._json(404, {"error": {"message": "Nieobsługiwany endpoint", "type": "invalid_request_error"}})
+
+            limited, ttft, tokens, sentences = server.plan(int(body.get("max_tokens") or 1000))
+            if limited:
+                return self._json(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                  {"Retry-After": "0"})
+
+            prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+            usage = {"prompt_tokens": max(1, len(prompt) // CHARS_PER_TOKEN), "completion_tokens": tokens}
+            usage["total_tokens"] = usage["prompt_tokens"] + tokens
+            content = analysis_content(sentences, tokens)
+            scale = server.profile.time_scale
+
+            server.track(1)
+            try:
+                if body.get("stream"):
+                    self._stream(content, tokens, usage, ttft * scale, body.get("model", "gpt-4o"))
+                else:
+                    time.sleep((ttft + tokens / server.profile.tokens_per_second) * scale)
+                    self._json(200, {
+                        "id": f"chatcmpl-{uuid.uuid4().hex}", "object": "chat.completion", "created": int(time.time()),
+                        "model": body.get("model", "gpt-4o"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                        "usage": usage
+                    })
+            finally:
+                server.track(-1)
+
+        def _json(self, status: int, payload: dict, headers: dict = None):
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, content: str, tokens: int, usage: dict, ttft: float, model: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            completion_id, created = f"chatcmpl-{uuid.uuid4().hex}", int(time.time())
+
+            def chunk(choices, extra=None):
+                return {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                        "model": model, "choices": choices, **(extra or {})}
+
+            # Fragment na token, wysyłane partiami co najmniej co 20 ms - tempo jak tokens_per_second
+            step = max(1, math.ceil(len(content) / tokens))
+            pieces = [content[i:i + step] for i in range(0, len(content), step)]
+            interval = server.profile.time_scale / server.profile.tokens_per_second
+            start = time.perf_counter() + ttft
+            self._send_events([chunk([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])], start)
+            sent = 0
+            while sent < len(pieces):
+                due = max(sent + 1, min(len(pieces), int((time.perf_counter() - start) / interval) if interval else len(pieces)))
+                batch = [chunk([{"index": 0, "delta": {"content": piece}, "finish_reason": None}]) for piece in pieces[sent:due]]
+                self._send_events(batch, start + due * interval if interval else 0)
+                sent = due
+            self._send_events([chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}]), chunk([], {"usage": usage})], 0)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def _send_events(self, events: list, not_before: float):
+            delay = not_before - time.perf_counter()
+            if delay > 0:
+                time.sleep(min(delay, 0.02) if len(events) > 1 else delay)
+            self._write_chunk("".join(f"data: {json.dumps(event, ensure_ascii=False)}\n\n" for event in events).encode("utf-8"))
+
+        def _write_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                return self._json(200, {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "fake"}]})
+            return self._json(404, {"error": {"message": "Nieobsługiwany endpoint"}})
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokalny serwer udający API OpenAI (chat.completions)")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Mnożnik opóźnień (1.0 - czasy jak gpt-4o)")
+    parser.add_argument("--ttft", type=float, default=0.6, help="Mediana czasu do pierwszego tokenu (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Część odpowiedzi zwracana jako 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    profile = LatencyProfile(ttft_median=args.ttft, tokens_per_second=args.tokens_per_second,
+                             time_scale=args.time_scale, rate_limit_ratio=args.rate_limit_ratio)
+    server = FakeOpenAIServer(profile, seed=args.seed, port=args.port).start()
+    print(f"Fake OpenAI: {server.base_url} (Ctrl+C kończy)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\nObsłużono: {server.stats()}")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
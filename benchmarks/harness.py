@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/harness.py
+# harness.py - Wspólne elementy benchmarków: baza testowa, pomiary, wyniki JSON
+
+"""
+Wspólne elementy benchmarków z run_benchmarks.py.
+
+- seeded_repository: lokalna baza SQLite z użytkownikami testowymi i
+  powtarzalnymi procesami (sqlite_backend.sample_processes, stałe ziarno)
+- metric: wynik jednego pomiaru z jednostką i kierunkiem (czy mniej jest
+  lepiej; None - wartość informacyjna) - na tej podstawie compare_results
+  wykrywa regresje
+- timings: mediana / p95 / min z kilku powtórzeń (percentyle z telemetry.py)
+- run_child: uruchomienie benchmarku w osobnym procesie z wynikiem JSON
+  (zmienne środowiskowe czytane przy imporcie nie mieszają się między zestawami)
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sqlite_backend
+import telemetry
+from process_repository import SQLiteProcessRepository
+
+BENCH_USER_EMAIL = "test@smartflowai.com"
+RESULTS_VERSION = 1
+
+
+def seeded_repository(path: str, count: int, seed: int = 0):
+    """Baza SQLite z count procesami użytkownika testowego, zwraca (repozytorium, user_id)"""
+    repository = SQLiteProcessRepository(path)
+    sqlite_backend.seed_test_users(sqlite_backend.SQLiteClient(repository))
+    user_id = repository.find_user_id(BENCH_USER_EMAIL)
+    repository.insert_processes(sqlite_backend.sample_processes(user_id, count, seed))
+    return repository, user_id
+
+
+def metric(name: str, value: float, unit: str, lower_is_better: bool = True, **params) -> dict:
+    return {"name": name, "value": round(value, 3), "unit": unit,
+            "lower_is_better": lower_is_better, "params": params}
+
+
+def timings(function, repeat: int) -> dict:
+    """Czasy (ms) repeat wywołań funkcji: mediana, p95 i minimum"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    summary = telemetry.summarize(durations)
+    return {"p50_ms": summary["p50_ms"], "p95_ms": summary["p95_ms"], "min_ms": min(durations)}
+
+
+def run_child(script: str, args: list, env: dict = None) -> list:
+    """Uruchamia benchmark z --json w nowym procesie, zwraca jego listę metryk"""
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "benchmarks", script), "--json", *map(str, args)],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} zakończony kodem {result.returncode}:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def machine_info() -> dict:
+    """Opis środowiska zapisywany z wynikami - porównuj wyniki z tej samej maszyny"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(path: str, suites: dict, settings: dict) -> dict:
+    results = {"version": RESULTS_VERSION, "machine": machine_info(), "settings": settings, "suites": suites}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return results
+
+
+def metric_key(suite: str, item: dict) -> str:
+    params = ",".join(f"{name}={value}" for name, value in sorted(item["params"].items()))
+    return f"{suite}/{item['name']}" + (f"[{params}]" if params else "")
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list:
+    """Porównanie metryk obecnych w obu wynikach.
+
+    Zwraca wiersze (klucz, wartość bazowa, obecna, zmiana względna, regresja);
+    zmiana liczona w kierunku "gorzej" - dodatnia oznacza pogorszenie,
+    regresja gdy przekracza threshold (np. 0.2 = 20%).
+    """
+    base = {metric_key(suite, item): item for suite, items in baseline["suites"].items() for item in items}
+    rows = []
+    for suite, items in current["suites"].items():
+        for item in items:
+            key = metric_key(suite, item)
+            if key not in base or not base[key]["value"] or item["lower_is_better"] is None:
+                continue
+            before, after = base[key]["value"], item["value"]
+            change = (after - before) / before
+            worse = change if item["lower_is_better"] else -change
+            rows.append((key, before, after, worse, worse > threshold))
+    return rows
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: benchmarks/run_benchmarks.py
+# run_benchmarks.py - Zestaw benchmarków z wynikami JSON i porównaniem z bazowymi
+
+"""
+Powtarzalny zestaw benchmarków bez sieci: fałszywy serwer OpenAI
+(fake_openai.py) i lokalna baza SQLite generowana ze stałym ziarnem.
+
+- analysis: przepustowość analiz przy N równoległych sesjach (bench_analysis.py)
+- list_render: dashboard przy 10/100/1000/10000 procesach (bench_list_render.py)
+- export: eksport zestawienia do PDF i TXT (bench_export.py)
+
+Każdy zestaw działa w osobnym procesie. Wyniki (metryki z jednostkami i
+opisem maszyny) zapisywane są do pliku JSON; --compare porównuje je
+z wcześniejszym plikiem i kończy się kodem 1, gdy któraś metryka pogorszyła
+się o więcej niż --threshold. Porównuj wyniki z tej samej maszyny.
+
+Użycie:
+python benchmarks/run_benchmarks.py [--quick] [--suite analysis export] [--output wyniki.json]
+python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import ROOT, compare_results, run_child, write_results
+
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "latest.json")
+# Argumenty zestawów: pełny pomiar i szybki (np. przed commitem)
+SUITES = {
+    "analysis": ("bench_analysis.py", ["--sessions", 1, 4, 16, "--per-session", 3],
+                 ["--sessions", 1, 4, "--per-session", 2]),
+    "list_render": ("bench_list_render.py", ["--sizes", 10, 100, 1000, 10000, "--repeat", 3],
+                    ["--sizes", 10, 100, 1000, "--repeat", 2]),
+    "export": ("bench_export.py", ["--sizes", 100, 1000, "--repeat", 3],
+               ["--sizes", 100, "--repeat", 2]),
+}
+
+
+def print_comparison(rows: list, threshold: float) -> int:
+    """Tabela zmian względem wyników bazowych, zwraca liczbę regresji"""
+    print(f"\nPorównanie z wynikami bazowymi (próg {threshold:.0%}, dodatnia zmiana = gorzej):")
+    for key, before, after, worse, regression in rows:
+        marker = "❌ REGRESJA" if regression else ""
+        print(f"  {key:<70} {before:>12.3f} → {after:>12.3f}  {worse:+7.1%} {marker}")
+    return sum(1 for row in rows if row[4])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zestaw benchmarków SmartFlowAI z wynikami JSON")
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--quick", action="store_true", help="Mniejsze rozmiary i mniej powtórzeń")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Plik wyników JSON")
+    parser.add_argument("--compare", help="Plik wyników bazowych do porównania")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Dopuszczalne pogorszenie (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    suites = {}
+    for name in args.suite:
+        script, full_args, quick_args = SUITES[name]
+        start = time.perf_counter()
+        print(f"▶ {name} ({script})", flush=True)
+        suites[name] = run_child(script, (quick_args if args.quick else full_args) + ["--seed", args.seed])
+        print(f"  {len(suites[name])} metryk w {time.perf_counter() - start:.1f} s")
+
+    results = write_results(args.output, suites, {"quick": args.quick, "seed": args.seed})
+    print(f"\nWyniki: {args.output}")
+
+    if baseline:
+        regressions = print_comparison(compare_results(baseline, results, args.threshold), args.threshold)
+        if regressions:
+            print(f"\n❌ Regresje: {regressions}")
+            return 1
+        print("\n✅ Brak regresji")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,9 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+import process_views
+from process_repository import SupabaseProcessRepository
+
 # Konfiguracja logowania
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -56,16 +59,21 @@ def check_user_in_auth(supabase, email):
                 return True
             return False
 
-def check_user_processes(supabase, email):
-    """Sprawdza procesy użytkownika w bazie danych"""
+def check_user_processes(repository, email):
+    """Sprawdza procesy użytkownika w bazie danych (business_processes, tylko id/title/created_at)"""
     try:
-        result = supabase.table('processes').select('*').eq('user_email', email).execute()
-        count = len(result.data)
+        user_id = repository.find_user_id(email)
+        if not user_id:
+            print(f"❌ Użytkownik {email} nie ma wpisu w tabeli users")
+            return False
+        
+        processes = repository.list_processes(user_id, process_views.LIST)
+        count = len(processes)
         print(f"📊 Użytkownik {email} ma {count} procesów w bazie danych")
         
         if count > 0:
             print("   Ostatnie procesy:")
-            for process in result.data[:3]:  # Pokaż 3 ostatnie
+            for process in processes[:3]:  # Pokaż 3 ostatnie
                 title = process.get('title', 'Brak tytułu')
                 created = process.get('created_at', 'Brak daty')[:10]
                 print(f"   - {title} ({created})")
@@ -93,7 +101,7 @@ def main():
     auth_exists = check_user_in_auth(supabase, email)
     
     # Sprawdź procesy w bazie
-    has_processes = check_user_processes(supabase, email)
+    has_processes = check_user_processes(SupabaseProcessRepository(supabase), email)
     
     print("="*50)
     print("📋 PODSUMOWANIE:")
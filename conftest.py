@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Plik: conftest.py
+# conftest.py - Wspólna konfiguracja pytest dla SmartFlowAI
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Testy mockują OpenAI - trwały cache odpowiedzi zafałszowałby wyniki między uruchomieniami
+os.environ.setdefault("AI_CACHE_ENABLED", "false")
+# Limiter RPM/TPM po stronie klienta wstrzymywałby dziesiątki mockowanych analiz
+os.environ.setdefault("OPENAI_RPM_LIMIT", "0")
+os.environ.setdefault("OPENAI_TPM_LIMIT", "0")
+# Lokalna baza SQLite (ENVIRONMENT=test) w katalogu tymczasowym - każde uruchomienie zaczyna od pustej bazy,
+# a import smartflowai.storage nie tworzy data/smartflowai.sqlite3 w repozytorium
+SQLITE_DIR = tempfile.mkdtemp(prefix="smartflowai-tests-")
+os.environ["SQLITE_PATH"] = os.path.join(SQLITE_DIR, "smartflowai.sqlite3")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(SQLITE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def live_ai_mode(monkeypatch):
+    """Analiza przez (mockowanego) klienta OpenAI także przy ENVIRONMENT=test z CI.
+
+    W trybie testowym analyze_with_ai i stream_analysis_with_ai zwracają gotową
+    odpowiedź bez zapytania - testy cache, strumienia i parametrów zapytania
+    muszą ten tryb wyłączyć.
+    """
+    monkeypatch.setenv("ENVIRONMENT", "")
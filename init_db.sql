@@ -56,20 +56,43 @@ CREATE POLICY "Users can delete own processes" ON processes
 CREATE INDEX IF NOT EXISTS idx_processes_user_email ON processes(user_email);
 CREATE INDEX IF NOT EXISTS idx_processes_created_at ON processes(created_at DESC);
 
--- Indeks full-text search z fallback dla konfiguracji językowej
+-- Indeks full-text search (title + description + ai_analysis) z fallback dla konfiguracji językowej.
+-- Konfiguracja wybierana jest raz, przy instalacji, i wpisywana do funkcji IMMUTABLE -
+-- indeks i zapytania używają tego samego wyrażenia, więc wyszukiwanie korzysta z indeksu GIN.
 DO $$
+DECLARE
+    ts_config TEXT;
 BEGIN
     -- Sprawdź czy konfiguracja 'polish' istnieje
     IF EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'polish') THEN
-        CREATE INDEX IF NOT EXISTS idx_processes_title ON processes USING GIN(to_tsvector('polish', title));
-        RAISE NOTICE 'Utworzono indeks full-text z konfiguracją polish';
+        ts_config := 'polish';
     ELSIF EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'english') THEN
-        CREATE INDEX IF NOT EXISTS idx_processes_title ON processes USING GIN(to_tsvector('english', title));
-        RAISE NOTICE 'Utworzono indeks full-text z konfiguracją english (fallback)';
+        ts_config := 'english';
     ELSE
-        CREATE INDEX IF NOT EXISTS idx_processes_title ON processes USING GIN(to_tsvector('simple', title));
-        RAISE NOTICE 'Utworzono indeks full-text z konfiguracją simple (fallback)';
+        ts_config := 'simple';
     END IF;
+
+    EXECUTE format($f$
+        CREATE OR REPLACE FUNCTION process_search_vector(p_title TEXT, p_description TEXT, p_ai_analysis TEXT)
+        RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $body$
+            SELECT setweight(to_tsvector(%1$L::regconfig, coalesce(p_title, '')), 'A') ||
+                   setweight(to_tsvector(%1$L::regconfig, coalesce(p_description, '')), 'B') ||
+                   setweight(to_tsvector(%1$L::regconfig, coalesce(p_ai_analysis, '')), 'C')
+        $body$
+    $f$, ts_config);
+
+    EXECUTE format($f$
+        CREATE OR REPLACE FUNCTION process_search_query(p_search_term TEXT)
+        RETURNS tsquery LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $body$
+            SELECT websearch_to_tsquery(%1$L::regconfig, p_search_term)
+        $body$
+    $f$, ts_config);
+
+    -- Poprzedni indeks obejmował tylko title
+    DROP INDEX IF EXISTS idx_processes_title;
+    CREATE INDEX IF NOT EXISTS idx_processes_search ON processes
+        USING GIN(process_search_vector(title, description, ai_analysis));
+    RAISE NOTICE 'Utworzono indeks full-text z konfiguracją %', ts_config;
 EXCEPTION
     WHEN OTHERS THEN
         -- Jeśli wszystko zawiedzie, utwórz zwykły indeks B-tree
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+# Plik: pdf_report.py
+# pdf_report.py - Strumieniowe generowanie raportu PDF z procesów SmartFlowAI
+
+"""
+Raport PDF ze wszystkich procesów użytkownika przy ograniczonym zużyciu pamięci.
+
+FPDF trzyma w pamięci wszystkie strony aż do output(), więc raport z tysięcy
+procesów rośnie razem z liczbą stron. StreamingPDFWriter zapisuje każdą
+stronę do pliku zaraz po jej zapełnieniu - w pamięci jest tylko bieżąca
+strona oraz lista offsetów obiektów potrzebna do tabeli xref.
+
+Procesy przyjmowane są jako dowolny iterator (np. pobierany porcjami z bazy),
+więc ani wiersze, ani gotowy dokument nie muszą mieścić się w pamięci naraz.
+Tekst jest zamieniany na ASCII (text_sanitizer.safe_text) i składany
+czcionkami wbudowanymi Helvetica - metryki znaków pochodzą z fpdf2.
+"""
+
+import zlib
+from typing import Iterable
+
+from fpdf.fonts import CORE_FONTS, CORE_FONTS_CHARWIDTHS
+
+from text_sanitizer import safe_text, flatten_text
+
+# Wymiary strony A4 i marginesy w punktach (1 mm = 72 / 25.4 pt)
+MM = 72 / 25.4
+PAGE_WIDTH = 210 * MM
+PAGE_HEIGHT = 297 * MM
+MARGIN_LEFT = 10 * MM
+MARGIN_RIGHT = 10 * MM
+MARGIN_TOP = 10 * MM
+MARGIN_BOTTOM = 15 * MM
+
+# Czcionki wbudowane (nie wymagają osadzania): styl -> (zasób, klucz metryk fpdf2)
+FONTS = {
+    "": ("F1", "helvetica"),
+    "B": ("F2", "helveticaB"),
+    "I": ("F3", "helveticaI"),
+}
+
+# Limity tylko dla jednowierszowych elementów - opisy i analizy nie są skracane
+HEADER_MAX_LENGTH = 100
+TITLE_MAX_LENGTH = 80
+
+
+def _escape(text: str) -> bytes:
+    """Koduje tekst jako literał PDF"""
+    escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return escaped.encode('latin-1', errors='replace')
+
+
+class StreamingPDFWriter:
+    """Zapis PDF strona po stronie do pliku (A4, czcionki wbudowane Helvetica)"""
+
+    # Stałe numery obiektów: katalog, drzewo stron i czcionki zapisywane na początku
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    FIRST_FONT_ID = 3
+
+    def __init__(self, fileobj, compress: bool = True, title: str = ""):
+        self.fileobj = fileobj
+        self.compress = compress
+        self.title = title
+        self.page_count = 0
+        self._position = 0
+        self._offsets = {}
+        self._page_ids = []
+        self._next_id = self.FIRST_FONT_ID + len(FONTS)
+        self._content = None
+        self._font = None
+        self.y = MARGIN_TOP
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for index, (resource, key) in enumerate(FONTS.values()):
+            self._write_object(
+                self.FIRST_FONT_ID + index,
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{CORE_FONTS[key]} /Encoding /WinAnsiEncoding >>".encode()
+            )
+
+    def _write(self, data: bytes):
+        self.fileobj.write(data)
+        self._position += len(data)
+
+    def _write_object(self, obj_id: int, body: bytes):
+        self._offsets[obj_id] = self._position
+        self._write(f"{obj_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _allocate_id(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def add_page(self):
+        """Zamyka bieżącą stronę (zapis do pliku) i otwiera nową"""
+        self._flush_page()
+        self._content = []
+        self._font = None
+        self.y = MARGIN_TOP
+        self.page_count += 1
+
+    def _flush_page(self):
+        if self._content is None:
+            return
+
+        stream = b"\n".join(self._content)
+        if self.compress:
+            stream = zlib.compress(stream)
+            header = f"<< /Length {len(stream)} /Filter /FlateDecode >>".encode()
+        else:
+            header = f"<< /Length {len(stream)} >>".encode()
+
+        content_id = self._allocate_id()
+        page_id = self._allocate_id()
+        self._write_object(content_id, header + b"\nstream\n" + stream + b"\nendstream")
+
+        fonts = " ".join(f"/{resource} {self.FIRST_FONT_ID + i} 0 R" for i, (resource, _) in enumerate(FONTS.values()))
+        self._write_object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R /MediaBox [0 0 {PAGE_WIDTH:.2f} {PAGE_HEIGHT:.2f}] "
+            f"/Resources << /Font << {fonts} >> >> /Contents {content_id} 0 R >>"
+        ).encode())
+        self._page_ids.append(page_id)
+        self._content = None
+
+    @staticmethod
+    def string_width(text: str, style: str, size: float) -> float:
+        """Szerokość tekstu w punktach wg metryk czcionki wbudowanej"""
+        widths = CORE_FONTS_CHARWIDTHS[FONTS[style][1]]
+        return sum(widths.get(char, 500) for char in text) * size / 1000
+
+    def ensure_space(self, height: float):
+        """Nowa strona, gdy element o danej wysokości nie zmieści się na bieżącej"""
+        if self._content is None or self.y + height > PAGE_HEIGHT - MARGIN_BOTTOM:
+            self.add_page()
+
+    def ln(self, height: float):
+        self.y += height
+
+    def line(self, text: str, style: str = "", size: float = 9, height: float = 5 * MM, align: str = "L"):
+        """Jedna linia tekstu (odpowiednik FPDF.cell z przejściem do nowej linii)"""
+        self.ensure_space(height)
+        resource = FONTS[style][0]
+        if self._font != (resource, size):
+            self._content.append(f"/{resource} {size:.2f} Tf".encode())
+            self._font = (resource, size)
+
+        x = MARGIN_LEFT
+        if align == "C":
+            available = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+            x += max(0.0, (available - self.string_width(text, style, size)) / 2)
+
+        baseline = PAGE_HEIGHT - (self.y + height / 2 + 0.3 * size)
+        self._content.append(b"BT " + f"{x:.2f} {baseline:.2f} Td (".encode() + _escape(text) + b") Tj ET")
+        self.y += height
+
+    def paragraph(self, text: str, style: str = "", size: float = 9, height: float = 5 * MM):
+        """Tekst łamany na linie (odpowiednik FPDF.multi_cell)"""
+        for wrapped in self.wrap(text, style, size):
+            self.line(wrapped, style, size, height)
+
+    def wrap(self, text: str, style: str, size: float):
+        """Dzieli tekst na linie mieszczące się między marginesami"""
+        max_width = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+        space = self.string_width(" ", style, size)
+        current, current_width = [], 0.0
+
+        for word in text.split(" "):
+            word_width = self.string_width(word, style, size)
+            # Słowo dłuższe niż linia (np. URL) - dzielone po znakach
+            while word_width > max_width:
+                if current:
+                    yield " ".join(current)
+                    current, current_width = [], 0.0
+                cut = len(word)
+                while cut > 1 and self.string_width(word[:cut], style, size) > max_width:
+                    cut -= 1
+                yield word[:cut]
+                word = word[cut:]
+                word_width = self.string_width(word, style, size)
+
+            needed = word_width if not current else current_width + space + word_width
+            if current and needed > max_width:
+                yield " ".join(current)
+                current, current_width = [word], word_width
+            else:
+                current.append(word)
+                current_width = needed
+
+        if current and any(current):
+            yield " ".join(current)
+
+    def close(self):
+        """Zapisuje ostatnią stronę, drzewo stron, katalog i tabelę xref"""
+        if self._content is None and not self._page_ids:
+            self.add_page()
+        self._flush_page()
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode())
+        self._write_object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode())
+        info_id = self._allocate_id()
+        self._write_object(info_id, b"<< /Producer (SmartFlowAI) /Title (" + _escape(self.title) + b") >>")
+
+        xref_position = self._position
+        size = self._next_id
+        entries = [b"xref\n", f"0 {size}\n".encode(), b"0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            entries.append(f"{self._offsets[obj_id]:010d} 00000 n \n".encode())
+        self._write(b"".join(entries))
+        self._write(
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R /Info {info_id} 0 R >>\n"
+            f"startxref\n{xref_position}\n%%EOF\n".encode()
+        )
+
+
+def write_process_report(processes: Iterable[dict], header: str, footer: str, fileobj,
+                         compress: bool = True) -> dict:
+    """Zapisuje raport PDF ze wszystkich procesów do fileobj.
+
+    processes może być generatorem pobierającym dane porcjami - każdy proces
+    jest renderowany i zapominany, a pełne strony trafiają od razu do pliku.
+    Zwraca statystyki: liczba procesów i stron.
+    """
+    pdf = StreamingPDFWriter(fileobj, compress=compress, title=safe_text(flatten_text(header, HEADER_MAX_LENGTH)))
+
+    pdf.line(safe_text(flatten_text(header, HEADER_MAX_LENGTH)), "B", 14, 10 * MM, align="C")
+    pdf.ln(5 * MM)
+
+    count = 0
+    for count, process in enumerate(processes, 1):
+        # Tytuł nie zostaje sam na dole strony
+        pdf.ensure_space(19 * MM)
+        pdf.line(safe_text(flatten_text(f"{count}. {process.get('title', '')}", TITLE_MAX_LENGTH)), "B", 11, 8 * MM)
+
+        pdf.line("Opis:", "", 9, 6 * MM)
+        pdf.paragraph(safe_text(flatten_text(process.get('description', ''))), "", 9)
+        pdf.ln(2 * MM)
+
+        pdf.line("Analiza AI:", "", 9, 6 * MM)
+        pdf.paragraph(safe_text(flatten_text(process.get('ai_analysis', ''))), "", 9)
+        pdf.ln(3 * MM)
+
+    pdf.ln(5 * MM)
+    pdf.line(safe_text(flatten_text(footer, HEADER_MAX_LENGTH)), "", 8, 6 * MM, align="C")
+    pdf.close()
+
+    return {"processes": count, "pages": pdf.page_count}
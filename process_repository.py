@@ -0,0 +1,584 @@
+# -*- coding: utf-8 -*-
+# Plik: process_repository.py
+# process_repository.py - Warstwa dostępu do procesów biznesowych
+
+"""
+Repozytorium procesów biznesowych niezależne od bazy danych.
+
+- ProcessRepository: interfejs operacji na business_processes (i ustalania
+  user_id z tabeli users) używany przez aplikację i skrypty
+- SupabaseProcessRepository: implementacja na kliencie Supabase (PostgREST
+  i funkcje RPC z supabase_setup.sql)
+- SQLiteProcessRepository: lokalna baza SQLite (WAL, pula połączeń) o tej samej
+  semantyce - praca bez sieci i pomiary ścieżek zapytań na własnej maszynie;
+  klient zgodny z Supabase dla reszty aplikacji jest w sqlite_backend.py
+- CachingProcessRepository: dekorator cache odczytów (cache sesji Streamlit),
+  unieważnianego przy każdym udanym zapisie
+- TimedProcessRepository: dekorator mierzący każde zapytanie do bazy
+  (spany repo.<metoda> w telemetry.py)
+
+Wszystkie zapytania o procesy danego użytkownika filtrują po user_id, a zapis,
+edycja i usunięcie zwracają informację, czy zmieniono jakikolwiek wiersz.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+import process_views
+import telemetry
+
+logger = logging.getLogger(__name__)
+
+TABLE = "business_processes"
+DEFAULT_SQLITE_PATH = os.path.join("data", "smartflowai.sqlite3")
+DEFAULT_ANALYSIS_DEPTH = "Podstawowa (szybka)"
+UNKNOWN_LABEL = "Nie podano"
+
+
+class ProcessRepository(ABC):
+    """Operacje na procesach biznesowych użytkownika"""
+
+    @abstractmethod
+    def find_user_id(self, email: str) -> Optional[str]:
+        """user_id z tabeli users (None, gdy brak wpisu)"""
+
+    @abstractmethod
+    def list_processes(self, user_id: str, view: str = process_views.LIST) -> list:
+        """Wszystkie procesy użytkownika od najnowszego, kolumny widoku"""
+
+    @abstractmethod
+    def list_page(self, user_id: str, view: str, cursor, page_size: int):
+        """Porcja procesów keyset po (created_at, id) malejąco - zwraca (wiersze, kursor następnej porcji)"""
+
+    @abstractmethod
+    def get_process(self, user_id: str, process_id, view: str = process_views.DETAIL) -> Optional[dict]:
+        """Jeden proces użytkownika (None, gdy nie istnieje lub należy do innego użytkownika)"""
+
+    @abstractmethod
+    def insert_process(self, row: dict):
+        """Zapisuje nowy proces (wiersz z user_id)"""
+
+    @abstractmethod
+    def insert_processes(self, rows: list) -> int:
+        """Zapisuje wiele procesów jednym zapytaniem, zwraca liczbę zapisanych"""
+
+    @abstractmethod
+    def update_process(self, user_id: str, process_id, values: dict) -> bool:
+        """Aktualizuje proces użytkownika; False, gdy nic nie zmieniono"""
+
+    @abstractmethod
+    def delete_process(self, user_id: str, process_id) -> bool:
+        """Usuwa proces użytkownika; False, gdy nic nie usunięto"""
+
+    @abstractmethod
+    def search(self, user_id: str, query: str, limit: int) -> list:
+        """Najlepiej dopasowane procesy (id, title, created_at)"""
+
+    @abstractmethod
+    def stats(self, user_id: str, month_limit: int, industry_limit: int) -> Optional[dict]:
+        """Statystyki procesów w formacie funkcji get_process_stats"""
+
+
+class SupabaseProcessRepository(ProcessRepository):
+    """Repozytorium na kliencie Supabase"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def find_user_id(self, email: str) -> Optional[str]:
+        result = self.client.table('users').select('id').eq('email', email).execute()
+        return result.data[0]['id'] if result.data else None
+
+    def list_processes(self, user_id: str, view: str = process_views.LIST) -> list:
+        result = self.client.table(TABLE).select(process_views.columns(view)).eq('user_id', user_id).order('created_at', desc=True).execute()
+        return result.data
+
+    def list_page(self, user_id: str, view: str, cursor, page_size: int):
+        query = self.client.table(TABLE).select(process_views.columns(view)).eq('user_id', user_id)
+        if cursor:
+            created_at, last_id = cursor
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{last_id}")')
+        # Jeden wiersz ponad stronę mówi czy istnieje następna strona
+        result = query.order('created_at', desc=True).order('id', desc=True).limit(page_size + 1).execute()
+        return _split_page(result.data or [], page_size)
+
+    def get_process(self, user_id: str, process_id, view: str = process_views.DETAIL) -> Optional[dict]:
+        result = self.client.table(TABLE).select(process_views.columns(view)).eq('id', process_id).eq('user_id', user_id).limit(1).execute()
+        return result.data[0] if result.data else None
+
+    def insert_process(self, row: dict):
+        self.client.table(TABLE).insert(row).execute()
+
+    def insert_processes(self, rows: list) -> int:
+        if not rows:
+            return 0
+        self.client.table(TABLE).insert(rows).execute()
+        return len(rows)
+
+    def update_process(self, user_id: str, process_id, values: dict) -> bool:
+        # Jedno zapytanie z warunkiem własności - brak zwróconych wierszy oznacza
+        # cudzy lub nieistniejący proces
+        result = self.client.table(TABLE).update(values).eq('id', process_id).eq('user_id', user_id).execute()
+        return bool(result.data)
+
+    def delete_process(self, user_id: str, process_id) -> bool:
+        result = self.client.table(TABLE).delete().eq('id', process_id).eq('user_id', user_id).execute()
+        return bool(result.data)
+
+    def search(self, user_id: str, query: str, limit: int) -> list:
+        # Ranking po stronie bazy (search_business_processes_fts, indeks GIN)
+        result = self.client.rpc('search_business_processes_fts', {
+            'search_term': query,
+            'user_uuid': user_id,
+            'result_limit': limit
+        }).execute()
+        return result.data or []
+
+    def stats(self, user_id: str, month_limit: int, industry_limit: int) -> Optional[dict]:
+        result = self.client.rpc('get_process_stats', {
+            'user_uuid': user_id,
+            'month_limit': month_limit,
+            'industry_limit': industry_limit
+        }).execute()
+        return result.data or None
+
+
+def _split_page(rows: list, page_size: int):
+    """(strona, kursor następnej strony) z page_size + 1 wierszy"""
+    processes = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        next_cursor = (processes[-1]['created_at'], processes[-1]['id'])
+    return processes, next_cursor
+
+
+def iter_pages(repository: ProcessRepository, user_id: str, view: str, page_size: int):
+    """Generator wszystkich procesów użytkownika pobieranych stronami keyset (bez ładowania całości)"""
+    cursor = None
+    while True:
+        processes, cursor = repository.list_page(user_id, view, cursor, page_size)
+        yield from processes
+        if not cursor:
+            return
+
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT,
+    full_name TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    ai_analysis TEXT,
+    analysis_depth TEXT DEFAULT '{DEFAULT_ANALYSIS_DEPTH}',
+    industry TEXT,
+    automation_potential INTEGER CHECK (automation_potential >= 0 AND automation_potential <= 100),
+    time_savings_hours REAL,
+    cost_savings_annual REAL,
+    implementation_difficulty TEXT,
+    recommended_tools TEXT,
+    next_steps TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    analysis_status TEXT DEFAULT 'completed' CHECK (analysis_status IN ('pending', 'running', 'completed', 'failed')),
+    analysis_params TEXT,
+    analysis_error TEXT,
+    analysis_started_at TEXT,
+    analysis_attempts INTEGER DEFAULT 0
+);
+
+-- Lista, stronicowanie keyset i statystyki użytkownika: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_user_created_id ON {TABLE}(user_id, created_at DESC, id DESC);
+-- Kolejka analiz: worker pobiera najstarsze zadania 'pending' (indeks częściowy - tylko aktywne zadania)
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_analysis_queue ON {TABLE}(analysis_status, created_at)
+    WHERE analysis_status IN ('pending', 'running');
+"""
+
+# Kolumny JSONB w Postgres - w SQLite zapisywane jako tekst JSON
+JSON_COLUMNS = frozenset({"analysis_params"})
+BOOLEAN_COLUMNS = frozenset({"is_active"})
+# Czas oczekiwania na blokadę zapisu trzymaną przez inne połączenie (inny wątek lub proces)
+BUSY_TIMEOUT_MS = 5000
+
+# Kolumny, które można zapisać z aplikacji (id, user_id i znaczniki czasu ustala repozytorium)
+WRITABLE_COLUMNS = frozenset(process_views.PROCESS_COLUMNS) - {"id", "user_id", "created_at", "updated_at"}
+
+
+def utc_now() -> str:
+    """Znacznik czasu UTC w formacie ISO (sortowanie tekstowe zgodne z chronologicznym)"""
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _check_columns(values: dict):
+    unknown = set(values) - WRITABLE_COLUMNS
+    if unknown:
+        raise ValueError(f"Nieznane kolumny {TABLE}: {', '.join(sorted(unknown))}")
+
+
+def to_sqlite(column: str, value):
+    """Wartość kolumny w postaci zapisywanej w SQLite"""
+    if column in JSON_COLUMNS and value is not None:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def from_sqlite(row) -> dict:
+    """Wiersz SQLite -> słownik jak z PostgREST (JSON i boolean zdekodowane)"""
+    data = dict(row)
+    for column in JSON_COLUMNS.intersection(data):
+        if data[column] is not None:
+            data[column] = json.loads(data[column])
+    for column in BOOLEAN_COLUMNS.intersection(data):
+        if data[column] is not None:
+            data[column] = bool(data[column])
+    return data
+
+
+class SQLiteProcessRepository(ProcessRepository):
+    """Repozytorium w lokalnej bazie SQLite (bez sieci i bez Supabase)"""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._pool = queue.SimpleQueue()
+        self._shared = None
+        self._lock = threading.Lock()
+
+        if path == ":memory:":
+            # Baza w pamięci istnieje tylko w jednym połączeniu - współdzielone, chronione lockiem
+            self._shared = self._open()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        with self.connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+    def _open(self) -> sqlite3.Connection:
+        # Autocommit - transakcje zapisu otwierane jawnie w _transaction
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # WAL: odczyty nie czekają na zapis; synchronous=NORMAL jest bezpieczne w trybie WAL
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Połączenie z puli - wątki Streamlit i workera czytają równolegle"""
+        if self._shared is not None:
+            with self._lock:
+                yield self._shared
+            return
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Transakcja zapisu - BEGIN IMMEDIATE blokuje zapis od początku, więc sprawdzenie
+        warunku i zmiana wierszy są atomowe także między procesami (np. dwa workery)"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _query(self, sql: str, params=()) -> list:
+        with self.connection() as conn:
+            return [from_sqlite(row) for row in conn.execute(sql, params).fetchall()]
+
+    def _write(self, sql: str, params=(), many: bool = False) -> int:
+        """Zapytanie modyfikujące w transakcji, zwraca liczbę zmienionych wierszy"""
+        with self.transaction() as conn:
+            cursor = conn.executemany(sql, params) if many else conn.execute(sql, params)
+            return cursor.rowcount
+
+    def add_user(self, email: str, user_id: str = None, password_hash: str = None, full_name: str = None) -> str:
+        """Dodaje użytkownika (lub zwraca id istniejącego) - odpowiednik wpisu w tabeli users"""
+        now = utc_now()
+        self._write(
+            "INSERT INTO users (id, email, password_hash, full_name, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (email) DO NOTHING",
+            (user_id or str(uuid.uuid4()), email, password_hash, full_name, now, now)
+        )
+        return self.find_user_id(email)
+
+    def find_user_id(self, email: str) -> Optional[str]:
+        rows = self._query("SELECT id FROM users WHERE email = ?", (email,))
+        return rows[0]['id'] if rows else None
+
+    def list_processes(self, user_id: str, view: str = process_views.LIST) -> list:
+        return self._query(
+            f"SELECT {process_views.columns(view)} FROM {TABLE} WHERE user_id = ? ORDER BY created_at DESC, id DESC",
+            (user_id,)
+        )
+
+    def list_page(self, user_id: str, view: str, cursor, page_size: int):
+        sql = f"SELECT {process_views.columns(view)} FROM {TABLE} WHERE user_id = ?"
+        params = [user_id]
+        if cursor:
+            sql += " AND (created_at, id) < (?, ?)"
+            params.extend(cursor)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(page_size + 1)
+        return _split_page(self._query(sql, params), page_size)
+
+    def get_process(self, user_id: str, process_id, view: str = process_views.DETAIL) -> Optional[dict]:
+        rows = self._query(
+            f"SELECT {process_views.columns(view)} FROM {TABLE} WHERE id = ? AND user_id = ? LIMIT 1",
+            (process_id, user_id)
+        )
+        return rows[0] if rows else None
+
+    def insert_rows(self, rows: list) -> list:
+        """Zapisuje procesy w jednej transakcji, zwraca zapisane wiersze (z id i created_at)"""
+        prepared = []
+        for row in rows:
+            values = {key: value for key, value in row.items() if key != 'user_id'}
+            _check_columns(values)
+            now = utc_now()
+            prepared.append({'id': str(uuid.uuid4()), 'user_id': row['user_id'],
+                             'created_at': now, 'updated_at': now, **values})
+
+        # Jedno zapytanie na zestaw kolumn (wiersze importu mają zwykle te same kolumny)
+        groups = {}
+        for row in prepared:
+            groups.setdefault(tuple(row), []).append(tuple(to_sqlite(column, value) for column, value in row.items()))
+        with self.transaction() as conn:
+            for columns, values in groups.items():
+                placeholders = ", ".join("?" for _ in columns)
+                conn.executemany(f"INSERT INTO {TABLE} ({', '.join(columns)}) VALUES ({placeholders})", values)
+        return prepared
+
+    def insert_process(self, row: dict):
+        self.insert_rows([row])
+
+    def insert_processes(self, rows: list) -> int:
+        return len(self.insert_rows(rows)) if rows else 0
+
+    def update_process(self, user_id: str, process_id, values: dict) -> bool:
+        _check_columns(values)
+        if not values:
+            return False
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        changed = self._write(
+            f"UPDATE {TABLE} SET {assignments}, updated_at = ? WHERE id = ? AND user_id = ?",
+            (*(to_sqlite(column, value) for column, value in values.items()), utc_now(), process_id, user_id)
+        )
+        return changed > 0
+
+    def delete_process(self, user_id: str, process_id) -> bool:
+        return self._write(f"DELETE FROM {TABLE} WHERE id = ? AND user_id = ?", (process_id, user_id)) > 0
+
+    def search(self, user_id: str, query: str, limit: int) -> list:
+        """Wszystkie słowa frazy muszą wystąpić; dopasowania w tytule najwyżej"""
+        terms = [term for term in query.split() if term]
+        if not terms:
+            return []
+
+        patterns = [f"%{term}%" for term in terms]
+        condition = "(title LIKE ? OR description LIKE ? OR COALESCE(ai_analysis, '') LIKE ?)"
+        rank = "(title LIKE ?) * 3 + (description LIKE ?) * 2 + (COALESCE(ai_analysis, '') LIKE ?)"
+        term_params = [pattern for pattern in patterns for _ in range(3)]
+
+        sql = (f"SELECT id, title, created_at, {' + '.join([rank] * len(terms))} AS rank FROM {TABLE} "
+               f"WHERE user_id = ? AND is_active = 1 AND {' AND '.join([condition] * len(terms))} "
+               f"ORDER BY rank DESC, created_at DESC LIMIT ?")
+        return self._query(sql, (*term_params, user_id, *term_params, limit))
+
+    def stats(self, user_id: str, month_limit: int, industry_limit: int) -> Optional[dict]:
+        """Te same agregaty co funkcja get_process_stats w supabase_setup.sql"""
+        now = datetime.now(timezone.utc)
+        month_index = now.year * 12 + now.month - 1 - (month_limit - 1)
+        since = datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc).isoformat()
+
+        totals = self._query(
+            f"SELECT COUNT(*) AS total_processes, ROUND(AVG(automation_potential), 1) AS avg_automation_potential, "
+            f"COALESCE(SUM(time_savings_hours), 0) AS total_time_savings, "
+            f"COALESCE(SUM(cost_savings_annual), 0) AS total_cost_savings "
+            f"FROM {TABLE} WHERE user_id = ? AND is_active = 1",
+            (user_id,)
+        )[0]
+        totals['per_month'] = self._query(
+            f"SELECT substr(created_at, 1, 7) AS month, COUNT(*) AS count FROM {TABLE} "
+            f"WHERE user_id = ? AND is_active = 1 AND created_at >= ? GROUP BY month ORDER BY month",
+            (user_id, since)
+        )
+        totals['per_depth'] = self._query(
+            f"SELECT COALESCE(analysis_depth, ?) AS analysis_depth, COUNT(*) AS count FROM {TABLE} "
+            f"WHERE user_id = ? AND is_active = 1 GROUP BY 1 ORDER BY count DESC",
+            (UNKNOWN_LABEL, user_id)
+        )
+        totals['per_industry'] = self._query(
+            f"SELECT COALESCE(NULLIF(industry, ''), ?) AS industry, COUNT(*) AS count FROM {TABLE} "
+            f"WHERE user_id = ? AND is_active = 1 GROUP BY 1 ORDER BY count DESC LIMIT ?",
+            (UNKNOWN_LABEL, user_id, industry_limit)
+        )
+        return totals
+
+    def close(self):
+        if self._shared is not None:
+            with self._lock:
+                self._shared.close()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class CachingProcessRepository(ProcessRepository):
+    """Cache odczytów w słowniku (np. cache sesji Streamlit) przed innym repozytorium.
+
+    Udany zapis, edycja lub usunięcie czyści cały słownik. Statystyki są
+    dodatkowo ważne tylko przez stats_ttl sekund - zmiany z innych sesji
+    (worker analiz, import z CLI) widoczne są najpóźniej po tym czasie.
+    """
+
+    def __init__(self, inner: ProcessRepository, cache: dict, stats_ttl: float = 60, clock=None):
+        self.inner = inner
+        self.cache = cache
+        self.stats_ttl = stats_ttl
+        self.clock = clock or time.monotonic
+
+    def _cached(self, key: tuple, load):
+        if key in self.cache:
+            telemetry.observe("cache.session_hit", 1)
+            return self.cache[key]
+        telemetry.observe("cache.session_hit", 0)
+        value = load()
+        self.cache[key] = value
+        return value
+
+    def invalidate(self):
+        self.cache.clear()
+
+    def find_user_id(self, email: str) -> Optional[str]:
+        return self.inner.find_user_id(email)
+
+    def list_processes(self, user_id: str, view: str = process_views.LIST) -> list:
+        return self._cached(('processes', user_id, view), lambda: self.inner.list_processes(user_id, view))
+
+    def list_page(self, user_id: str, view: str, cursor, page_size: int):
+        return self._cached(('page', user_id, view, cursor, page_size),
+                            lambda: self.inner.list_page(user_id, view, cursor, page_size))
+
+    def get_process(self, user_id: str, process_id, view: str = process_views.DETAIL) -> Optional[dict]:
+        return self._cached(('details', user_id, process_id, view), lambda: self.inner.get_process(user_id, process_id, view))
+
+    def insert_process(self, row: dict):
+        self.inner.insert_process(row)
+        self.invalidate()
+
+    def insert_processes(self, rows: list) -> int:
+        saved = self.inner.insert_processes(rows)
+        if saved:
+            self.invalidate()
+        return saved
+
+    def update_process(self, user_id: str, process_id, values: dict) -> bool:
+        changed = self.inner.update_process(user_id, process_id, values)
+        if changed:
+            self.invalidate()
+        return changed
+
+    def delete_process(self, user_id: str, process_id) -> bool:
+        deleted = self.inner.delete_process(user_id, process_id)
+        if deleted:
+            self.invalidate()
+        return deleted
+
+    def search(self, user_id: str, query: str, limit: int) -> list:
+        return self._cached(('search', user_id, query, limit), lambda: self.inner.search(user_id, query, limit))
+
+    def stats(self, user_id: str, month_limit: int, industry_limit: int) -> Optional[dict]:
+        key = ('stats', user_id, month_limit, industry_limit)
+        cached = self.cache.get(key)
+        if cached and self.clock() - cached[0] < self.stats_ttl:
+            telemetry.observe("cache.session_hit", 1)
+            return cached[1]
+        telemetry.observe("cache.session_hit", 0)
+        stats = self.inner.stats(user_id, month_limit, industry_limit)
+        self.cache[key] = (self.clock(), stats)
+        return stats
+
+
+class TimedProcessRepository(ProcessRepository):
+    """Span repo.<metoda> dla każdego wywołania innego repozytorium - jedno wywołanie to jedno zapytanie do bazy.
+
+    Pod CachingProcessRepository mierzy tylko odczyty nieobsłużone z cache,
+    więc liczba spanów repo.* w przebiegu strony to liczba zapytań do bazy.
+    """
+
+    def __init__(self, inner: ProcessRepository):
+        self.inner = inner
+
+    def find_user_id(self, email: str) -> Optional[str]:
+        with telemetry.span("repo.find_user_id"):
+            return self.inner.find_user_id(email)
+
+    def list_processes(self, user_id: str, view: str = process_views.LIST) -> list:
+        with telemetry.span("repo.list_processes", view=view):
+            return self.inner.list_processes(user_id, view)
+
+    def list_page(self, user_id: str, view: str, cursor, page_size: int):
+        with telemetry.span("repo.list_page", view=view):
+            return self.inner.list_page(user_id, view, cursor, page_size)
+
+    def get_process(self, user_id: str, process_id, view: str = process_views.DETAIL) -> Optional[dict]:
+        with telemetry.span("repo.get_process", view=view):
+            return self.inner.get_process(user_id, process_id, view)
+
+    def insert_process(self, row: dict):
+        with telemetry.span("repo.insert_process"):
+            return self.inner.insert_process(row)
+
+    def insert_processes(self, rows: list) -> int:
+        with telemetry.span("repo.insert_processes"):
+            return self.inner.insert_processes(rows)
+
+    def update_process(self, user_id: str, process_id, values: dict) -> bool:
+        with telemetry.span("repo.update_process"):
+            return self.inner.update_process(user_id, process_id, values)
+
+    def delete_process(self, user_id: str, process_id) -> bool:
+        with telemetry.span("repo.delete_process"):
+            return self.inner.delete_process(user_id, process_id)
+
+    def search(self, user_id: str, query: str, limit: int) -> list:
+        with telemetry.span("repo.search"):
+            return self.inner.search(user_id, query, limit)
+
+    def stats(self, user_id: str, month_limit: int, industry_limit: int) -> Optional[dict]:
+        with telemetry.span("repo.stats"):
+            return self.inner.stats(user_id, month_limit, industry_limit)
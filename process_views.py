@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Plik: process_views.py
+# process_views.py - Projekcje kolumn business_processes dla widoków aplikacji
+
+"""
+Projekcje kolumn tabeli business_processes.
+
+Każde zapytanie o procesy deklaruje widok, a do bazy wysyłana jest lista
+tylko jego kolumn - duże pola tekstowe (description, ai_analysis) nie są
+przesyłane tam, gdzie nie są wyświetlane (lista, nagłówek zakładki PDF,
+status zadań).
+
+- LIST: lista procesów, stronicowanie, zakładka PDF (id, title, created_at)
+- DETAIL: rozwinięty proces - opis, analiza AI, status i metryki
+- EXPORT: raport PDF i tekst do skopiowania
+- JOB_STATUS / JOB_QUEUE: status zadań w interfejsie i kolejka workera
+"""
+
+# Kolumny tabeli business_processes (supabase_setup.sql)
+PROCESS_COLUMNS = (
+    "id", "user_id", "title", "description", "ai_analysis", "analysis_depth", "industry",
+    "automation_potential", "time_savings_hours", "cost_savings_annual", "implementation_difficulty",
+    "recommended_tools", "next_steps", "created_at", "updated_at", "is_active",
+    "analysis_status", "analysis_params", "analysis_error", "analysis_started_at", "analysis_attempts"
+)
+
+LIST = "list"
+DETAIL = "detail"
+EXPORT = "export"
+JOB_STATUS = "job_status"
+JOB_QUEUE = "job_queue"
+
+VIEWS = {
+    LIST: ("id", "title", "created_at"),
+    DETAIL: ("id", "title", "description", "ai_analysis", "created_at", "analysis_status", "analysis_error",
+             "automation_potential", "time_savings_hours", "cost_savings_annual", "implementation_difficulty"),
+    EXPORT: ("id", "title", "description", "ai_analysis", "created_at"),
+    JOB_STATUS: ("id", "title", "analysis_status", "analysis_error"),
+    JOB_QUEUE: ("id", "title", "description", "analysis_params", "analysis_attempts"),
+}
+
+
+def fields(view: str) -> tuple:
+    """Kolumny widoku (ValueError dla nieznanego widoku)"""
+    try:
+        return VIEWS[view]
+    except KeyError:
+        raise ValueError(f"Nieznany widok procesów: {view}") from None
+
+
+def columns(view: str) -> str:
+    """Lista kolumn widoku w formacie select() PostgREST, np. 'id,title,created_at'"""
+    return ",".join(fields(view))
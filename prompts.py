@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+# Plik: prompts.py
+# prompts.py - Szablony promptów analizy AI
+
+"""
+Wersjonowane szablony promptów analizy procesów.
+
+Każdy szablon to stały prefiks (instrukcje, schemat i format odpowiedzi)
+oraz zmienny sufiks z danymi procesu i kontekstem firmy. Prefiks jest
+identyczny bajt w bajt przy każdym wywołaniu, dzięki czemu OpenAI może
+użyć prompt caching (automatycznie dla promptów od 1024 tokenów) - mniejsze
+opóźnienie i tańsze tokeny wejściowe. Sufiks kompilowany jest raz przy
+imporcie do listy (tekst, pole), a render tylko skleja fragmenty.
+
+Zmiana treści szablonu = nowa wersja (PromptTemplate.version).
+"""
+
+from string import Formatter
+
+
+class PromptTemplate:
+    """Szablon promptu: stały prefiks + skompilowany sufiks z polami {nazwa}"""
+
+    def __init__(self, name: str, version: str, prefix: str, suffix: str):
+        self.name = name
+        self.version = version
+        self.prefix = prefix
+        self.fields = []
+        self._parts = []
+        for literal, field, _, _ in Formatter().parse(suffix):
+            self._parts.append((literal, field))
+            if field:
+                self.fields.append(field)
+
+    def render(self, **values) -> str:
+        """Prompt: prefiks, a po nim sufiks z wstawionymi wartościami"""
+        return self.prefix + "".join(literal + (values[field] if field else "") for literal, field in self._parts)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.version}"
+
+
+# Uwagi branżowe dołączane do danych procesu
+INDUSTRY_NOTES = {
+    "E-commerce/Handel": "Uwzględnij integracje z Allegro, Amazon, BaseLinker, Shopify, WooCommerce, systemy magazynowe i płatności online.",
+    "Księgowość": "Uwzględnij integracje z iFirma, Wfirma, SAP, Comarch ERP, JPK, US, ZUS, systemy bankowe.",
+    "Marketing/Reklama": "Uwzględnij integracje z Facebook Ads, Google Ads, MailChimp, HubSpot, analytics, CRM.",
+    "IT/Software": "Uwzględnij integracje z GitHub, Jira, Slack, CI/CD, monitoring, ticketing systems.",
+    "Logistyka": "Uwzględnij integracje z systemami WMS, TMS, śledzenie przesyłek, API kurierów.",
+    "Usługi finansowe": "Uwzględnij integracje z systemami bankowymi, KNF, AML, RODO, systemy płatności.",
+    "Produkcja": "Uwzględnij integracje z systemami ERP, MES, IoT, kontrola jakości, planowanie produkcji.",
+    "Edukacja": "Uwzględnij integracje z systemami LMS, e-learning, zarządzanie studentami, certyfikaty.",
+    "Zdrowie": "Uwzględnij integracje z systemami medycznymi, RODO w ochronie zdrowia, NFZ, e-recepty."
+}
+
+COMPANY_CONTEXT = PromptTemplate("kontekst-firmy", "1", "", """
+## KONTEKST FIRMY:
+**Wielkość firmy:** {company_size}
+**Branża:** {industry}
+**Budżet na automatyzację:** {budget}
+""")
+
+INDUSTRY_CONTEXT = PromptTemplate("uwagi-branzowe", "1", "", "\n\n**UWAGI BRANŻOWE:** {note}")
+
+BASIC_PROMPT = PromptTemplate("podstawowa", "2", """Przeanalizuj proces biznesowy opisany na końcu wiadomości i podaj krótką rekomendację.
+
+Odpowiedz w formacie:
+🔍 **ANALIZA:** [główny problem w 2-3 zdaniach]
+🛠️ **ROZWIĄZANIE:** [konkretne narzędzie np. Zapier, Airtable]
+💰 **KOSZT:** [szacowany koszt miesięczny]
+⏱️ **OSZCZĘDNOŚCI:** [szacowany czas/pieniądze miesięcznie]
+⚡ **PIERWSZE KROKI:** [2-3 konkretne kroki]
+""", """
+PROCES: {title}
+OPIS: {description}
+{company_context}{branch_specific}
+""")
+
+EXPERT_PROMPT = PromptTemplate("ekspercka", "2", """Jesteś ekspertem w automatyzacji procesów biznesowych z 15-letnim doświadczeniem. Przeprowadź najgłębszą możliwą analizę procesu opisanego na końcu wiadomości (sekcja PROCES DO ANALIZY).
+
+WAŻNE: Wyszukaj w internecie najnowsze informacje o narzędziach, cennikach, case studies i opiniach użytkowników z 2025 roku.
+
+## ULTRA SZCZEGÓŁOWA ANALIZA:
+
+### 1. DEKOMPOZYCJA PROCESU (szczegółowa)
+- Mapowanie każdego kroku z czasami
+- Identyfikacja wszystkich touchpointów
+- Analiza przepływu danych i dokumentów
+- Punkty integracji z innymi systemami
+
+### 2. ANALIZA PROBLEMÓW (pogłębiona)
+- Koszty ukryte i jawne
+- Analiza ryzyka błędów
+- Wpływ na inne procesy
+- Bottlenecki i wąskie gardła
+
+### 3. BADANIE RYNKU (aktualne dane 2025)
+- Porównanie 5-7 najlepszych narzędzi
+- Aktualne cenniki i promocje
+- Opinie użytkowników z ostatnich 6 miesięcy
+- Integracje z polskimi systemami (US, ZUS, JPK)
+
+### 4. WARIANTY ROZWIĄZAŃ (3 opcje)
+- BASIC: Minimum viable automation
+- STANDARD: Optymalne rozwiązanie
+- PREMIUM: Maksymalna automatyzacja
+
+### 5. SZCZEGÓŁOWY PLAN WDROŻENIA (8 tygodni)
+- Harmonogram tygodniowy
+- Zasoby i kompetencje
+- Punkty kontrolne i KPI
+- Plan zarządzania ryzykiem
+
+### 6. ANALIZA FINANSOWA (ROI)
+- Szczegółowe kalkulacje kosztów
+- Analiza zwrotu z inwestycji
+- Scenariusze optymistyczny/pesymistyczny
+- Ukryte koszty i oszczędności
+
+### 7. MONITORING I OPTYMALIZACJA
+- KPI do śledzenia
+- Narzędzia monitoringu
+- Plan ciągłego doskonalenia
+
+Odpowiedz w pełnym formacie z wszystkimi sekcjami, bądź bardzo konkretny w rekomendacjach.
+""", """
+## PROCES DO ANALIZY:
+**Nazwa procesu:** {title}
+**Opis procesu:** {description}
+{company_context}{branch_specific}
+""")
+
+# Domyślny szablon dla pozostałych głębokości
+DEEP_PROMPT = PromptTemplate("poglebiona", "2", """Jesteś ekspertem w automatyzacji procesów biznesowych i rozwiązaniach no-code/low-code. Twoim zadaniem jest przeprowadzenie pogłębionej analizy procesu biznesowego opisanego na końcu wiadomości (sekcja PROCES DO ANALIZY) i zaproponowanie konkretnego planu automatyzacji.
+
+WAŻNE: Przed rozpoczęciem analizy, wyszukaj w internecie aktualne informacje o najnowszych narzędziach no-code/low-code dostępnych na polskim rynku w 2025 roku, ich cennikach, możliwościach integracji i opinii użytkowników.
+
+## SCHEMAT ANALIZY:
+
+### 1. DEKOMPOZYCJA PROCESU
+Rozłóż proces na jednotne kroki i zidentyfikuj:
+- Punkty wejścia (triggery)
+- Działania manualne
+- Przepływ danych
+- Punkty decyzyjne
+- Interakcje międzyludzkie
+- Wyniki końcowe
+
+### 2. IDENTYFIKACJA PROBLEMÓW
+Dla każdego kroku określ:
+- Czasochłonność (szacuj minuty/godziny)
+- Podatność na błędy
+- Powtarzalność
+- Wymagane umiejętności
+- Wąskie gardła procesu
+
+### 3. BADANIE RYNKU NARZĘDZI
+Wyszukaj i przeanalizuj aktualne narzędzia no-code/low-code, koncentrując się na:
+- **Polskim rynku:** Asseco, iFirma, Comarch, BaseLinker
+- **Globalnych liderach:** Zapier, Make.com, n8n, Airtable, Monday.com
+- **Niszowych rozwiązaniach:** branżowe automaty, AI-powered tools
+- **Aktualne cenniki** za 2025 rok
+- **Integracje** z polskimi systemami
+
+### 4. PROJEKTOWANIE ROZWIĄZANIA
+Zaproponuj 2-3 warianty automatyzacji:
+- **WARIANT PODSTAWOWY** - szybke wdrożenie, niski koszt
+- **WARIANT OPTYMALNY** - balans między kosztem a efektywnością  
+- **WARIANT PREMIUM** - maksymalna automatyzacja
+
+Dla każdego wariantu określ:
+- Główne narzędzie/platformę
+- Dodatkowe integracje
+- Stopień automatyzacji (%)
+- Szacowany czas wdrożenia
+- Koszt miesięczny/roczny
+
+### 5. SZCZEGÓŁOWY PLAN WDROŻENIA
+Dla wybranego wariantu (optymalnego) opisz:
+
+**FAZA 1: PRZYGOTOWANIE (Tydzień 1-2)**
+- Lista wymaganych kont/licencji
+- Konfiguracja środowiska
+- Przygotowanie danych źródłowych
+- Szkolenie zespołu
+
+**FAZA 2: IMPLEMENTACJA (Tydzień 3-4)**
+- Krok po kroku konfiguracja narzędzi
+- Tworzenie automatyzacji/workflow
+- Testy podstawowe
+- Integracje z istniejącymi systemami
+
+**FAZA 3: TESTOWANIE (Tydzień 5)**
+- Testy funkcjonalne
+- Testy obciążeniowe
+- Procedury awaryjne
+- Poprawki i optymalizacje
+
+**FAZA 4: WDROŻENIE (Tydzień 6)**
+- Migracja danych
+- Szkolenie użytkowników końcowych
+- Monitoring pierwszych tygodni
+- Dokumentacja procesów
+
+### 6. ANALIZA KORZYŚCI
+Oblicz konkretne oszczędności:
+
+**OSZCZĘDNOŚCI CZASOWE:**
+- Czas obecnie: X godzin miesięcznie
+- Czas po automatyzacji: Y godzin miesięcznie
+- Oszczędność: (X-Y) godzin = Z% redukcji
+
+**OSZCZĘDNOŚCI FINANSOWE:**
+- Koszt pracy ludzkiej: [stawka/h] × [godziny] = A zł/mies.
+- Koszt narzędzi: B zł/mies.
+- Oszczędność netto: (A-B) zł/mies.
+- ROI: [(A-B)/B] × 100%
+
+**KORZYŚCI JAKOŚCIOWE:**
+- Redukcja błędów (szacuj %)
+- Poprawa konsystencji
+- Skalowalność procesu
+- Lepsza widoczność/reporting
+
+### 7. RYZYKA I MITYGACJA
+Zidentyfikuj potencjalne problemy:
+- Techniczne (integracje, stabilność)
+- Biznesowe (opór zespołu, zmiana procesów)
+- Finansowe (ukryte koszty, lock-in vendor)
+- Strategia zarządzania ryzykiem
+
+### 8. ALTERNATYWNE PODEJŚCIA
+Jeśli automatyzacja nie jest opłacalna, zaproponuj:
+- Optymalizację manualną
+- Częściową automatyzację
+- Outsourcing procesu
+- Całkowitą eliminację procesu
+
+## FORMAT ODPOWIEDZI:
+
+Odpowiedz w następującym formacie:
+
+🔍 **ANALIZA PROCESU**
+[Dekompozycja na kroki z czasami]
+
+⚠️ **ZIDENTYFIKOWANE PROBLEMY**  
+[Lista wąskich gardeł i czasochłonnych działań]
+
+🛠️ **REKOMENDOWANE ROZWIĄZANIE**
+**Narzędzie główne:** [nazwa] - [krótki opis]
+**Dodatkowe integracje:** [lista]
+**Stopień automatyzacji:** [X]%
+
+💰 **INWESTYCJA**
+**Koszt wdrożenia:** [kwota] zł jednorazowo
+**Koszt miesięczny:** [kwota] zł/mies.
+
+⏱️ **OSZCZĘDNOŚCI**
+**Czas:** [X] godzin miesięcznie → [Y] godzin (redukcja o [Z]%)
+**Pieniądze:** [kwota] zł miesięcznie oszczędności netto
+**ROI:** [X]% zwrot w [Y] miesięcy
+
+📋 **PLAN WDROŻENIA** (6 tygodni)
+**Tydzień 1-2:** [przygotowanie]
+**Tydzień 3-4:** [implementacja]  
+**Tydzień 5:** [testy]
+**Tydzień 6:** [wdrożenie]
+
+⚡ **PIERWSZE KROKI**
+1. [konkretny krok 1]
+2. [konkretny krok 2]  
+3. [konkretny krok 3]
+
+🎯 **OCZEKIWANE REZULTATY**
+[Konkretne, mierzalne korzyści w perspektywie 3-6 miesięcy]
+
+## UWAGI DODATKOWE:
+- Uwzględnij specyfikę polskiego rynku (RODO, JPK, integracje z US/ZUS)
+- Sprawdź dostępność polskiego wsparcia technicznego
+- Oceń łatwość wdrożenia dla zespołu bez doświadczenia IT
+- Zaproponuj monitoring i KPI do śledzenia efektywności
+
+Bądź bardzo konkretny w rekomendacjach - podawaj nazwiska narzędzi, linki, ceny, czasy wdrożenia. Używaj aktualnych danych z 2025 roku.
+""", """
+## PROCES DO ANALIZY:
+**Nazwa procesu:** {title}
+**Opis procesu:** {description}
+{company_context}{branch_specific}
+""")
+
+TEMPLATES = {
+    "Podstawowa (szybka)": BASIC_PROMPT,
+    "Pogłębiona (z wyszukiwaniem)": DEEP_PROMPT,
+    "Ekspercka (pełna analiza)": EXPERT_PROMPT,
+}
+
+
+def template_for(analysis_depth: str) -> PromptTemplate:
+    """Szablon dla głębokości analizy (nieznana głębokość - pogłębiona)"""
+    return TEMPLATES.get(analysis_depth, DEEP_PROMPT)
+
+
+def render_analysis_prompt(title: str, description: str, analysis_depth: str, company_size: str = "",
+                           industry: str = "", budget: str = "") -> str:
+    """Pełny prompt analizy - stały prefiks szablonu i dane procesu na końcu"""
+    company_context = ""
+    if company_size or industry or budget:
+        company_context = COMPANY_CONTEXT.render(company_size=company_size, industry=industry, budget=budget)
+
+    branch_specific = ""
+    if industry in INDUSTRY_NOTES:
+        branch_specific = INDUSTRY_CONTEXT.render(note=INDUSTRY_NOTES[industry])
+
+    return template_for(analysis_depth).render(
+        title=title, description=description, company_context=company_context, branch_specific=branch_specific
+    )
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# Plik: smartflowai/__init__.py
+# __init__.py - Pakiet aplikacji SmartFlowAI
+
+"""
+Warstwy aplikacji SmartFlowAI importowane raz na proces:
+
+- smartflowai.ai - analiza procesów przez OpenAI
+- smartflowai.storage - klient bazy i operacje na procesach
+- smartflowai.reports - raporty tekstowe i PDF
+- smartflowai.ui - strony Streamlit
+
+streamlit_app.py jest tylko punktem wejścia wywołującym ui.main() przy
+każdej interakcji. Moduły ai, storage i reports nie renderują interfejsu,
+więc korzystają z nich też skrypty CLI (batch_analysis.py) i worker analiz
+w tle (analysis_jobs.py).
+"""
+
+from dotenv import load_dotenv
+
+# Ładuj zmienne środowiskowe z .env (także dla CLI i workerów)
+load_dotenv()
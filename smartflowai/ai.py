@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+# Plik: smartflowai/ai.py
+# ai.py - Analiza procesów przez OpenAI (synchroniczna, asynchroniczna i strumieniowa)
+
+"""
+Analiza procesów biznesowych przez ChatGPT-4o.
+
+Prompt budowany z wersjonowanych szablonów (prompts.py) z budżetem tokenów
+(token_budget.py), zapytania przez współdzielonego klienta z ponowieniami
+(ai_client.py), odpowiedź JSON z metrykami (analysis_output.py), trwały
+cache odpowiedzi (ai_cache.py). Moduł nie renderuje interfejsu - używają go
+strony Streamlit, import wsadowy z CLI i worker analiz w tle.
+"""
+
+import logging
+import os
+
+import streamlit as st
+
+import ai_client
+import analysis_output
+import prompts
+import telemetry
+import token_budget
+from ai_cache import cache_from_env
+from ai_client import AnalysisError
+
+logger = logging.getLogger(__name__)
+
+# Mock OpenAI dla trybu testowego
+class MockOpenAI:
+    def __init__(self):
+        self.api_key = "test-key"
+
+@st.cache_resource
+def init_openai():
+    # Sprawdź czy jesteśmy w trybie testowym
+    environment = os.getenv("ENVIRONMENT", "").lower()
+    if environment == "test":
+        # Komunikat o trybie testowym wyświetla ui.show_environment_info
+        return MockOpenAI()
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    
+    # Fallback do secrets jeśli .env nie ma wartości
+    if not api_key:
+        try:
+            api_key = st.secrets.get("OPENAI_API_KEY", "")
+        except:
+            pass
+    
+    # Sprawdź czy jest tryb demo
+    demo_mode = False
+    try:
+        demo_mode = st.secrets.get("DEMO_MODE", False)
+    except:
+        pass
+    
+    if not api_key or api_key == "sk-demo_key_placeholder":
+        if demo_mode:
+            st.info("🧪 Tryb demo - używam mock OpenAI (brak prawdziwego klucza API)")
+            return MockOpenAI()
+        else:
+            st.error("❌ Brak klucza OpenAI! Sprawdź .env lub secrets.toml")
+            st.stop()
+    
+    # Jeden klient na proces - pula połączeń keep-alive współdzielona przez sesje i wątki
+    return ai_client.create_openai_client(api_key)
+
+@st.cache_resource
+def init_ai_cache():
+    """Trwały cache odpowiedzi AI (None gdy wyłączony przez AI_CACHE_ENABLED)"""
+    try:
+        return cache_from_env()
+    except Exception as e:
+        logger.error(f"AI_CACHE_ERROR: {str(e)}")
+        return None
+
+# Klient OpenAI tworzony przy pierwszej analizie (strona logowania nie importuje openai)
+openai_client = ai_client.LazyClient(init_openai)
+
+def build_analysis_prompt(title: str, description: str, analysis_depth: str = "Pogłębiona", company_size: str = "", industry: str = "", budget: str = "") -> str:
+    """Buduje prompt analizy dla wybranej głębokości i kontekstu firmy (szablony w prompts.py)"""
+    
+    # Zbyt długie dane użytkownika przycinane deterministycznie (stały prompt = trafienia w cache)
+    title, description = token_budget.trim_process_input(title, description)
+    
+    return prompts.render_analysis_prompt(title, description, analysis_depth, company_size, industry, budget)
+
+def get_test_mode_analysis(title: str) -> str:
+    """Przykładowa analiza zwracana w trybie testowym (ENVIRONMENT=test)"""
+    return f"""🔍 **ANALIZA PROCESU (TRYB TESTOWY)**
+Proces: {title}
+
+⚠️ **ZIDENTYFIKOWANE PROBLEMY**  
+- Proces wykonywany manualnie
+- Czasochłonne działania
+- Podatność na błędy
+
+🛠️ **REKOMENDOWANE ROZWIĄZANIE**
+**Narzędzie główne:** Zapier - automatyzacja workflow
+**Dodatkowe integracje:** Google Sheets, Email
+**Stopień automatyzacji:** 80%
+
+💰 **INWESTYCJA**
+**Koszt wdrożenia:** 500 zł jednorazowo
+**Koszt miesięczny:** 100 zł/mies.
+
+⏱️ **OSZCZĘDNOŚCI**
+**Czas:** 20 godzin miesięcznie → 4 godziny (redukcja o 80%)
+**Pieniądze:** 1500 zł miesięcznie oszczędności netto
+**ROI:** 300% zwrot w 2 miesiące
+
+📋 **PLAN WDROŻENIA** (6 tygodni)
+**Tydzień 1-2:** Analiza i konfiguracja
+**Tydzień 3-4:** Implementacja automatyzacji  
+**Tydzień 5:** Testy i optymalizacja
+**Tydzień 6:** Wdrożenie produkcyjne
+
+⚡ **PIERWSZE KROKI**
+1. Załóż konto Zapier
+2. Skonfiguruj pierwszy workflow
+3. Przetestuj na małej próbce danych
+
+🎯 **OCZEKIWANE REZULTATY**
+Znaczna redukcja czasu pracy manualnej i zwiększenie efektywności procesu.
+
+**UWAGA:** To jest analiza w trybie testowym. W wersji produkcyjnej otrzymasz szczegółową analizę AI."""
+
+def get_analysis_params(analysis_depth: str) -> dict:
+    """Parametry wywołania modelu dla wybranej głębokości analizy"""
+    return {
+        "model": "gpt-4o",  # WAŻNE: gpt-4o ma dostęp do internetu
+        "max_tokens": token_budget.completion_budget(analysis_depth),  # Więcej tokenów dla głębszej analizy
+        "temperature": 0.3,  # Niższa dla bardziej precyzyjnych rekomendacji
+        "response_format": analysis_output.RESPONSE_FORMAT  # Analiza + metryki do kolumn bazy
+    }
+
+@telemetry.timed("ai.analyze", labels=("analysis_depth",))
+def analyze_with_ai(title: str, description: str, analysis_depth: str = "Pogłębiona", company_size: str = "", industry: str = "", budget: str = "") -> str:
+    """Ultra wnikliwa analiza procesu przez ChatGPT-4o z wyszukiwaniem internetowym"""
+    prompt = build_analysis_prompt(title, description, analysis_depth, company_size, industry, budget)
+    
+    # Sprawdź czy jesteśmy w trybie testowym
+    environment = os.getenv("ENVIRONMENT", "").lower()
+    if environment == "test":
+        # Zwróć mock odpowiedź w trybie testowym
+        return get_test_mode_analysis(title)
+    
+    params = get_analysis_params(analysis_depth)
+    # Tokeny promptu liczone lokalnie - do limitera TPM i porównania z usage z odpowiedzi
+    prompt_tokens = token_budget.count_tokens(prompt)
+    
+    # Cache odpowiedzi - identyczny prompt i parametry zwracają zapisaną analizę
+    ai_cache = init_ai_cache()
+    cache_key = ai_cache.make_key(prompt, **params) if ai_cache else None
+    if ai_cache:
+        cached = ai_cache.get(cache_key)
+        telemetry.observe("cache.ai_hit", int(cached is not None))
+        if cached is not None:
+            return analysis_output.parse_analysis(cached)
+    
+    # Błąd po wyczerpaniu ponowień zgłaszany jest jako AnalysisError - nigdy jako tekst analizy
+    with telemetry.span("openai.request", analysis_depth=analysis_depth, mode="sync"):
+        response = ai_client.call_with_retry(
+            lambda: openai_client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                timeout=ai_client.request_timeout(analysis_depth),
+                **params
+            ),
+            prompt_tokens + params["max_tokens"]
+        )
+    token_budget.usage_ledger.record_response(analysis_depth, getattr(response, "usage", None), prompt_tokens)
+    content = response.choices[0].message.content
+    if ai_cache and isinstance(content, str) and content:
+        ai_cache.set(cache_key, content)
+    return analysis_output.parse_analysis(content)
+
+@telemetry.timed("ai.analyze_async", labels=("analysis_depth",))
+async def analyze_with_ai_async(title: str, description: str, analysis_depth: str = "Pogłębiona", company_size: str = "", industry: str = "", budget: str = "") -> str:
+    """Asynchroniczna wersja analyze_with_ai (AsyncOpenAI) - dla wielu analiz w jednej pętli zdarzeń"""
+    prompt = build_analysis_prompt(title, description, analysis_depth, company_size, industry, budget)
+    
+    environment = os.getenv("ENVIRONMENT", "").lower()
+    if environment == "test":
+        return get_test_mode_analysis(title)
+    
+    params = get_analysis_params(analysis_depth)
+    prompt_tokens = token_budget.count_tokens(prompt)
+    
+    ai_cache = init_ai_cache()
+    cache_key = ai_cache.make_key(prompt, **params) if ai_cache else None
+    if ai_cache:
+        cached = ai_cache.get(cache_key)
+        telemetry.observe("cache.ai_hit", int(cached is not None))
+        if cached is not None:
+            return analysis_output.parse_analysis(cached)
+    
+    client = ai_client.get_async_openai_client(openai_client.api_key)
+    with telemetry.span("openai.request", analysis_depth=analysis_depth, mode="async"):
+        response = await ai_client.acall_with_retry(
+            lambda: client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                timeout=ai_client.request_timeout(analysis_depth),
+                **params
+            ),
+            prompt_tokens + params["max_tokens"]
+        )
+    token_budget.usage_ledger.record_response(analysis_depth, getattr(response, "usage", None), prompt_tokens)
+    content = response.choices[0].message.content
+    if ai_cache and isinstance(content, str) and content:
+        ai_cache.set(cache_key, content)
+    return analysis_output.parse_analysis(content)
+
+@telemetry.timed("ai.stream", labels=("analysis_depth",))
+def stream_analysis_with_ai(title: str, description: str, analysis_depth: str = "Pogłębiona", company_size: str = "", industry: str = "", budget: str = "", metrics: dict = None):
+    """Strumieniowa wersja analyze_with_ai - generator zwracający kolejne fragmenty tekstu analizy.
+    
+    Po zakończeniu strumienia słownik `metrics` (jeśli podany) uzupełniany jest metrykami odpowiedzi.
+    """
+    prompt = build_analysis_prompt(title, description, analysis_depth, company_size, industry, budget)
+    
+    environment = os.getenv("ENVIRONMENT", "").lower()
+    if environment == "test":
+        for line in get_test_mode_analysis(title).splitlines(keepends=True):
+            yield line
+        return
+    
+    params = get_analysis_params(analysis_depth)
+    prompt_tokens = token_budget.count_tokens(prompt)
+    
+    # Trafienie w cache - cała odpowiedź od razu
+    ai_cache = init_ai_cache()
+    cache_key = ai_cache.make_key(prompt, **params) if ai_cache else None
+    if ai_cache:
+        cached = ai_cache.get(cache_key)
+        telemetry.observe("cache.ai_hit", int(cached is not None))
+        if cached is not None:
+            result = analysis_output.parse_analysis(cached)
+            if metrics is not None:
+                metrics.update(result.metrics)
+            yield str(result)
+            return
+    
+    chunks = []
+    # Odpowiedź to JSON - wyświetlany jest tylko tekst pola "analysis"
+    extractor = analysis_output.AnalysisStreamExtractor()
+    # Miejsce w limicie równoległych zapytań zajęte do końca strumienia
+    with ai_client.concurrency_slot(), telemetry.span("openai.request", analysis_depth=analysis_depth, mode="stream"):
+        # Ponawiane jest tylko otwarcie strumienia (tam pojawiają się 429) - nie fragmenty już wyświetlone
+        stream = ai_client.call_with_retry(
+            lambda: openai_client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                stream=True,
+                stream_options={"include_usage": True},  # Ostatni fragment zawiera usage
+                timeout=ai_client.request_timeout(analysis_depth),
+                **params
+            ),
+            prompt_tokens + params["max_tokens"],
+            hold_slot=False
+        )
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    token_budget.usage_ledger.record_response(analysis_depth, getattr(chunk, "usage", None), prompt_tokens)
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    text = extractor.feed(delta)
+                    if text:
+                        yield text
+        except Exception as e:
+            # Przerwany strumień nie trafia do cache ani do bazy
+            raise AnalysisError(f"Błąd analizy: {str(e)}") from e
+    
+    content = "".join(chunks)
+    if ai_cache and content:
+        ai_cache.set(cache_key, content)
+    if metrics is not None:
+        metrics.update(analysis_output.parse_analysis(content).metrics)
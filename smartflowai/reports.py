@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Plik: smartflowai/reports.py
+# reports.py - Zestawienie procesów jako tekst i PDF
+
+"""
+Raporty z przeanalizowanych procesów.
+
+Funkcje raportów przyjmują dowolny iterowalny zbiór procesów (np. generator
+storage.iter_processes_for_report pobierający dane porcjami), więc nadają
+się do interfejsu i do skryptów. Pakiet fpdf (pdf_report.py) ładowany jest
+dopiero przy pierwszym raporcie PDF.
+"""
+
+import io
+
+import telemetry
+from text_sanitizer import clean_text
+
+
+def iter_text_report(processes, header: str, footer: str, generated_on: str = ""):
+    """Kolejne fragmenty raportu tekstowego - proces po procesie"""
+    yield f"{header}\n{'='*50}\n\n"
+    for i, p in enumerate(processes, 1):
+        yield f"{i}. {clean_text(p.get('title',''))}\n"
+        yield f"{'='*30}\n"
+        yield f"OPIS:\n{clean_text(p.get('description',''))}\n\n"
+        yield f"ANALIZA AI:\n{clean_text(p.get('ai_analysis',''))}\n\n"
+        yield f"{'-'*50}\n\n"
+    yield f"\n{footer}\n"
+    yield f"Wygenerowano: {generated_on}"
+
+
+@telemetry.timed("report.txt")
+def build_text_report(processes, header: str, footer: str, generated_on: str = "") -> str:
+    """Tekst raportu jako jeden napis - do pola tekstowego (podgląd ograniczonej liczby procesów)"""
+    return "".join(iter_text_report(processes, header, footer, generated_on))
+
+
+@telemetry.timed("report.txt")
+def write_text_report(processes, header: str, footer: str, generated_on: str = "") -> bytes:
+    """Pełny raport .txt (UTF-8) wszystkich procesów.
+
+    Procesy czytane są z iteratora po jednym (bez listy wszystkich procesów), ale
+    gotowy plik powstaje w pamięci - st.download_button i tak przechowuje całą
+    zawartość pobieranego pliku.
+    """
+    output = io.BytesIO()
+    for part in iter_text_report(processes, header, footer, generated_on):
+        output.write(part.encode("utf-8"))
+    return output.getvalue()
+
+
+@telemetry.timed("report.pdf")
+def write_pdf_report(processes, header: str, footer: str):
+    """Raport PDF wszystkich procesów, zwraca (zawartość pliku, statystyki z pdf_report).
+
+    Procesy czytane są z iteratora po jednym, a strony zapisywane na bieżąco -
+    w pamięci nie ma listy procesów ani dokumentu FPDF ze wszystkimi stronami. Sam plik
+    powstaje w pamięci, jak przy write_text_report.
+    """
+    import pdf_report
+
+    output = io.BytesIO()
+    report_stats = pdf_report.write_process_report(processes, header, footer, output)
+    return output.getvalue(), report_stats
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+# Plik: smartflowai/storage.py
+# storage.py - Klient bazy danych i operacje na procesach zalogowanego użytkownika
+
+"""
+Dostęp do danych aplikacji.
+
+Klient bazy (Supabase lub lokalna baza SQLite - sqlite_backend.py) tworzony
+jest raz na proces. Funkcje CRUD działają w kontekście zalogowanego
+użytkownika z st.session_state (user_id ustalany raz na sesję) i korzystają
+z repozytorium procesów z cache sesji (process_repository.py). Kolejka
+analiz w tle (analysis_jobs.py) zapisuje wyniki w tej samej tabeli.
+"""
+
+import logging
+import os
+
+import streamlit as st
+
+import analysis_jobs
+import process_views
+import sqlite_backend
+import telemetry
+from process_repository import (CachingProcessRepository, ProcessRepository, SupabaseProcessRepository,
+                                TimedProcessRepository, iter_pages)
+from smartflowai import ai
+
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def init_supabase():
+    # Lokalna baza SQLite (ENVIRONMENT=test/local/offline lub DATABASE_BACKEND=sqlite)
+    try:
+        backend = sqlite_backend.backend_from_env()
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        st.stop()
+    if backend == sqlite_backend.BACKEND_SQLITE:
+        return sqlite_backend.client_from_env()
+    
+    url = os.getenv("SUPABASE_URL")
+    # Użyj service_role key dla pełnych uprawnień (development mode)
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_ANON_KEY")
+    
+    # Fallback do secrets jeśli .env nie ma wartości
+    if not url or not key:
+        try:
+            url = url or st.secrets.get("SUPABASE_URL", "")
+            # Najpierw spróbuj service_role, potem anon
+            key = key or st.secrets.get("SUPABASE_SERVICE_ROLE_KEY", "") or st.secrets.get("SUPABASE_ANON_KEY", "")
+        except:
+            pass
+    
+    if not url or not key:
+        st.error("❌ Brak konfiguracji Supabase! Sprawdź .env lub secrets.toml")
+        st.stop()
+    
+    # Import przy pierwszym użyciu - lokalna baza SQLite nie potrzebuje pakietu supabase
+    from supabase import create_client
+    return create_client(url, key)
+
+# Klient bazy współdzielony przez wszystkie sesje procesu
+supabase = init_supabase()
+
+@st.cache_resource
+def init_analysis_worker():
+    """Worker analiz w tle działający w procesie Streamlit (None gdy ANALYSIS_WORKER_MODE=external)"""
+    if analysis_jobs.worker_mode() != "inprocess":
+        return None
+    workers = int(os.getenv("ANALYSIS_WORKERS", analysis_jobs.DEFAULT_WORKERS))
+    return analysis_jobs.AnalysisWorker(supabase, ai.analyze_with_ai, workers=workers).start()
+
+# Mapowanie użytkowników testowych na UUID z bazy
+TEST_USER_IDS = {
+    "test@smartflowai.com": "550e8400-e29b-41d4-a716-446655440001",
+    "admin@smartflowai.com": "550e8400-e29b-41d4-a716-446655440002", 
+    "demo@smartflowai.com": "550e8400-e29b-41d4-a716-446655440003",
+    # Dodaj mapowanie dla błędnego emaila (fallback)
+    "test@smartflowai.pl": "550e8400-e29b-41d4-a716-446655440001"
+}
+
+# Stronicowanie listy procesów
+DEFAULT_PAGE_SIZE = 20
+
+# Raport - porcja pobierana z bazy
+REPORT_CHUNK_SIZE = 200
+
+# Wyszukiwanie pełnotekstowe
+SEARCH_MIN_LENGTH = 2
+SEARCH_RESULTS_LIMIT = 50
+
+# Statystyki dashboardu - wynik funkcji get_process_stats ważny przez STATS_CACHE_TTL sekund
+# (zmiany z innych sesji, np. workera analiz lub importu z CLI, widoczne najpóźniej po tym czasie)
+STATS_CACHE_TTL = 60
+STATS_MONTHS = 12
+STATS_TOP_INDUSTRIES = 10
+
+# Konta z dostępem do strony wydajności (lista emaili oddzielonych przecinkami)
+DEFAULT_ADMIN_EMAILS = "admin@smartflowai.com"
+
+def is_local_backend() -> bool:
+    """Czy aplikacja działa na lokalnej bazie SQLite (sqlite_backend) zamiast Supabase"""
+    return isinstance(supabase, sqlite_backend.SQLiteClient)
+
+def get_repository() -> ProcessRepository:
+    """Repozytorium procesów dla aktywnego klienta bazy (bez cache)"""
+    repository = supabase.repository if is_local_backend() else SupabaseProcessRepository(supabase)
+    # Przy włączonej telemetrii każde zapytanie do bazy to span repo.*
+    if telemetry.registry.enabled:
+        return TimedProcessRepository(repository)
+    return repository
+
+def get_session_repository() -> CachingProcessRepository:
+    """Repozytorium z cache sesji - współdzielone przez wszystkie zakładki, czyszczone przy zapisach"""
+    return CachingProcessRepository(get_repository(), get_process_cache(), stats_ttl=STATS_CACHE_TTL)
+
+def resolve_user_id(user_email: str, auth_user=None):
+    """Zwraca user_id z bazy dla podanego emaila (None gdy nie znaleziono)"""
+    if user_email in TEST_USER_IDS:
+        return TEST_USER_IDS[user_email]
+    
+    # Dla prawdziwych użytkowników - pobierz z tabeli users
+    try:
+        user_id = get_repository().find_user_id(user_email)
+        if user_id:
+            return user_id
+    except Exception as e:
+        logger.error(f"RESOLVE_USER_ERROR: {str(e)}")
+    
+    # Brak wpisu w users - użyj id z odpowiedzi Supabase Auth (RLS porównuje auth.uid() z user_id)
+    if auth_user is not None and getattr(auth_user, 'id', None):
+        return str(auth_user.id)
+    return None
+
+def set_logged_in_user(user_email: str, auth_user=None):
+    """Loguje użytkownika w sesji i od razu ustala jego user_id"""
+    st.session_state.user = user_email
+    st.session_state.user_id = resolve_user_id(user_email, auth_user)
+    st.session_state.user_id_email = user_email
+
+def is_admin_user() -> bool:
+    """Czy zalogowany użytkownik jest na liście ADMIN_EMAILS"""
+    user_email = getattr(st.session_state, 'user', None)
+    if not user_email:
+        return False
+    admins = os.getenv("ADMIN_EMAILS", DEFAULT_ADMIN_EMAILS)
+    return user_email.strip().lower() in {email.strip().lower() for email in admins.split(",") if email.strip()}
+
+def get_current_user_id():
+    """Zwraca user_id zalogowanego użytkownika - zapytanie do bazy tylko raz na sesję"""
+    # Stan sesji inicjalizuje ui.main() - poza stroną (CLI, testy) użytkownik może nie być ustawiony
+    user_email = getattr(st.session_state, 'user', None)
+    if st.session_state.get('user_id_email') == user_email and st.session_state.get('user_id'):
+        return st.session_state.user_id
+    
+    # Sesja sprzed logowania przez set_logged_in_user (albo nieudane wcześniejsze ustalenie)
+    user_id = resolve_user_id(user_email)
+    if user_id:
+        st.session_state.user_id = user_id
+        st.session_state.user_id_email = user_email
+    return user_id
+
+def get_process_cache() -> dict:
+    """Cache wyników zapytań o procesy w obrębie sesji - współdzielony przez wszystkie zakładki"""
+    if 'process_cache' not in st.session_state:
+        st.session_state.process_cache = {}
+    return st.session_state.process_cache
+
+def invalidate_process_cache():
+    """Unieważnia cache procesów - wywoływane po każdej zmianie danych"""
+    st.session_state.process_cache = {}
+
+def for_current_user(error_tag: str, default, operation):
+    """Wykonuje operation(user_id) dla zalogowanego użytkownika.
+    
+    Wspólna obsługa dla operacji na procesach: brak user_id i błąd bazy są logowane
+    z error_tag, a wywołujący dostaje wartość default.
+    """
+    try:
+        # user_id ustalony raz na sesję (przy logowaniu)
+        user_id = get_current_user_id()
+        if not user_id:
+            logger.error(f"{error_tag}: Nie można znaleźć user_id dla {st.session_state.user}")
+            return default
+        return operation(user_id)
+    except Exception as e:
+        logger.error(f"{error_tag}: {str(e)}")
+        return default
+
+def process_context_columns(analysis_depth: str = None, industry: str = None) -> dict:
+    """Głębokość analizy i branża do zapisu w kolumnach (puste pomijane - zostaje wartość domyślna bazy)"""
+    columns = {}
+    if analysis_depth:
+        columns['analysis_depth'] = analysis_depth
+    if industry:
+        columns['industry'] = industry
+    return columns
+
+@telemetry.timed("db.save_process")
+def save_process(title: str, description: str, ai_analysis: str, metrics: dict = None,
+                 analysis_depth: str = None, industry: str = None):
+    """Zapisuje proces do bazy danych (metrics - kolumny z ustrukturyzowanej odpowiedzi AI)"""
+    def insert(user_id):
+        get_session_repository().insert_process({
+            'user_id': user_id,
+            'title': title,
+            'description': description,
+            'ai_analysis': str(ai_analysis),
+            **(metrics if metrics is not None else getattr(ai_analysis, 'metrics', {})),
+            **process_context_columns(analysis_depth, industry)
+        })
+        return True
+    
+    return for_current_user("SAVE_PROCESS_ERROR", False, insert)
+
+@telemetry.timed("db.submit_background_analysis")
+def submit_background_analysis(title: str, description: str, analysis_depth: str,
+                               company_size: str = "", industry: str = "", budget: str = ""):
+    """Dodaje analizę do kolejki - wynik zapisze worker, interfejs tylko odpytuje status"""
+    user_id = get_current_user_id()
+    if not user_id:
+        logger.error(f"SUBMIT_ANALYSIS_ERROR: Nie można znaleźć user_id dla {st.session_state.user}")
+        return None
+    
+    job_id = analysis_jobs.enqueue_analysis(supabase, user_id, title, description, analysis_depth,
+                                            company_size, industry, budget)
+    if not job_id:
+        return None
+    
+    invalidate_process_cache()
+    if 'analysis_jobs' not in st.session_state:
+        st.session_state.analysis_jobs = {}
+    st.session_state.analysis_jobs[job_id] = {'title': title, 'status': analysis_jobs.STATUS_PENDING, 'error': None}
+    
+    worker = init_analysis_worker()
+    if worker:
+        worker.notify()
+    return job_id
+
+@telemetry.timed("db.save_processes_bulk")
+def save_processes_bulk(processes: list, user_email: str = None) -> int:
+    """Zapisuje wiele przeanalizowanych procesów jednym insertem, zwraca liczbę zapisanych"""
+    try:
+        user_id = resolve_user_id(user_email) if user_email else get_current_user_id()
+        if not user_id:
+            logger.error(f"SAVE_PROCESSES_BULK_ERROR: Nie można znaleźć user_id dla {user_email or st.session_state.user}")
+            return 0
+        
+        rows = [{
+            'user_id': user_id,
+            'title': p['title'],
+            'description': p['description'],
+            'ai_analysis': str(p['ai_analysis']),
+            **(p.get('metrics') or {}),
+            **process_context_columns(p.get('analysis_depth'), p.get('industry'))
+        } for p in processes]
+        return get_session_repository().insert_processes(rows)
+    except Exception as e:
+        logger.error(f"SAVE_PROCESSES_BULK_ERROR: {str(e)}")
+        return 0
+
+@telemetry.timed("db.get_processes", labels=("view",))
+def get_processes(view: str = process_views.LIST):
+    """Pobiera procesy użytkownika z bazy danych (raz do czasu unieważnienia cache).
+    
+    view - projekcja z process_views; pobierane są tylko kolumny widoku.
+    """
+    return for_current_user("GET_PROCESSES_ERROR", [],
+                            lambda user_id: get_session_repository().list_processes(user_id, view))
+
+@telemetry.timed("db.get_processes_page")
+def get_processes_page(cursor=None, page_size: int = DEFAULT_PAGE_SIZE):
+    """Pobiera stronę listy procesów (tylko id, title, created_at).
+    
+    Paginacja keyset po (created_at, id) malejąco - cursor to para (created_at, id)
+    ostatniego procesu poprzedniej strony. Zwraca (procesy, kursor następnej strony lub None).
+    """
+    return for_current_user("GET_PROCESSES_PAGE_ERROR", ([], None),
+                            lambda user_id: get_session_repository().list_page(user_id, process_views.LIST, cursor, page_size))
+
+@telemetry.timed("db.iter_processes_for_report")
+def iter_processes_for_report(chunk_size: int = REPORT_CHUNK_SIZE):
+    """Generator wszystkich procesów użytkownika z pełną treścią, pobieranych porcjami.
+    
+    Wiersze nie trafiają do cache sesji - raport może obejmować tysiące procesów.
+    """
+    user_id = get_current_user_id()
+    if not user_id:
+        logger.error(f"REPORT_PROCESSES_ERROR: Nie można znaleźć user_id dla {st.session_state.user}")
+        return
+    
+    yield from iter_pages(get_repository(), user_id, process_views.EXPORT, chunk_size)
+
+@telemetry.timed("db.search_processes")
+def search_processes(query: str, limit: int = SEARCH_RESULTS_LIMIT):
+    """Wyszukiwanie pełnotekstowe po tytule, opisie i analizie AI.
+    
+    Ranking wykonywany po stronie bazy (funkcja search_business_processes_fts, indeks GIN) -
+    zwraca tylko id, title i created_at najlepiej dopasowanych procesów.
+    """
+    query = (query or "").strip()
+    if len(query) < SEARCH_MIN_LENGTH:
+        return []
+    
+    return for_current_user("SEARCH_PROCESSES_ERROR", [],
+                            lambda user_id: get_session_repository().search(user_id, query, limit))
+
+@telemetry.timed("db.get_process_stats")
+def get_process_stats():
+    """Statystyki procesów użytkownika policzone w bazie (funkcja get_process_stats).
+    
+    Odpowiedź ma stały rozmiar niezależnie od liczby procesów: liczba procesów w ostatnich
+    STATS_MONTHS miesiącach, według głębokości analizy i branży oraz suma oszczędności.
+    Wynik trzymany w cache sesji przez STATS_CACHE_TTL sekund (zmiany w tej sesji unieważniają go od razu).
+    """
+    return for_current_user("GET_PROCESS_STATS_ERROR", None,
+                            lambda user_id: get_session_repository().stats(user_id, STATS_MONTHS, STATS_TOP_INDUSTRIES))
+
+@telemetry.timed("db.get_process_details")
+def get_process_details(process_id):
+    """Pobiera pełne dane jednego procesu (opis i analiza AI) - na żądanie"""
+    return for_current_user("GET_PROCESS_DETAILS_ERROR", None,
+                            lambda user_id: get_session_repository().get_process(user_id, process_id, process_views.DETAIL))
+
+@telemetry.timed("db.delete_process")
+def delete_process(process_id: int):
+    """Usuwa proces z bazy danych"""
+    # Jedno zapytanie: warunek na id i user_id sprawdza własność atomowo,
+    # a wynik mówi czy cokolwiek usunięto
+    return for_current_user("DELETE_PROCESS_ERROR", False,
+                            lambda user_id: get_session_repository().delete_process(user_id, process_id))
+
+@telemetry.timed("db.update_process")
+def update_process(process_id: int, title: str, description: str, ai_analysis: str):
+    """Aktualizuje proces w bazie danych"""
+    # Jedno zapytanie z warunkiem własności - False oznacza cudzy lub nieistniejący proces
+    return for_current_user("UPDATE_PROCESS_ERROR", False,
+                            lambda user_id: get_session_repository().update_process(user_id, process_id, {
+                                'title': title,
+                                'description': description,
+                                'ai_analysis': ai_analysis
+                            }))
+
+def initialize_database():
+    """Sprawdza czy tabele istnieją - nie tworzy ich automatycznie"""
+    try:
+        # Sprawdź czy tabela business_processes istnieje
+        try:
+            result = supabase.table('business_processes').select('id').limit(1).execute()
+            logger.info("Database tables are available")
+            return True
+        except Exception as e:
+            if "relation" in str(e) and "does not exist" in str(e):
+                logger.warning("Database tables don't exist. Please run the SQL setup script in Supabase dashboard.")
+                # Nie tworzymy tabel automatycznie - użytkownik musi uruchomić skrypt SQL
+                return False
+            else:
+                logger.error(f"Database connection error: {str(e)}")
+                return False
+                
+    except Exception as e:
+        logger.error(f"DB_INIT_ERROR: {str(e)}")
+        return False
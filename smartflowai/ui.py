@@ -0,0 +1,923 @@
+# -*- coding: utf-8 -*-
+# Plik: smartflowai/ui.py
+# ui.py - Strony aplikacji Streamlit
+
+"""
+Strony aplikacji SmartFlowAI: logowanie, dashboard i jego zakładki.
+
+Moduł importowany jest raz na proces - przy każdej interakcji Streamlit
+wykonuje ponownie tylko streamlit_app.py, który wywołuje main(). Style CSS
+i funkcje stron nie są przy tym na nowo definiowane.
+"""
+
+import itertools
+import logging
+import os
+import time
+
+import streamlit as st
+
+import analysis_jobs
+import batch_analysis
+import telemetry
+import token_budget
+from ai_client import AnalysisError
+from smartflowai import ai, reports, storage
+
+logger = logging.getLogger(__name__)
+
+# Stronicowanie listy procesów
+PROCESS_PAGE_SIZES = [10, 20, 50, 100]
+
+# Zestawienie PDF - liczba procesów w podglądzie i w tekście do skopiowania (pełna treść tylko w plikach)
+PDF_PREVIEW_ROWS = 20
+
+# Analizy w tle - co ile sekund interfejs sprawdza status zadań
+ANALYSIS_POLL_SECONDS = 3
+
+# Strona wydajności - okresy (w godzinach, None - od startu procesu) i przedziały histogramu czasu OpenAI (s)
+PERFORMANCE_WINDOWS = {"Ostatnia godzina": 1, "Ostatnie 6 godzin": 6, "Ostatnie 24 godziny": 24, "Od startu procesu": None}
+OPENAI_LATENCY_EDGES = (1, 2, 5, 10, 20, 30, 60)
+
+# Custom CSS dla Dark Mode
+PAGE_CSS = """
+<style>
+    /* Dark Mode Custom Styling */
+    .stApp {
+        background: linear-gradient(135deg, #0E1117 0%, #1e2328 100%);
+    }
+    
+    /* Poprawki dla ekspanderów w dark mode */
+    .streamlit-expanderHeader {
+        background-color: #262730 !important;
+        border: 1px solid #3e4147 !important;
+    }
+    
+    /* Styling dla success/error messages */
+    .stAlert > div {
+        border-radius: 10px;
+        border: none;
+    }
+    
+    /* Custom styling dla przycisków */
+    .stButton > button {
+        border-radius: 20px;
+        border: 2px solid #00D4AA;
+        transition: all 0.3s ease;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 5px 15px rgba(0, 212, 170, 0.3);
+    }
+    
+    /* Styling dla form elements */
+    .stTextInput > div > div > input {
+        border-radius: 10px;
+        border: 1px solid #3e4147;
+        background-color: #262730;
+    }
+    
+    .stTextArea > div > div > textarea {
+        border-radius: 10px;
+        border: 1px solid #3e4147;
+        background-color: #262730;
+    }
+    
+    /* Dark mode tabs styling */
+    .stTabs [data-baseweb="tab"] {
+        background-color: #262730;
+        border-radius: 10px 10px 0 0;
+    }
+    
+    /* Title glow effect */
+    h1 {
+        text-shadow: 0 0 10px rgba(0, 212, 170, 0.3);
+    }
+</style>
+"""
+
+@telemetry.timed("page.login")
+def show_login():
+    """Strona logowania i rejestracji"""
+    st.title("SmartFlowAI")
+    
+    # Zakładki logowanie / rejestracja
+    login_tab, register_tab = st.tabs(["🔑 Logowanie", "📝 Rejestracja"])
+    
+    # Zakładka logowania
+    with login_tab:
+        st.subheader("Zaloguj się")
+        
+        # Informacja o kontach testowych
+        with st.expander("👥 Konta testowe", expanded=False):
+            st.info("""
+            **Dostępne konta testowe:**
+            
+            📧 **test@smartflowai.com** / test123456
+            📧 **admin@smartflowai.com** / test123456
+            📧 **demo@smartflowai.com** / test123456
+            """)
+        
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            with st.form("login"):
+                email = st.text_input("Email")
+                password = st.text_input("Hasło", type="password")
+                if st.form_submit_button("Zaloguj"):
+                    if email and password:
+                        try:
+                            # Próba logowania przez Supabase
+                            response = storage.supabase.auth.sign_in_with_password({
+                                "email": email,
+                                "password": password
+                            })
+                            if response.user:
+                                storage.set_logged_in_user(email, response.user)
+                                st.rerun()
+                        except Exception as e:
+                            # Fallback - użytkownicy testowi
+                            test_users = {
+                                "test@smartflowai.com": "test123456",
+                                "admin@smartflowai.com": "test123456",
+                                "demo@smartflowai.com": "test123456"
+                            }
+                            
+                            if email in test_users and test_users[email] == password:
+                                storage.set_logged_in_user(email)
+                                st.success(f"✅ Zalogowano jako {email}")
+                                st.rerun()
+                            else:
+                                st.error(f"❌ Błędne dane logowania: {str(e)}")
+                    else:
+                        st.error("Wypełnij wszystkie pola")
+    
+    # Zakładka rejestracji
+    with register_tab:
+        st.subheader("Utwórz konto")
+        
+        with st.form("register"):
+            new_email = st.text_input("Email")
+            new_password = st.text_input("Hasło", type="password")
+            confirm_password = st.text_input("Potwierdź hasło", type="password")
+            
+            if st.form_submit_button("Zarejestruj"):
+                if not new_email or not new_password or not confirm_password:
+                    st.error("❌ Wypełnij wszystkie pola!")
+                elif new_password != confirm_password:
+                    st.error("❌ Hasła nie są identyczne!")
+                elif len(new_password) < 6:
+                    st.error("❌ Hasło musi mieć co najmniej 6 znaków!")
+                else:
+                    try:
+                        # Rejestracja w Supabase
+                        response = storage.supabase.auth.sign_up({
+                            "email": new_email,
+                            "password": new_password
+                        })
+                        
+                        if response.user:
+                            st.success(f"✅ Konto utworzone! Możesz się teraz zalogować jako {new_email}")
+                            
+                            # Opcjonalnie: automatycznie zaloguj użytkownika
+                            storage.set_logged_in_user(new_email, response.user)
+                            st.balloons()
+                            st.rerun()
+                        else:
+                            st.error("❌ Błąd rejestracji - sprawdź dane i spróbuj ponownie")
+                    except Exception as e:
+                        logger.error(f"REGISTER_ERROR: {str(e)}")
+                        st.error(f"❌ Błąd rejestracji: {str(e)}")
+                        
+                        # Informacja dla użytkownika, że może email jest już zajęty
+                        if "already registered" in str(e) or "already exists" in str(e):
+                            st.warning("⚠️ Ten email jest już zarejestrowany. Spróbuj się zalogować.")
+
+@telemetry.timed("page.dashboard")
+def show_dashboard():
+    """Dashboard główny"""
+    st.title("SmartFlowAI Dashboard")
+    st.write(f"Zalogowany: {st.session_state.user}")
+    
+    if st.button("Wyloguj"):
+        st.session_state.user = None
+        st.session_state.user_id = None
+        st.session_state.user_id_email = None
+        st.session_state.analysis_jobs = {}
+        storage.invalidate_process_cache()
+        st.rerun()
+    
+    # Status analiz zleconych w tle (odświeżany cyklicznie, bez przeładowania strony)
+    if st.session_state.get('analysis_jobs'):
+        show_analysis_jobs_status()
+    
+    show_process_stats()
+    
+    # Menu (zakładka wydajności tylko dla ADMIN_EMAILS)
+    tab_names = ["➕ Nowy Proces", "📦 Import wsadowy", "📋 Przeanalizowane procesy", "📄 Zestawienie w PDF"]
+    is_admin = storage.is_admin_user()
+    if is_admin:
+        tab_names.append("⏱️ Wydajność")
+    tabs = st.tabs(tab_names)
+    
+    with tabs[0]:
+        show_new_process_form()
+    
+    with tabs[1]:
+        show_batch_import_tab()
+    
+    with tabs[2]:
+        show_processes_list()
+    
+    with tabs[3]:
+        show_pdf_summary_tab()
+    
+    if is_admin:
+        with tabs[4]:
+            show_performance_tab()
+
+def format_savings(value) -> str:
+    """Kwota w złotych ze spacją jako separatorem tysięcy"""
+    return f"{float(value):,.0f} zł".replace(",", " ")
+
+@telemetry.timed("page.process_stats")
+def show_process_stats():
+    """Panel statystyk - agregaty z bazy, bez pobierania listy procesów"""
+    stats = storage.get_process_stats()
+    if not stats or not stats.get('total_processes'):
+        return
+    
+    with st.expander("📈 Statystyki procesów", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Procesy", stats['total_processes'])
+        if stats.get('avg_automation_potential') is not None:
+            col2.metric("Średni potencjał", f"{float(stats['avg_automation_potential']):g}%")
+        col3.metric("Oszczędność czasu", f"{float(stats.get('total_time_savings') or 0):g} h/mies.")
+        col4.metric("Oszczędność roczna", format_savings(stats.get('total_cost_savings') or 0))
+        
+        charts = [
+            ("Procesy w miesiącach", "Miesiąc", stats.get('per_month') or [], 'month'),
+            ("Głębokość analizy", "Głębokość", stats.get('per_depth') or [], 'analysis_depth'),
+            ("Branża", "Branża", stats.get('per_industry') or [], 'industry'),
+        ]
+        for column, (caption, label, rows, key) in zip(st.columns(3), charts):
+            with column:
+                st.caption(caption)
+                if rows:
+                    st.bar_chart({label: [row[key] for row in rows], "Procesy": [row['count'] for row in rows]},
+                                 x=label, y="Procesy", height=220)
+
+@st.fragment(run_every=ANALYSIS_POLL_SECONDS)
+@telemetry.timed("page.analysis_jobs_status")
+def show_analysis_jobs_status():
+    """Status analiz w tle - odpytuje bazę tylko o zadania jeszcze w toku"""
+    jobs = st.session_state.get('analysis_jobs') or {}
+    active_ids = [job_id for job_id, job in jobs.items() if job['status'] in analysis_jobs.ACTIVE_STATUSES]
+    
+    finished = False
+    if active_ids:
+        statuses = analysis_jobs.get_job_statuses(storage.supabase, storage.get_current_user_id(), active_ids)
+        for job_id in active_ids:
+            row = statuses.get(job_id)
+            if row is None:
+                # Proces usunięty w trakcie analizy
+                del jobs[job_id]
+                continue
+            jobs[job_id]['status'] = row['analysis_status']
+            jobs[job_id]['error'] = row.get('analysis_error')
+            if row['analysis_status'] not in analysis_jobs.ACTIVE_STATUSES:
+                finished = True
+    
+    if finished:
+        # Nowa analiza w bazie - odśwież listę procesów w całej aplikacji
+        storage.invalidate_process_cache()
+        st.rerun(scope="app")
+    
+    for job_id, job in list(jobs.items()):
+        col_status, col_action = st.columns([5, 1])
+        with col_status:
+            if job['status'] == analysis_jobs.STATUS_COMPLETED:
+                st.success(f"✅ Analiza gotowa: **{job['title']}** - zobacz w zakładce 'Przeanalizowane procesy'")
+            elif job['status'] == analysis_jobs.STATUS_FAILED:
+                st.error(f"❌ Analiza nieudana: **{job['title']}** - {job['error'] or 'nieznany błąd'}")
+            else:
+                st.info(f"⏳ Analiza w toku: **{job['title']}**")
+        with col_action:
+            if job['status'] == analysis_jobs.STATUS_FAILED:
+                if st.button("🔄 Ponów", key=f"retry_job_{job_id}"):
+                    if analysis_jobs.retry_job(storage.supabase, storage.get_current_user_id(), job_id):
+                        job['status'] = analysis_jobs.STATUS_PENDING
+                        worker = storage.init_analysis_worker()
+                        if worker:
+                            worker.notify()
+                        st.rerun(scope="fragment")
+            elif job['status'] == analysis_jobs.STATUS_COMPLETED:
+                if st.button("✖", key=f"dismiss_job_{job_id}", help="Ukryj"):
+                    del jobs[job_id]
+                    st.rerun(scope="app")
+
+@telemetry.timed("page.processes_list")
+def show_processes_list():
+    """Lista procesów - stronicowana, szczegóły pobierane po rozwinięciu"""
+    st.subheader("Przeanalizowane procesy")
+    
+    if 'process_page_cursors' not in st.session_state:
+        st.session_state.process_page_cursors = [None]  # Kursory kolejnych stron (None = pierwsza)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        page_size = st.selectbox(
+            "Procesów na stronie",
+            PROCESS_PAGE_SIZES,
+            index=PROCESS_PAGE_SIZES.index(storage.DEFAULT_PAGE_SIZE),
+            key="process_page_size",
+            on_change=reset_process_pagination
+        )
+    with col2:
+        # Przycisk odświeżania - wymusza ponowne pobranie danych z bazy
+        if st.button("🔄 Odśwież listę", type="secondary"):
+            storage.invalidate_process_cache()
+            reset_process_pagination()
+            st.rerun()
+    
+    search_query = st.text_input(
+        "🔍 Szukaj w procesach",
+        placeholder="np. faktury księgowość",
+        help="Wyszukuje w nazwie, opisie i analizie AI",
+        key="process_search"
+    ).strip()
+    searching = len(search_query) >= storage.SEARCH_MIN_LENGTH
+    
+    cursors = st.session_state.process_page_cursors
+    if searching:
+        processes, next_cursor = storage.search_processes(search_query), None
+    else:
+        processes, next_cursor = storage.get_processes_page(cursors[-1], page_size)
+    
+    # Strona opustoszała (np. po usunięciu procesów) - wróć na początek
+    if not searching and not processes and len(cursors) > 1:
+        reset_process_pagination()
+        st.rerun()
+    
+    # Sprawdź każdy proces i policz które można wyrenderować
+    valid_processes = []
+    invalid_processes = []
+    
+    for i, process in enumerate(processes):
+        title = process.get('title')
+        created_at = process.get('created_at')
+        
+        # Sprawdź czy proces ma wszystkie wymagane dane
+        if title and created_at and len(title.strip()) > 0:
+            valid_processes.append(process)
+        else:
+            invalid_processes.append({
+                'id': process.get('id', 'BRAK'),
+                'title': title,
+                'created_at': created_at
+            })
+    
+    # Pokaż procesy z błędnymi danymi jeśli istnieją
+    if invalid_processes:
+        with st.expander(f"⚠️ Procesy z błędnymi danymi ({len(invalid_processes)})", expanded=False):
+            for proc in invalid_processes:
+                st.write(f"**ID:** {proc['id']}, **Title:** '{proc['title']}', **Created:** '{proc['created_at']}'")
+                if st.button(f"🗑️ Usuń proces ID {proc['id']}", key=f"del_invalid_{proc['id']}"):
+                    if storage.delete_process(proc['id']):
+                        st.rerun()
+    
+    if not valid_processes:
+        if searching:
+            st.info(f"Brak procesów pasujących do \"{search_query}\"")
+        else:
+            st.info("Brak przeanalizowanych procesów. Dodaj pierwszy proces w zakładce 'Nowy Proces'!")
+        return
+    
+    if searching:
+        st.caption(f"Znaleziono: {len(valid_processes)} (najlepsze dopasowania)")
+    
+    # Renderuj tylko procesy z poprawnymi danymi
+    for i, process in enumerate(valid_processes):
+        try:
+            title = process['title']
+            created_date = process['created_at'][:10]
+            
+            # on_change="rerun" śledzi stan rozwinięcia - treść renderowana tylko dla otwartych
+            expander = st.expander(f"{title} ({created_date})", key=f"process_{process['id']}", on_change="rerun")
+            with expander:
+                if expander.open:
+                    show_process_details(process['id'])
+                        
+        except Exception as e:
+            st.error(f"❌ Błąd renderowania procesu ID {process.get('id', 'BRAK')}: {str(e)}")
+    
+    if searching:
+        return
+    
+    # Nawigacja między stronami
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if len(cursors) > 1 and st.button("⬅️ Poprzednia", key="process_page_prev"):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Strona {len(cursors)}")
+    with col_next:
+        if next_cursor and st.button("Następna ➡️", key="process_page_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+
+def reset_process_pagination():
+    """Wraca do pierwszej strony listy procesów"""
+    st.session_state.process_page_cursors = [None]
+
+def show_process_metrics(process):
+    """Metryki z ustrukturyzowanej analizy AI (procesy przeanalizowane wcześniej ich nie mają)"""
+    if process.get('automation_potential') is None:
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Potencjał automatyzacji", f"{process['automation_potential']}%")
+    if process.get('time_savings_hours') is not None:
+        col2.metric("Oszczędność czasu", f"{float(process['time_savings_hours']):g} h/mies.")
+    if process.get('cost_savings_annual') is not None:
+        col3.metric("Oszczędność roczna", format_savings(process['cost_savings_annual']))
+    if process.get('implementation_difficulty'):
+        col4.metric("Trudność wdrożenia", process['implementation_difficulty'])
+
+@telemetry.timed("page.process_details")
+def show_process_details(process_id):
+    """Opis, analiza i akcje procesu - pobierane dopiero po rozwinięciu na liście"""
+    process = storage.get_process_details(process_id)
+    if not process:
+        st.warning("Nie udało się pobrać szczegółów procesu")
+        return
+    
+    st.write("Opis:")
+    st.write(process.get('description', 'Brak opisu'))
+    
+    st.write("Analiza AI:")
+    status = process.get('analysis_status')
+    if status in analysis_jobs.ACTIVE_STATUSES:
+        st.info("⏳ Analiza w toku - wynik pojawi się automatycznie")
+    elif status == analysis_jobs.STATUS_FAILED:
+        st.error(f"❌ Analiza nieudana: {process.get('analysis_error') or 'nieznany błąd'}")
+    else:
+        show_process_metrics(process)
+        st.write(process.get('ai_analysis', 'Brak analizy'))
+    
+    # Przyciski akcji - Edytuj po lewej, Usuń maksymalnie po prawej
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button(f"✏️ Edytuj", key=f"edit_{process['id']}"):
+            st.session_state[f"editing_{process['id']}"] = True
+            st.rerun()
+    with col3:  # Maksymalnie po prawej stronie
+        if st.button(f"🗑️ Usuń", key=f"del_{process['id']}"):
+            if storage.delete_process(process['id']):
+                st.rerun()
+    
+    # Formularz edycji (jeśli aktywny)
+    if st.session_state.get(f"editing_{process['id']}", False):
+        st.markdown("---")
+        st.subheader("✏️ Edytuj proces")
+        
+        with st.form(f"edit_form_{process['id']}"):
+            edit_title = st.text_input(
+                "Nazwa procesu", 
+                value=process.get('title', ''),
+                key=f"edit_title_{process['id']}"
+            )
+            edit_description = st.text_area(
+                "Opis procesu", 
+                value=process.get('description', ''),
+                height=150,
+                key=f"edit_desc_{process['id']}"
+            )
+            edit_analysis = st.text_area(
+                "Analiza AI", 
+                value=process.get('ai_analysis', ''),
+                height=100,
+                key=f"edit_analysis_{process['id']}"
+            )
+            
+            col_save, col_space, col_cancel = st.columns([1, 2, 1])
+            with col_save:
+                if st.form_submit_button("💾 Zapisz zmiany", type="primary"):
+                    if edit_title and edit_description and edit_analysis:
+                        if storage.update_process(process['id'], edit_title, edit_description, edit_analysis):
+                            st.session_state[f"editing_{process['id']}"] = False
+                            st.rerun()
+                    else:
+                        st.error("Wypełnij wszystkie pola!")
+            with col_cancel:  # Maksymalnie po prawej stronie
+                if st.form_submit_button("❌ Anuluj"):
+                    st.session_state[f"editing_{process['id']}"] = False
+                    st.rerun()
+
+@telemetry.timed("page.new_process_form")
+def show_new_process_form():
+    """Formularz nowego procesu"""
+    st.subheader("Dodaj Nowy Proces")
+    
+    # Session state do przechowywania stanu analizy i formularza
+    if 'analysis_completed' not in st.session_state:
+        st.session_state.analysis_completed = False
+    if 'last_analysis' not in st.session_state:
+        st.session_state.last_analysis = ""
+    if 'last_title' not in st.session_state:
+        st.session_state.last_title = ""
+    if 'last_description' not in st.session_state:
+        st.session_state.last_description = ""
+    if 'form_key' not in st.session_state:
+        st.session_state.form_key = 0
+    if 'balloons_shown' not in st.session_state:
+        st.session_state.balloons_shown = False
+    
+    # Jeśli analiza została zakończona, pokaż wyniki i przycisk
+    if st.session_state.analysis_completed and st.session_state.last_analysis:
+        st.success("Analiza zakończona!")
+        
+        # Pokaż baloniki tylko przy pierwszym renderowaniu
+        if not st.session_state.balloons_shown:
+            st.balloons()  # 🎉 Baloniki po udanej analizie!
+            st.session_state.balloons_shown = True
+        
+        # Pokaż wprowadzone dane
+        st.subheader("📋 Wprowadzony proces:")
+        st.write(f"Nazwa: {st.session_state.last_title}")
+        st.write(f"Opis: {st.session_state.last_description}")
+        
+        # Pokaż analizę AI
+        st.subheader("🤖 Analiza AI:")
+        st.write(st.session_state.last_analysis)
+        
+        st.info("💡 **Przeczytaj analizę powyżej, a następnie kliknij przycisk aby przejść do następnego procesu.**")
+        
+        if st.button("➡️ Następny proces do analizy", type="primary"):
+            # Wyczyść stan analizy i wymuś nowy formularz
+            st.session_state.analysis_completed = False
+            st.session_state.last_title = ""
+            st.session_state.last_description = ""
+            st.session_state.last_analysis = ""
+            st.session_state.balloons_shown = False  # Reset baloników na następną analizę
+            st.session_state.form_key += 1
+            st.rerun()
+    else:
+        # Pokaż formularz tylko gdy nie ma aktywnej analizy
+        with st.form(f"new_process_{st.session_state.form_key}"):
+            title = st.text_input(
+                "Nazwa procesu *", 
+                placeholder="np. Wystawianie faktur"
+            )
+            description = st.text_area(
+                "Opis procesu *", 
+                placeholder="Opisz krok po kroku jak wygląda ten proces...",
+                height=150
+            )
+            
+            # Opcje analizy
+            st.markdown("### ⚙️ Opcje analizy")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                analysis_depth = st.selectbox(
+                    "Głębokość analizy:",
+                    ["Podstawowa (szybka)", "Pogłębiona (z wyszukiwaniem)", "Ekspercka (pełna analiza)"],
+                    index=1  # Domyślnie pogłębiona
+                )
+            
+            with col2:
+                company_size = st.selectbox(
+                    "Wielkość firmy:", 
+                    ["", "1-10 osób", "11-50 osób", "51-200 osób", "200+ osób"]
+                )
+            
+            col3, col4 = st.columns(2)
+            with col3:
+                industry = st.selectbox(
+                    "Branża:", 
+                    ["", "IT/Software", "E-commerce/Handel", "Produkcja", "Usługi finansowe", 
+                     "Marketing/Reklama", "Księgowość", "Logistyka", "Edukacja", "Zdrowie", "Inna"]
+                )
+            
+            with col4:
+                budget = st.selectbox(
+                    "Budżet na automatyzację:", 
+                    ["", "do 500 zł/mies", "500-2000 zł/mies", "2000-5000 zł/mies", "5000+ zł/mies"]
+                )
+            
+            run_in_background = st.checkbox(
+                "⏳ Analizuj w tle",
+                value=True,
+                help="Analiza wykonuje się na serwerze - możesz dodawać kolejne procesy, a odświeżenie strony jej nie przerwie"
+            )
+            
+            if st.form_submit_button("🤖 Analizuj przez AI", type="primary"):
+                if not title or not description:
+                    st.error("Wypełnij wszystkie pola!")
+                elif len(description) < 20:
+                    st.error("Opis musi mieć co najmniej 20 znaków")
+                elif run_in_background:
+                    if storage.submit_background_analysis(title, description, analysis_depth, company_size, industry, budget):
+                        st.toast(f"⏳ Analiza procesu '{title}' dodana do kolejki")
+                        st.session_state.form_key += 1
+                        st.rerun()
+                    else:
+                        st.error("Błąd zlecenia analizy")
+                else:
+                    st.subheader("🤖 Analiza AI:")
+                    with st.spinner("Analizuję przez ChatGPT-4o..."):
+                        # Analiza AI z dodatkowymi parametrami - tekst pojawia się na bieżąco
+                        metrics = {}
+                        try:
+                            ai_analysis = st.write_stream(
+                                ai.stream_analysis_with_ai(title, description, analysis_depth, company_size, industry, budget,
+                                                        metrics=metrics)
+                            )
+                        except AnalysisError as e:
+                            # Nieudana analiza nie jest zapisywana - proces można wysłać ponownie
+                            logger.error(f"ANALYSIS_ERROR: {str(e)}")
+                            st.error(f"❌ {str(e)}. Spróbuj ponownie za chwilę.")
+                            ai_analysis = None
+                        
+                        # Zapisz do bazy dopiero po otrzymaniu pełnej odpowiedzi
+                        if ai_analysis and storage.save_process(title, description, ai_analysis, metrics, analysis_depth, industry):
+                            # Zapisz dane w session state
+                            st.session_state.analysis_completed = True
+                            st.session_state.last_title = title
+                            st.session_state.last_description = description
+                            st.session_state.last_analysis = ai_analysis
+                            st.rerun()
+                        elif ai_analysis:
+                            st.error("Błąd zapisu do bazy danych")
+
+@telemetry.timed("page.batch_import_tab")
+def show_batch_import_tab():
+    """Zakładka: wsadowa analiza procesów z pliku CSV/JSON"""
+    st.subheader("Import wsadowy procesów")
+    st.caption("Plik CSV lub JSON z kolumnami: title, description oraz opcjonalnie analysis_depth, company_size, industry, budget")
+    
+    uploaded_file = st.file_uploader("Plik z procesami", type=["csv", "json"])
+    
+    default_depth = st.selectbox(
+        "Domyślna głębokość analizy:",
+        ["Podstawowa (szybka)", "Pogłębiona (z wyszukiwaniem)", "Ekspercka (pełna analiza)"],
+        index=0,
+        key="batch_depth"
+    )
+    
+    if not uploaded_file:
+        return
+    
+    try:
+        rows, errors = batch_analysis.parse_batch_file(uploaded_file.getvalue(), uploaded_file.name)
+    except Exception as e:
+        st.error(f"❌ Nie można odczytać pliku: {str(e)}")
+        return
+    
+    for error in errors:
+        st.warning(f"⚠️ {error}")
+    st.write(f"Procesów do analizy: {len(rows)}")
+    
+    if rows and st.button("🤖 Analizuj wszystkie", type="primary"):
+        # Każdy wiersz trafia do kolejki analiz w tle - skrypt nie czeka na OpenAI,
+        # postęp pokazuje status zleconych analiz nad zakładkami
+        failed = [row for row in rows
+                  if not storage.submit_background_analysis(*batch_analysis.row_args(row, default_depth))]
+        for row in failed:
+            st.error(f"❌ Wiersz {row['row']} ({row['title']}): nie udało się dodać do kolejki")
+        if not failed:
+            st.rerun()
+        elif len(failed) < len(rows):
+            st.info(f"Dodano do kolejki {len(rows) - len(failed)} z {len(rows)} procesów")
+
+@telemetry.timed("page.pdf_summary_tab")
+def show_pdf_summary_tab():
+    """Zakładka: Zestawienie w PDF"""
+    st.subheader("Zestawienie procesów w PDF")
+    # Podgląd to pierwsza strona listy (id, title, created_at) - treść pobierana dopiero do raportu
+    preview, _ = storage.get_processes_page(page_size=PDF_PREVIEW_ROWS)
+    if not preview:
+        st.info("Brak procesów do zestawienia.")
+        return
+    stats = storage.get_process_stats()
+    total = (stats or {}).get('total_processes') or len(preview)
+    generated_on = (preview[0].get('created_at') or '')[:10]
+
+    # Edytowalny tekst nagłówka
+    header = st.text_input("Nagłówek raportu", value="Zestawienie przeanalizowanych procesów SmartFlowAI")
+    # Edytowalny tekst stopki
+    footer = st.text_input("Stopka raportu", value="Wygenerowano przez SmartFlowAI")
+
+    # Podgląd danych do PDF
+    st.markdown("### Podgląd danych do PDF:")
+    st.caption(f"Procesy: {total} - raport zawiera pełne opisy i analizy AI")
+    for p in preview:
+        st.write(f"{p.get('title','')} ({(p.get('created_at') or '')[:10]})")
+    if total > len(preview):
+        st.caption(f"... i {total - len(preview)} kolejnych procesów")
+
+    # Przyciski w dwóch kolumnach
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("📄 Generuj PDF", type="primary"):
+            try:
+                # Raport obejmuje wszystkie procesy - opisy i analizy pobierane porcjami
+                with st.spinner("Generuję raport PDF..."):
+                    pdf_bytes, report_stats = reports.write_pdf_report(storage.iter_processes_for_report(), header, footer)
+                
+                st.success(f"✅ PDF wygenerowany pomyślnie! Procesy: {report_stats['processes']}, strony: {report_stats['pages']}")
+                
+                # Przycisk do pobrania
+                st.download_button(
+                    "📄 Pobierz PDF", 
+                    pdf_bytes, 
+                    file_name="Lista_przeanalizowanych_procesow.pdf", 
+                    mime="application/pdf"
+                )
+                
+            except Exception as e:
+                st.error(f"❌ Błąd generowania PDF: {str(e)}")
+                logger.error(f"PDF_ERROR: {str(e)}")
+                
+                # Fallback - prosty tekst
+                st.info("💡 Alternatywnie możesz pobrać raport jako .txt (przycisk obok).")
+    
+    with col2:
+        # Tekst do skopiowania obejmuje pierwsze PDF_PREVIEW_ROWS procesów - jedna porcja z bazy
+        if st.toggle("📋 Pokaż tekst do skopiowania", help="Wyświetl tekst raportu dla pierwszych procesów"):
+            text_to_copy = reports.build_text_report(
+                itertools.islice(storage.iter_processes_for_report(PDF_PREVIEW_ROWS), PDF_PREVIEW_ROWS),
+                header, footer, generated_on=generated_on
+            )
+            if total > PDF_PREVIEW_ROWS:
+                st.caption(f"Tekst obejmuje {PDF_PREVIEW_ROWS} najnowszych z {total} procesów - pełny raport w pliku .txt")
+            
+            # CSS do kontroli szerokości pola tekstowego
+            st.markdown("""
+            <style>
+            .stTextArea > div > div > textarea {
+                font-family: 'Source Code Pro', monospace;
+                font-size: 12px;
+                line-height: 1.4;
+                white-space: pre-wrap;
+                word-wrap: break-word;
+            }
+            </style>
+            """, unsafe_allow_html=True)
+            
+            # Pole tekstowe z tekstem raportu - bez dodatkowych instrukcji
+            st.text_area(
+                "Tekst raportu:",
+                text_to_copy,
+                height=400,
+                key="copy_text_area"
+            )
+        
+        # Pełny raport .txt - procesy pobierane porcjami, gotowy plik w pamięci (jak PDF)
+        if st.button("📄 Generuj .txt"):
+            try:
+                with st.spinner("Generuję raport .txt..."):
+                    txt_bytes = reports.write_text_report(storage.iter_processes_for_report(), header, footer,
+                                                          generated_on=generated_on)
+                
+                # Przycisk pobierania jako plik tekstowy - bez nagłówka
+                st.download_button(
+                    "📄 Pobierz jako .txt",
+                    txt_bytes,
+                    file_name="Lista_przeanalizowanych_procesow.txt",
+                    mime="text/plain"
+                )
+            except Exception as e:
+                st.error(f"❌ Błąd generowania raportu .txt: {str(e)}")
+                logger.error(f"TXT_ERROR: {str(e)}")
+
+
+def format_rate(samples: list) -> str:
+    """Udział trafień (próbki 1/0) w procentach"""
+    return f"{100 * sum(samples) / len(samples):.0f}%" if samples else "—"
+
+@telemetry.timed("page.performance")
+def show_performance_tab():
+    """Wydajność aplikacji z danych telemetrii tego procesu - tylko dla ADMIN_EMAILS"""
+    if not storage.is_admin_user():
+        st.error("❌ Brak dostępu")
+        return
+    
+    st.subheader("Wydajność aplikacji")
+    registry = telemetry.registry
+    if not registry.enabled:
+        st.info("💡 Pomiar czasu jest wyłączony - ustaw TELEMETRY_ENABLED=true. "
+                "Zużycie tokenów i cache analiz AI dostępne są od startu procesu.")
+    
+    window = st.selectbox("Okres", list(PERFORMANCE_WINDOWS), key="performance_window")
+    hours = PERFORMANCE_WINDOWS[window]
+    since = time.time() - hours * 3600 if hours else None
+    
+    # Czas odpowiedzi OpenAI (samo zapytanie, z ponowieniami) według głębokości analizy
+    st.markdown("**⏱️ Czas odpowiedzi OpenAI według głębokości analizy**")
+    latencies = telemetry.group_by_label(registry.samples("openai.request", since), "analysis_depth")
+    if latencies:
+        for column, (depth, samples) in zip(st.columns(len(latencies)), sorted(latencies.items())):
+            seconds = [ms / 1000 for ms in samples]
+            summary = telemetry.summarize(seconds)
+            bins = telemetry.histogram(seconds, OPENAI_LATENCY_EDGES)
+            with column:
+                st.caption(f"{depth}: {summary['count']} zapytań, p50 {summary['p50_ms']:.1f} s, "
+                           f"p95 {summary['p95_ms']:.1f} s, p99 {summary['p99_ms']:.1f} s")
+                st.bar_chart({"Czas [s]": [label for label, _ in bins], "Zapytania": [count for _, count in bins]},
+                             x="Czas [s]", y="Zapytania", sort=False, height=200)
+    else:
+        st.caption("Brak zapytań do OpenAI w wybranym okresie")
+    
+    # Tokeny z odpowiedzi API (token_budget.usage_ledger) - od startu procesu
+    st.markdown("**🔢 Zużycie tokenów (od startu procesu)**")
+    usage = token_budget.usage_ledger.averages()
+    if usage:
+        st.dataframe([{"Głębokość": depth, "Analizy": row["analyses"], "Śr. prompt": round(row["prompt_tokens"]),
+                       "Śr. odpowiedź": round(row["completion_tokens"]), "Śr. koszt [USD]": round(row["cost_usd"], 4)}
+                      for depth, row in usage.items()], hide_index=True)
+    else:
+        st.caption("Brak analiz z odpowiedzią API od startu procesu")
+    
+    # Cache i zapytania do bazy
+    st.markdown("**🗄️ Cache i baza danych**")
+    ai_hits = [hit for samples in registry.values("cache.ai_hit", since).values() for hit in samples]
+    session_hits = [hit for samples in registry.values("cache.session_hit", since).values() for hit in samples]
+    round_trips = [count for samples in registry.values("page.db_round_trips", since).values() for count in samples]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cache analiz AI", format_rate(ai_hits), help="Trafienia w cache odpowiedzi AI w wybranym okresie")
+    ai_cache = ai.init_ai_cache()
+    if ai_cache:
+        cache_stats = ai_cache.stats()
+        col1.caption(f"Od startu: {100 * cache_stats['hit_rate']:.0f}% ({cache_stats['entries']} wpisów)")
+    col2.metric("Cache sesji", format_rate(session_hits), help="Odczyty listy, szczegółów i statystyk bez zapytania do bazy")
+    if round_trips:
+        summary = telemetry.summarize(round_trips)
+        col3.metric("Zapytania do bazy / przebieg", f"{summary['mean_ms']:.1f}", help="Średnio na jeden przebieg strony")
+        col4.metric("Zapytania / przebieg (p95, maks.)", f"{summary['p95_ms']:g} / {summary['max_ms']:g}")
+    else:
+        col3.metric("Zapytania do bazy / przebieg", "—")
+    
+    # Raporty
+    st.markdown("**📄 Generowanie raportów**")
+    col1, col2 = st.columns(2)
+    for column, (name, label) in zip((col1, col2), (("report.pdf", "Raport PDF"), ("report.txt", "Raport tekstowy"))):
+        samples = [ms for series in registry.samples(name, since).values() for ms in series]
+        if samples:
+            summary = telemetry.summarize(samples)
+            column.metric(f"{label} (p50)", f"{summary['p50_ms'] / 1000:.2f} s",
+                          help=f"{summary['count']} raportów, p95 {summary['p95_ms'] / 1000:.2f} s, maks. {summary['max_ms'] / 1000:.2f} s")
+        else:
+            column.metric(f"{label} (p50)", "—")
+    
+    # Wszystkie mierzone operacje
+    rows = registry.summary(since)
+    if rows:
+        with st.expander("Wszystkie operacje"):
+            st.dataframe([{"Operacja": row["span"], "Etykiety": ", ".join(f"{key}={value}" for key, value in row["labels"].items()),
+                           "Liczba": row["count"], "Błędy": row["errors"], "p50 [ms]": round(row["p50_ms"], 1),
+                           "p95 [ms]": round(row["p95_ms"], 1), "p99 [ms]": round(row["p99_ms"], 1)} for row in rows],
+                         hide_index=True)
+
+@st.cache_resource(show_spinner=False)
+def check_database():
+    """Sprawdzenie tabel i start workera analiz raz na proces (wynik jest tylko logowany) - nie przy każdym przebiegu skryptu"""
+    initialized = storage.initialize_database()
+    # Worker startuje z aplikacją - pierwszy cykl zwraca do kolejki zadania porzucone przed restartem
+    # (requeue_stale_jobs) i podejmuje oczekujące, bez czekania na nowe zgłoszenie
+    storage.init_analysis_worker()
+    return initialized
+
+def show_environment_info():
+    """Informacja o trybie lokalnym / testowym"""
+    if storage.is_local_backend():
+        st.info("🧪 Tryb lokalny - używam bazy SQLite zamiast Supabase")
+    if os.getenv("ENVIRONMENT", "").lower() == "test":
+        st.info("🧪 Tryb testowy - używam mock OpenAI")
+
+# MAIN APP
+@telemetry.timed("page.rerun")
+def main():
+    """Jeden przebieg strony - wywoływany przez streamlit_app.py przy każdej interakcji"""
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+    show_environment_info()
+    
+    # Session state
+    if 'user' not in st.session_state:
+        st.session_state.user = None
+    
+    # Inicjalizacja bazy danych
+    check_database()
+    
+    # Routing - zapytania do bazy (spany repo.*) liczone na przebieg strony
+    with telemetry.count_spans("repo.") as queries:
+        try:
+            if not st.session_state.user:
+                show_login()
+            else:
+                show_dashboard()
+        finally:
+            telemetry.observe("page.db_round_trips", queries.count)
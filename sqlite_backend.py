@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: sqlite_backend.py
+# sqlite_backend.py - Lokalna baza SQLite z interfejsem klienta Supabase
+
+"""
+Lokalny backend bazy danych dla pracy offline i testów obciążeniowych.
+
+SQLiteClient udostępnia ten fragment API klienta Supabase, którego używa
+aplikacja: table(...).select/insert/update/delete z filtrami eq, neq, lt,
+lte, gt, gte, in_, sortowaniem i limitem, rpc() dla funkcji
+search_business_processes_fts i get_process_stats oraz auth
+(sign_in_with_password, sign_up). Dane trzyma SQLiteProcessRepository
+(plik w trybie WAL, indeksy jak w supabase_setup.sql), więc filtry,
+własność procesów i atomowe przejmowanie zadań kolejki działają tak samo
+jak w Postgres - w odróżnieniu od dawnego MockSupabase, który filtry
+ignorował.
+
+Wybór backendu (backend_from_env):
+- DATABASE_BACKEND=sqlite|supabase - jawnie
+- bez DATABASE_BACKEND: sqlite dla ENVIRONMENT=test/local/offline, inaczej supabase
+- SQLITE_PATH - plik bazy (domyślnie data/smartflowai.sqlite3)
+
+Użycie (CLI) - przygotowanie bazy do testów obciążeniowych:
+python sqlite_backend.py [--path data/load.sqlite3] [--processes 1000] [--user-email test@smartflowai.com]
+"""
+
+import argparse
+import hashlib
+import hmac
+import logging
+import os
+import random
+import secrets
+import sys
+import uuid
+from types import SimpleNamespace
+
+import process_views
+from process_repository import DEFAULT_SQLITE_PATH, TABLE, SQLiteProcessRepository, from_sqlite, to_sqlite, utc_now
+
+logger = logging.getLogger(__name__)
+
+BACKEND_SQLITE = "sqlite"
+BACKEND_SUPABASE = "supabase"
+LOCAL_ENVIRONMENTS = ("test", "local", "offline")
+
+USER_COLUMNS = ("id", "email", "password_hash", "full_name", "created_at", "updated_at")
+TABLE_COLUMNS = {
+    TABLE: frozenset(process_views.PROCESS_COLUMNS),
+    "users": frozenset(USER_COLUMNS),
+}
+
+# Użytkownicy testowi - te same UUID co w supabase_setup.sql
+TEST_USERS = {
+    "test@smartflowai.com": "550e8400-e29b-41d4-a716-446655440001",
+    "admin@smartflowai.com": "550e8400-e29b-41d4-a716-446655440002",
+    "demo@smartflowai.com": "550e8400-e29b-41d4-a716-446655440003",
+}
+DEFAULT_TEST_PASSWORD = "test123456"
+
+PBKDF2_ITERATIONS = 200_000
+
+FILTER_OPERATORS = {
+    "eq": "=",
+    "neq": "!=",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
+
+
+class AuthError(Exception):
+    """Błąd logowania lub rejestracji (komunikaty jak w Supabase Auth)"""
+
+
+def hash_password(password: str, iterations: int = PBKDF2_ITERATIONS) -> str:
+    """Hash hasła w formacie pbkdf2_sha256$iteracje$sól$hash"""
+    salt = secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("ascii"), iterations)
+    return f"pbkdf2_sha256${iterations}${salt}${digest.hex()}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Porównanie w stałym czasie; pusty lub nieznany format hasha nigdy nie pasuje"""
+    try:
+        algorithm, iterations, salt, expected = password_hash.split("$")
+    except (AttributeError, ValueError):
+        return False
+    if algorithm != "pbkdf2_sha256":
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("ascii"), int(iterations))
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+class SQLiteResponse:
+    """Odpowiedź zapytania - jak APIResponse klienta Supabase"""
+
+    def __init__(self, data):
+        self.data = data
+        self.count = len(data) if isinstance(data, list) else None
+
+
+class SQLiteQuery:
+    """Budowniczy zapytania table(...) tłumaczony na SQL z parametrami"""
+
+    def __init__(self, repository: SQLiteProcessRepository, table: str):
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"Nieznana tabela: {table}")
+        self.repository = repository
+        self.table = table
+        self._action = "select"
+        self._columns = "*"
+        self._values = None
+        self._filters = []
+        self._order = []
+        self._limit = None
+
+    def _check(self, columns):
+        unknown = set(columns) - TABLE_COLUMNS[self.table]
+        if unknown:
+            raise ValueError(f"Nieznane kolumny {self.table}: {', '.join(sorted(unknown))}")
+
+    # --- rodzaj zapytania ---
+
+    def select(self, columns: str = "*"):
+        if columns.strip() != "*":
+            fields = [column.strip() for column in columns.split(",")]
+            self._check(fields)
+            columns = ", ".join(fields)
+        self._action, self._columns = "select", columns
+        return self
+
+    def insert(self, data):
+        rows = data if isinstance(data, list) else [data]
+        for row in rows:
+            self._check(row)
+        self._action, self._values = "insert", rows
+        return self
+
+    def update(self, values: dict):
+        self._check(values)
+        self._action, self._values = "update", values
+        return self
+
+    def delete(self):
+        self._action = "delete"
+        return self
+
+    # --- filtry, sortowanie, limit ---
+
+    def _filter(self, column: str, operator: str, value):
+        self._check([column])
+        self._filters.append((f"{column} {operator} ?", [to_sqlite(column, value)]))
+        return self
+
+    def eq(self, column: str, value):
+        return self._filter(column, FILTER_OPERATORS["eq"], value)
+
+    def neq(self, column: str, value):
+        return self._filter(column, FILTER_OPERATORS["neq"], value)
+
+    def lt(self, column: str, value):
+        return self._filter(column, FILTER_OPERATORS["lt"], value)
+
+    def lte(self, column: str, value):
+        return self._filter(column, FILTER_OPERATORS["lte"], value)
+
+    def gt(self, column: str, value):
+        return self._filter(column, FILTER_OPERATORS["gt"], value)
+
+    def gte(self, column: str, value):
+        return self._filter(column, FILTER_OPERATORS["gte"], value)
+
+    def in_(self, column: str, values):
+        self._check([column])
+        values = [to_sqlite(column, value) for value in values]
+        # Pusta lista niczego nie dopasowuje (jak in.() w PostgREST)
+        condition = f"{column} IN ({', '.join('?' for _ in values)})" if values else "0"
+        self._filters.append((condition, values))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self._check([column])
+        self._order.append(f"{column} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, count: int):
+        self._limit = int(count)
+        return self
+
+    # --- wykonanie ---
+
+    def _where(self):
+        if not self._filters:
+            return "", []
+        conditions = " AND ".join(condition for condition, _ in self._filters)
+        return f" WHERE {conditions}", [param for _, params in self._filters for param in params]
+
+    def execute(self) -> SQLiteResponse:
+        return SQLiteResponse(getattr(self, f"_execute_{self._action}")())
+
+    def _execute_select(self):
+        where, params = self._where()
+        sql = f"SELECT {self._columns} FROM {self.table}{where}"
+        if self._order:
+            sql += f" ORDER BY {', '.join(self._order)}"
+        if self._limit is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+        with self.repository.connection() as conn:
+            return [from_sqlite(row) for row in conn.execute(sql, params).fetchall()]
+
+    def _execute_insert(self):
+        if self.table == TABLE:
+            return self.repository.insert_rows(self._values)
+
+        prepared = []
+        for row in self._values:
+            now = utc_now()
+            prepared.append({'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now, **row})
+        with self.repository.transaction() as conn:
+            for row in prepared:
+                placeholders = ", ".join("?" for _ in row)
+                conn.execute(f"INSERT INTO {self.table} ({', '.join(row)}) VALUES ({placeholders})",
+                             [to_sqlite(column, value) for column, value in row.items()])
+        return prepared
+
+    def _execute_update(self):
+        values = {**self._values, 'updated_at': utc_now()}
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        where, params = self._where()
+        # Odczyt i zmiana w jednej transakcji BEGIN IMMEDIATE - między nimi nikt inny nie zapisze,
+        # więc np. dwa workery nie przejmą tego samego zadania 'pending'
+        with self.repository.transaction() as conn:
+            rows = [from_sqlite(row) for row in conn.execute(f"SELECT * FROM {self.table}{where}", params).fetchall()]
+            if rows:
+                conn.execute(f"UPDATE {self.table} SET {assignments}{where}",
+                             [*(to_sqlite(column, value) for column, value in values.items()), *params])
+        return [{**row, **values} for row in rows]
+
+    def _execute_delete(self):
+        where, params = self._where()
+        with self.repository.transaction() as conn:
+            rows = [from_sqlite(row) for row in conn.execute(f"SELECT * FROM {self.table}{where}", params).fetchall()]
+            if rows:
+                conn.execute(f"DELETE FROM {self.table}{where}", params)
+        return rows
+
+
+class SQLiteRpc:
+    """Wywołanie funkcji bazy - odpowiedniki funkcji z supabase_setup.sql"""
+
+    def __init__(self, repository: SQLiteProcessRepository, name: str, params: dict):
+        self.repository = repository
+        self.name = name
+        self.params = params or {}
+
+    def execute(self) -> SQLiteResponse:
+        params = self.params
+        if self.name == 'search_business_processes_fts':
+            return SQLiteResponse(self.repository.search(params['user_uuid'], params['search_term'],
+                                                         params.get('result_limit', 20)))
+        if self.name == 'get_process_stats':
+            stats = self.repository.stats(params['user_uuid'], params.get('month_limit', 12),
+                                          params.get('industry_limit', 10))
+            # Funkcja zwracająca JSON - PostgREST podaje sam obiekt, nie listę wierszy
+            return SQLiteResponse(stats)
+        raise ValueError(f"Nieznana funkcja bazy: {self.name}")
+
+
+class LocalAuth:
+    """Logowanie i rejestracja na tabeli users (hasła PBKDF2) - zamiast Supabase Auth"""
+
+    def __init__(self, client):
+        self.client = client
+
+    @staticmethod
+    def _credentials(credentials: dict):
+        return credentials.get("email", "").strip(), credentials.get("password", "")
+
+    def sign_in_with_password(self, credentials: dict):
+        email, password = self._credentials(credentials)
+        rows = self.client.table('users').select('id,email,password_hash').eq('email', email).limit(1).execute().data
+        if not rows or not verify_password(password, rows[0]['password_hash']):
+            raise AuthError("Invalid login credentials")
+        return SimpleNamespace(user=SimpleNamespace(id=rows[0]['id'], email=email), session=None)
+
+    def sign_up(self, credentials: dict):
+        email, password = self._credentials(credentials)
+        if not email or not password:
+            raise AuthError("Email and password are required")
+        if self.client.repository.find_user_id(email):
+            raise AuthError("User already registered")
+        user_id = self.client.repository.add_user(email, password_hash=hash_password(password))
+        return SimpleNamespace(user=SimpleNamespace(id=user_id, email=email), session=None)
+
+    def sign_out(self):
+        return None
+
+
+class SQLiteClient:
+    """Klient lokalnej bazy o interfejsie klienta Supabase"""
+
+    def __init__(self, repository: SQLiteProcessRepository):
+        self.repository = repository
+        self.auth = LocalAuth(self)
+
+    def table(self, name: str) -> SQLiteQuery:
+        return SQLiteQuery(self.repository, name)
+
+    def rpc(self, name: str, params: dict = None) -> SQLiteRpc:
+        return SQLiteRpc(self.repository, name, params)
+
+    def close(self):
+        self.repository.close()
+
+
+def seed_test_users(client: SQLiteClient, password: str = None) -> int:
+    """Dodaje brakujących użytkowników testowych, zwraca liczbę dodanych"""
+    password = password or os.getenv("TEST_USER_PASSWORD") or DEFAULT_TEST_PASSWORD
+    added = 0
+    for email, user_id in TEST_USERS.items():
+        if client.repository.find_user_id(email):
+            continue
+        client.repository.add_user(email, user_id=user_id, password_hash=hash_password(password))
+        added += 1
+    return added
+
+
+def backend_from_env() -> str:
+    """DATABASE_BACKEND lub domyślny backend dla ENVIRONMENT"""
+    backend = os.getenv("DATABASE_BACKEND", "").strip().lower()
+    if not backend:
+        environment = os.getenv("ENVIRONMENT", "").lower()
+        return BACKEND_SQLITE if environment in LOCAL_ENVIRONMENTS else BACKEND_SUPABASE
+    if backend not in (BACKEND_SQLITE, BACKEND_SUPABASE):
+        raise ValueError(f"Nieznany DATABASE_BACKEND: {backend} (dozwolone: {BACKEND_SQLITE}, {BACKEND_SUPABASE})")
+    return backend
+
+
+def client_from_env() -> SQLiteClient:
+    """Klient bazy z SQLITE_PATH z użytkownikami testowymi"""
+    client = SQLiteClient(SQLiteProcessRepository(os.getenv("SQLITE_PATH") or DEFAULT_SQLITE_PATH))
+    seed_test_users(client)
+    return client
+
+
+SAMPLE_TITLES = ("Fakturowanie", "Rekrutacja", "Obsługa zamówień", "Raportowanie sprzedaży",
+                 "Onboarding klientów", "Rozliczanie delegacji", "Obieg dokumentów", "Zamówienia magazynowe")
+SAMPLE_INDUSTRIES = ("Księgowość", "E-commerce", "Produkcja", "IT", "Marketing", "")
+SAMPLE_DEPTHS = ("Podstawowa (szybka)", "Pogłębiona (z wyszukiwaniem)", "Ekspercka (pełna analiza)")
+
+
+def sample_processes(user_id: str, count: int, seed: int = 0) -> list:
+    """Powtarzalne przykładowe procesy (z metrykami analizy) do testów obciążeniowych"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        title = rng.choice(SAMPLE_TITLES)
+        rows.append({
+            'user_id': user_id,
+            'title': f"{title} #{i + 1}",
+            'description': f"Proces {title.lower()} wykonywany ręcznie w arkuszach i poczcie e-mail. " * rng.randint(1, 5),
+            'ai_analysis': f"🔍 **ANALIZA:** Proces {title.lower()} można zautomatyzować. " * rng.randint(5, 30),
+            'analysis_depth': rng.choice(SAMPLE_DEPTHS),
+            'industry': rng.choice(SAMPLE_INDUSTRIES) or None,
+            'automation_potential': rng.randint(20, 95),
+            'time_savings_hours': round(rng.uniform(1, 40), 1),
+            'cost_savings_annual': round(rng.uniform(1000, 50000), 2),
+            'implementation_difficulty': rng.choice(("Łatwa", "Średnia", "Trudna")),
+        })
+    return rows
+
+
+def main(argv=None):
+    """Tworzy (lub uzupełnia) lokalną bazę z użytkownikami testowymi i przykładowymi procesami"""
+    parser = argparse.ArgumentParser(description="SmartFlowAI - lokalna baza SQLite")
+    parser.add_argument("--path", default=os.getenv("SQLITE_PATH") or DEFAULT_SQLITE_PATH, help="Plik bazy")
+    parser.add_argument("--processes", type=int, default=0, help="Liczba przykładowych procesów do dodania")
+    parser.add_argument("--user-email", default="test@smartflowai.com", help="Właściciel przykładowych procesów")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora danych")
+    args = parser.parse_args(argv)
+
+    client = SQLiteClient(SQLiteProcessRepository(args.path))
+    try:
+        added_users = seed_test_users(client)
+        user_id = client.repository.find_user_id(args.user_email)
+        if not user_id:
+            print(f"❌ Brak użytkownika {args.user_email} w bazie")
+            return 1
+        added = client.repository.insert_processes(sample_processes(user_id, args.processes, args.seed))
+        total = len(client.repository.list_processes(user_id))
+        print(f"✅ {args.path}: dodano {added_users} użytkowników testowych i {added} procesów "
+              f"({args.user_email} ma {total} procesów)")
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,7 @@ CREATE TABLE IF NOT EXISTS business_processes (
     description TEXT NOT NULL,
     ai_analysis TEXT,
     analysis_depth VARCHAR(50) DEFAULT 'Podstawowa (szybka)',
+    industry VARCHAR(100),
     automation_potential INTEGER CHECK (automation_potential >= 0 AND automation_potential <= 100),
     time_savings_hours DECIMAL(10,2),
     cost_savings_annual DECIMAL(15,2),
@@ -32,9 +33,26 @@ CREATE TABLE IF NOT EXISTS business_processes (
     next_steps TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    is_active BOOLEAN DEFAULT TRUE
+    is_active BOOLEAN DEFAULT TRUE,
+    -- Kolejka analiz w tle (analysis_jobs.py)
+    analysis_status VARCHAR(20) DEFAULT 'completed' CHECK (analysis_status IN ('pending', 'running', 'completed', 'failed')),
+    analysis_params JSONB,
+    analysis_error TEXT,
+    analysis_started_at TIMESTAMP WITH TIME ZONE,
+    analysis_attempts INTEGER DEFAULT 0
 );
 
+-- 3a. Migracja istniejących instalacji - kolumny kolejki analiz
+ALTER TABLE business_processes ADD COLUMN IF NOT EXISTS analysis_status VARCHAR(20) DEFAULT 'completed'
+    CHECK (analysis_status IN ('pending', 'running', 'completed', 'failed'));
+ALTER TABLE business_processes ADD COLUMN IF NOT EXISTS analysis_params JSONB;
+ALTER TABLE business_processes ADD COLUMN IF NOT EXISTS analysis_error TEXT;
+ALTER TABLE business_processes ADD COLUMN IF NOT EXISTS analysis_started_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE business_processes ADD COLUMN IF NOT EXISTS analysis_attempts INTEGER DEFAULT 0;
+
+-- 3b. Migracja istniejących instalacji - branża z kontekstu firmy (statystyki dashboardu)
+ALTER TABLE business_processes ADD COLUMN IF NOT EXISTS industry VARCHAR(100);
+
 -- 4. Tabela kategorii procesów (opcjonalna)
 CREATE TABLE IF NOT EXISTS process_categories (
     id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
@@ -58,6 +76,14 @@ CREATE TABLE IF NOT EXISTS activity_logs (
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_business_processes_user_id ON business_processes(user_id);
 CREATE INDEX IF NOT EXISTS idx_business_processes_created_at ON business_processes(created_at DESC);
+-- Stronicowanie keyset listy procesów: WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_business_processes_user_created_id ON business_processes(user_id, created_at DESC, id DESC);
+-- Kolejka analiz: worker pobiera najstarsze zadania 'pending' (indeks częściowy - tylko aktywne zadania)
+CREATE INDEX IF NOT EXISTS idx_business_processes_analysis_queue ON business_processes(analysis_status, created_at)
+    WHERE analysis_status IN ('pending', 'running');
+-- Sortowanie procesów po potencjale automatyzacji (metryki z ustrukturyzowanej analizy AI)
+CREATE INDEX IF NOT EXISTS idx_business_processes_user_potential ON business_processes(user_id, automation_potential DESC NULLS LAST)
+    WHERE is_active = TRUE;
 CREATE INDEX IF NOT EXISTS idx_activity_logs_user_id ON activity_logs(user_id);
 CREATE INDEX IF NOT EXISTS idx_activity_logs_created_at ON activity_logs(created_at DESC);
 
@@ -186,6 +212,112 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
 
+-- 17a. Wyszukiwanie pełnotekstowe (title + description + ai_analysis)
+-- Konfiguracja językowa (polish -> english -> simple) wybierana raz i wpisywana do funkcji
+-- IMMUTABLE, dzięki czemu indeks GIN i zapytanie używają identycznego wyrażenia.
+DO $$
+DECLARE
+    ts_config TEXT;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'polish') THEN
+        ts_config := 'polish';
+    ELSIF EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'english') THEN
+        ts_config := 'english';
+    ELSE
+        ts_config := 'simple';
+    END IF;
+
+    EXECUTE format($f$
+        CREATE OR REPLACE FUNCTION process_search_vector(p_title TEXT, p_description TEXT, p_ai_analysis TEXT)
+        RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $body$
+            SELECT setweight(to_tsvector(%1$L::regconfig, coalesce(p_title, '')), 'A') ||
+                   setweight(to_tsvector(%1$L::regconfig, coalesce(p_description, '')), 'B') ||
+                   setweight(to_tsvector(%1$L::regconfig, coalesce(p_ai_analysis, '')), 'C')
+        $body$
+    $f$, ts_config);
+
+    EXECUTE format($f$
+        CREATE OR REPLACE FUNCTION process_search_query(p_search_term TEXT)
+        RETURNS tsquery LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $body$
+            SELECT websearch_to_tsquery(%1$L::regconfig, p_search_term)
+        $body$
+    $f$, ts_config);
+
+    RAISE NOTICE 'Wyszukiwanie full-text używa konfiguracji %', ts_config;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_business_processes_search ON business_processes
+    USING GIN(process_search_vector(title::TEXT, description, ai_analysis));
+
+-- Ranking po stronie serwera, zwraca tylko id/title/created_at (bez dużych kolumn tekstowych).
+-- SECURITY INVOKER - polityki RLS obowiązują tak jak przy zwykłym SELECT.
+CREATE OR REPLACE FUNCTION search_business_processes_fts(search_term TEXT, user_uuid UUID, result_limit INTEGER DEFAULT 50)
+RETURNS TABLE (
+    id UUID,
+    title VARCHAR(500),
+    created_at TIMESTAMP WITH TIME ZONE,
+    rank REAL
+) AS $$
+    SELECT
+        bp.id,
+        bp.title,
+        bp.created_at,
+        ts_rank(process_search_vector(bp.title::TEXT, bp.description, bp.ai_analysis), q) AS rank
+    FROM business_processes bp, process_search_query(search_term) q
+    WHERE bp.user_id = user_uuid
+    AND bp.is_active = TRUE
+    AND process_search_vector(bp.title::TEXT, bp.description, bp.ai_analysis) @@ q
+    ORDER BY rank DESC, bp.created_at DESC
+    LIMIT result_limit;
+$$ LANGUAGE sql STABLE;
+
+-- 17b. Statystyki dashboardu liczone w bazie (get_process_stats)
+-- Jeden obiekt JSON o stałym rozmiarze niezależnie od liczby procesów: liczba procesów
+-- w ostatnich miesiącach, według głębokości analizy i branży oraz suma szacowanych oszczędności.
+-- SECURITY INVOKER - polityki RLS obowiązują tak jak przy zwykłym SELECT.
+CREATE OR REPLACE FUNCTION get_process_stats(user_uuid UUID, month_limit INTEGER DEFAULT 12, industry_limit INTEGER DEFAULT 10)
+RETURNS JSON AS $$
+    WITH active AS (
+        SELECT created_at, analysis_depth, industry, automation_potential, time_savings_hours, cost_savings_annual
+        FROM business_processes
+        WHERE user_id = user_uuid
+        AND is_active = TRUE
+    )
+    SELECT json_build_object(
+        'total_processes', (SELECT COUNT(*) FROM active),
+        'avg_automation_potential', (SELECT ROUND(AVG(automation_potential), 1) FROM active),
+        'total_time_savings', (SELECT COALESCE(SUM(time_savings_hours), 0) FROM active),
+        'total_cost_savings', (SELECT COALESCE(SUM(cost_savings_annual), 0) FROM active),
+        'per_month', COALESCE((
+            SELECT json_agg(json_build_object('month', to_char(m.month, 'YYYY-MM'), 'count', m.count) ORDER BY m.month)
+            FROM (
+                SELECT DATE_TRUNC('month', created_at) AS month, COUNT(*) AS count
+                FROM active
+                WHERE created_at >= DATE_TRUNC('month', NOW()) - (month_limit - 1) * INTERVAL '1 month'
+                GROUP BY 1
+            ) m
+        ), '[]'::json),
+        'per_depth', COALESCE((
+            SELECT json_agg(json_build_object('analysis_depth', d.analysis_depth, 'count', d.count) ORDER BY d.count DESC)
+            FROM (
+                SELECT COALESCE(analysis_depth, 'Nie podano') AS analysis_depth, COUNT(*) AS count
+                FROM active
+                GROUP BY 1
+            ) d
+        ), '[]'::json),
+        'per_industry', COALESCE((
+            SELECT json_agg(json_build_object('industry', i.industry, 'count', i.count) ORDER BY i.count DESC)
+            FROM (
+                SELECT COALESCE(NULLIF(industry, ''), 'Nie podano') AS industry, COUNT(*) AS count
+                FROM active
+                GROUP BY 1
+                ORDER BY count DESC
+                LIMIT industry_limit
+            ) i
+        ), '[]'::json)
+    );
+$$ LANGUAGE sql STABLE;
+
 -- 18. Funkcja do logowania aktywności
 CREATE OR REPLACE FUNCTION log_activity(
     user_uuid UUID,
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+# Plik: telemetry.py
+# telemetry.py - Pomiar czasu operacji aplikacji (spany, percentyle, eksport Prometheus)
+
+"""
+Instrumentacja czasu operacji SmartFlowAI.
+
+- timed(name, labels=...): dekorator funkcji (zwykłych, async i generatorów -
+  span generatora obejmuje całe pobieranie strumienia)
+- span(name, **labels): to samo jako context manager
+- observe(name, value): wartość inna niż czas (np. trafienie w cache 1/0,
+  liczba zapytań do bazy w przebiegu skryptu)
+- count_spans(prefix): liczba spanów o danym prefiksie w bieżącym kontekście
+  (wątku przebiegu skryptu Streamlit)
+- registry: rejestr spanów wspólny dla wątków procesu - ostatnie próbki każdej
+  serii (nazwa + etykiety), percentyle p50/p95/p99, tekst w formacie Prometheus
+
+Włączane zmienną TELEMETRY_ENABLED. Wyłączone (domyślnie) kosztuje jedno
+sprawdzenie flagi na wywołanie - bez pomiaru czasu, bez alokacji.
+
+Każdy span zapisywany jest jako linia JSON w loggerze "telemetry.spans" (na stderr
+lub do TELEMETRY_LOG_PATH), a przy ustawionym TELEMETRY_PROMETHEUS_PATH
+agregaty zapisywane są do pliku w formacie tekstowym Prometheus (np. dla
+node_exporter textfile collector) co TELEMETRY_PROMETHEUS_INTERVAL sekund.
+
+Użycie (agregacja zapisanego logu):
+python telemetry.py data/telemetry.jsonl [--since-minutes 60]
+"""
+
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+# Osobny logger spanów - aplikacja loguje tylko błędy (logging.basicConfig(level=ERROR))
+span_logger = logging.getLogger("telemetry.spans")
+
+# Domyślne ustawienia (nadpisywane zmiennymi środowiskowymi)
+DEFAULT_WINDOW = 2000  # Ostatnie próbki każdej serii brane do percentyli
+DEFAULT_PROMETHEUS_INTERVAL = 15.0
+PERCENTILES = (50, 95, 99)
+METRIC_PREFIX = "smartflowai_span"
+
+_DISABLED_SPAN = nullcontext()
+# Liczniki spanów aktywne w bieżącym kontekście (count_spans)
+_active_counters = contextvars.ContextVar("telemetry_counters", default=())
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Percentyl metodą najbliższej rangi (sorted_values posortowane rosnąco, niepuste)"""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations: list) -> dict:
+    """Liczba, średnia, maksimum i p50/p95/p99 czasów w ms"""
+    ordered = sorted(durations)
+    result = {"count": len(ordered)}
+    if not ordered:
+        return result
+    result["mean_ms"] = sum(ordered) / len(ordered)
+    result["max_ms"] = ordered[-1]
+    for q in PERCENTILES:
+        result[f"p{q}_ms"] = percentile(ordered, q)
+    return result
+
+
+class SpanSeries:
+    """Próbki jednej serii (nazwa + etykiety): okno ostatnich pomiarów i liczniki od startu"""
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)  # (znacznik czasu, czas w ms lub wartość, błąd)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+
+class SpanRegistry:
+    """Rejestr spanów wspólny dla wątków procesu"""
+
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW, prometheus_path: str = None,
+                 prometheus_interval: float = DEFAULT_PROMETHEUS_INTERVAL, log_spans: bool = True):
+        self.enabled = enabled
+        self.window = window
+        self.prometheus_path = prometheus_path
+        self.prometheus_interval = prometheus_interval
+        self.log_spans = log_spans
+        self._series = {}
+        self._values = {}
+        self._lock = threading.Lock()
+        self._last_export = time.monotonic()
+
+    def _append(self, store: dict, name: str, value: float, labels: dict, error: bool) -> tuple:
+        labels = {key: str(value) for key, value in (labels or {}).items()}
+        now = time.time()
+        with self._lock:
+            key = (name, tuple(sorted(labels.items())))
+            series = store.get(key)
+            if series is None:
+                series = store[key] = SpanSeries(self.window)
+            series.samples.append((now, value, error))
+            series.count += 1
+            series.total += value
+            series.errors += error
+        return now, labels
+
+    def _after_record(self, entry: dict):
+        if self.log_spans:
+            span_logger.info(json.dumps(entry, ensure_ascii=False))
+        if self.prometheus_path and time.monotonic() - self._last_export >= self.prometheus_interval:
+            self.export_prometheus()
+
+    def record(self, name: str, duration_ms: float, labels: dict = None, error: bool = False):
+        """Zapisuje pomiar jednej operacji"""
+        now, labels = self._append(self._series, name, duration_ms, labels, error)
+        for counter in _active_counters.get():
+            if name.startswith(counter.prefix):
+                counter.count += 1
+        self._after_record({"ts": round(now, 3), "span": name, "duration_ms": round(duration_ms, 3),
+                            "status": "error" if error else "ok", "labels": labels})
+
+    def observe(self, name: str, value: float, labels: dict = None):
+        """Zapisuje wartość inną niż czas operacji (osobne serie, bez wpływu na spany)"""
+        now, labels = self._append(self._values, name, value, labels, False)
+        self._after_record({"ts": round(now, 3), "metric": name, "value": value, "labels": labels})
+
+    @contextmanager
+    def span(self, name: str, labels: dict = None):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            # st.rerun()/st.stop() i przerwany generator (BaseException) nie są błędami operacji
+            error = True
+            raise
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, labels, error)
+
+    def samples(self, name: str = None, since: float = None) -> dict:
+        """Czasy w ms z okna każdej serii: {(nazwa, etykiety): [ms, ...]} (since - znacznik time.time())"""
+        return self._window(self._series, name, since)
+
+    def values(self, name: str = None, since: float = None) -> dict:
+        """Wartości z observe() w tym samym układzie co samples()"""
+        return self._window(self._values, name, since)
+
+    def _window(self, store: dict, name: str, since: float) -> dict:
+        with self._lock:
+            snapshot = {key: list(series.samples) for key, series in store.items()
+                        if name is None or key[0] == name}
+        return {key: [value for ts, value, _ in samples if since is None or ts >= since]
+                for key, samples in snapshot.items()}
+
+    def summary(self, since: float = None) -> list:
+        """Percentyle każdej serii z okna ostatnich próbek, posortowane według nazwy"""
+        with self._lock:
+            snapshot = {key: list(series.samples) for key, series in self._series.items()}
+
+        result = []
+        for (name, labels), samples in sorted(snapshot.items()):
+            samples = [sample for sample in samples if since is None or sample[0] >= since]
+            if not samples:
+                continue
+            row = {"span": name, "labels": dict(labels), "errors": sum(error for _, _, error in samples)}
+            row.update(summarize([ms for _, ms, _ in samples]))
+            result.append(row)
+        return result
+
+    def prometheus_text(self) -> str:
+        """Agregaty w formacie tekstowym Prometheus (summary z kwantylami okna + licznik błędów)"""
+        with self._lock:
+            snapshot = {key: (sorted(ms for _, ms, _ in series.samples), series.count, series.total, series.errors)
+                        for key, series in self._series.items()}
+            values = {key: (sorted(value for _, value, _ in series.samples), series.count, series.total)
+                      for key, series in self._values.items()}
+
+        metric = f"{METRIC_PREFIX}_duration_milliseconds"
+        lines = [f"# HELP {metric} Czas operacji SmartFlowAI (kwantyle z ostatnich próbek)",
+                 f"# TYPE {metric} summary"]
+        errors = [f"# HELP {METRIC_PREFIX}_errors_total Operacje zakończone wyjątkiem",
+                  f"# TYPE {METRIC_PREFIX}_errors_total counter"]
+        for (name, labels), (ordered, count, total_ms, error_count) in sorted(snapshot.items()):
+            base = _prometheus_labels({"span": name, **dict(labels)})
+            for q in PERCENTILES:
+                quantile_labels = _prometheus_labels({"span": name, **dict(labels), "quantile": str(q / 100)})
+                lines.append(f"{metric}{quantile_labels} {percentile(ordered, q):.3f}")
+            lines.append(f"{metric}_sum{base} {total_ms:.3f}")
+            lines.append(f"{metric}_count{base} {count}")
+            errors.append(f"{METRIC_PREFIX}_errors_total{base} {error_count}")
+
+        value_metric = "smartflowai_value"
+        observed = [f"# HELP {value_metric} Wartości zapisane przez observe() (kwantyle z ostatnich próbek)",
+                    f"# TYPE {value_metric} summary"] if values else []
+        for (name, labels), (ordered, count, total) in sorted(values.items()):
+            base = _prometheus_labels({"name": name, **dict(labels)})
+            for q in PERCENTILES:
+                quantile_labels = _prometheus_labels({"name": name, **dict(labels), "quantile": str(q / 100)})
+                observed.append(f"{value_metric}{quantile_labels} {percentile(ordered, q):g}")
+            observed.append(f"{value_metric}_sum{base} {total:g}")
+            observed.append(f"{value_metric}_count{base} {count}")
+        return "\n".join(lines + errors + observed) + "\n"
+
+    def export_prometheus(self, path: str = None) -> bool:
+        """Zapisuje prometheus_text() do pliku (atomowo - czytelnik nie widzi połowy pliku)"""
+        path = path or self.prometheus_path
+        self._last_export = time.monotonic()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                file.write(self.prometheus_text())
+            os.replace(temporary, path)
+            return True
+        except Exception as e:
+            logger.error(f"TELEMETRY_EXPORT_ERROR: {str(e)}")
+            return False
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._values.clear()
+
+
+def _prometheus_labels(labels: dict) -> str:
+    """{klucz="wartość",...} ze znakami \\, " i nowej linii poprzedzonymi \\"""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+
+def registry_from_env() -> SpanRegistry:
+    """Rejestr na podstawie zmiennych środowiskowych (wyłączony, gdy TELEMETRY_ENABLED nie jest ustawione)"""
+    enabled = os.getenv("TELEMETRY_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+    log_spans = os.getenv("TELEMETRY_JSON_LOGS", "true").lower() not in ("0", "false", "no", "off")
+    if enabled and log_spans and not span_logger.handlers:
+        log_path = os.getenv("TELEMETRY_LOG_PATH")
+        if log_path and os.path.dirname(log_path):
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        handler = logging.FileHandler(log_path, encoding="utf-8") if log_path else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        span_logger.addHandler(handler)
+        span_logger.setLevel(logging.INFO)
+        span_logger.propagate = False
+
+    return SpanRegistry(
+        enabled=enabled,
+        window=int(os.getenv("TELEMETRY_WINDOW", DEFAULT_WINDOW)),
+        prometheus_path=os.getenv("TELEMETRY_PROMETHEUS_PATH") or None,
+        prometheus_interval=float(os.getenv("TELEMETRY_PROMETHEUS_INTERVAL", DEFAULT_PROMETHEUS_INTERVAL)),
+        log_spans=log_spans
+    )
+
+
+registry = registry_from_env()
+
+
+def span(name: str, **labels):
+    """Context manager mierzący blok kodu (gdy telemetria wyłączona - pusty kontekst)"""
+    if not registry.enabled:
+        return _DISABLED_SPAN
+    return registry.span(name, labels)
+
+
+def observe(name: str, value: float, **labels):
+    """Zapisuje wartość (gdy telemetria wyłączona - nic nie robi)"""
+    if registry.enabled:
+        registry.observe(name, value, labels)
+
+
+class SpanCounter:
+    """Licznik spanów o nazwach zaczynających się od prefix"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.count = 0
+
+
+@contextmanager
+def count_spans(prefix: str):
+    """Liczy spany o danym prefiksie zapisane w bieżącym kontekście (np. zapytania repo.* w jednym przebiegu strony)"""
+    counter = SpanCounter(prefix)
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+
+def group_by_label(series: dict, label: str) -> dict:
+    """Łączy serie z samples()/values() według wartości jednej etykiety: {wartość: [próbki]}"""
+    groups = {}
+    for (_, labels), samples in series.items():
+        groups.setdefault(dict(labels).get(label, ""), []).extend(samples)
+    return {value: samples for value, samples in groups.items() if samples}
+
+
+def histogram(values: list, edges: tuple) -> list:
+    """Liczba wartości w przedziałach: [(etykieta, liczba), ...] - ostatni przedział otwarty (> ostatniej granicy)"""
+    counts = [0] * (len(edges) + 1)
+    for value in values:
+        index = 0
+        while index < len(edges) and value > edges[index]:
+            index += 1
+        counts[index] += 1
+    labels = [f"≤ {edge:g}" for edge in edges] + [f"> {edges[-1]:g}"]
+    return list(zip(labels, counts))
+
+
+def timed(name: str, labels: tuple = ()):
+    """Dekorator mierzący każde wywołanie funkcji; labels - nazwy argumentów zapisywane jako etykiety"""
+    def decorator(func):
+        signature = inspect.signature(func) if labels else None
+
+        def label_values(args, kwargs) -> dict:
+            if not labels:
+                return {}
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            return {label: bound.arguments.get(label) for label in labels}
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return await func(*args, **kwargs)
+                with registry.span(name, label_values(args, kwargs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return func(*args, **kwargs)
+                return _timed_generator(func(*args, **kwargs), name, label_values(args, kwargs))
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            with registry.span(name, label_values(args, kwargs)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _timed_generator(generator, name: str, labels: dict):
+    # Span od pierwszego next() do wyczerpania (lub przerwania) generatora
+    with registry.span(name, labels):
+        yield from generator
+
+
+def summary_from_log(lines, since: float = None) -> list:
+    """Percentyle z linii JSON zapisanych przez logger spanów (jak SpanRegistry.summary)"""
+    durations = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            if since is not None and entry["ts"] < since:
+                continue
+            key = (entry["span"], tuple(sorted(entry.get("labels", {}).items())))
+            durations.setdefault(key, []).append((entry["duration_ms"], entry.get("status") == "error"))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+
+    result = []
+    for (name, labels), samples in sorted(durations.items()):
+        row = {"span": name, "labels": dict(labels), "errors": sum(error for _, error in samples)}
+        row.update(summarize([ms for ms, _ in samples]))
+        result.append(row)
+    return result
+
+
+def main(argv=None):
+    """Percentyle czasów z logu spanów (TELEMETRY_LOG_PATH)"""
+    parser = argparse.ArgumentParser(description="SmartFlowAI - percentyle czasów operacji z logu telemetrii")
+    parser.add_argument("path", help="Plik z liniami JSON spanów")
+    parser.add_argument("--since-minutes", type=float, default=None, help="Tylko spany z ostatnich N minut")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.since_minutes * 60 if args.since_minutes else None
+    with open(args.path, encoding="utf-8") as file:
+        rows = summary_from_log(file, since)
+
+    if not rows:
+        print("Brak spanów w logu")
+        return 1
+    print(f"{'span':<36} {'etykiety':<28} {'liczba':>7} {'błędy':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for row in rows:
+        labels = ",".join(f"{key}={value}" for key, value in row["labels"].items())
+        print(f"{row['span']:<36} {labels:<28} {row['count']:>7} {row['errors']:>6} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Plik: test_ai_cache.py
+# test_ai_cache.py - Testy cache odpowiedzi AI
+
+import pytest
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+# Setup path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai_cache import AICache, cache_from_env
+from ai_client import AnalysisError
+
+
+class TestAICache:
+    """Testy trwałego cache odpowiedzi AI"""
+
+    def test_key_depends_on_all_parameters(self):
+        """Klucz zależy od promptu, modelu, max_tokens i temperature"""
+        base = AICache.make_key("prompt", "gpt-4o", 3000, 0.3)
+
+        assert base == AICache.make_key("prompt", "gpt-4o", 3000, 0.3)
+        assert base != AICache.make_key("prompt 2", "gpt-4o", 3000, 0.3)
+        assert base != AICache.make_key("prompt", "gpt-4o-mini", 3000, 0.3)
+        assert base != AICache.make_key("prompt", "gpt-4o", 2000, 0.3)
+        assert base != AICache.make_key("prompt", "gpt-4o", 3000, 0.7)
+
+    def test_hit_and_miss_counters(self, tmp_path):
+        """Test liczników trafień i chybień"""
+        cache = AICache(str(tmp_path / "cache.sqlite3"))
+
+        assert cache.get("klucz") is None
+        cache.set("klucz", "Analiza z polskimi znakami: ąćęłńóśźż 🔍")
+        assert cache.get("klucz") == "Analiza z polskimi znakami: ąćęłńóśźż 🔍"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_persistence_between_instances(self, tmp_path):
+        """Wpisy przetrwają ponowne utworzenie cache (restart aplikacji)"""
+        path = str(tmp_path / "cache.sqlite3")
+        AICache(path).set("klucz", "odpowiedź")
+
+        assert AICache(path).get("klucz") == "odpowiedź"
+
+    def test_ttl_expiry(self, tmp_path):
+        """Przeterminowane wpisy nie są zwracane"""
+        cache = AICache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+        cache.set("klucz", "odpowiedź")
+
+        with patch("ai_cache.time.time", return_value=time.time() + 120):
+            assert cache.get("klucz") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        """Po przekroczeniu limitu usuwany jest najdawniej używany wpis"""
+        cache = AICache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+        start = int(time.time()) - 100
+        clock = iter(range(start, start + 50))
+
+        with patch("ai_cache.time.time", side_effect=lambda: float(next(clock))):
+            cache.set("a", "A")
+            cache.set("b", "B")
+            cache.get("a")  # "a" używany później niż "b"
+            cache.set("c", "C")
+
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+        assert cache.get("c") == "C"
+
+    def test_cache_disabled_by_env(self):
+        """AI_CACHE_ENABLED=false wyłącza cache"""
+        with patch.dict(os.environ, {"AI_CACHE_ENABLED": "false"}):
+            assert cache_from_env() is None
+
+
+class TestAnalyzeWithCache:
+    """Integracja cache z analyze_with_ai"""
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    @patch('smartflowai.ai.init_ai_cache')
+    def test_repeat_analysis_served_from_cache(self, mock_init_cache, mock_openai, tmp_path):
+        """Powtórna identyczna analiza nie wywołuje OpenAI"""
+        from smartflowai.ai import analyze_with_ai
+
+        mock_init_cache.return_value = AICache(str(tmp_path / "cache.sqlite3"))
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "🔍 **ANALIZA:** Wynik"
+        mock_openai.chat.completions.create.return_value = mock_response
+
+        first = analyze_with_ai("Faktury", "Ręczne wystawianie faktur", "Podstawowa (szybka)")
+        second = analyze_with_ai("Faktury", "Ręczne wystawianie faktur", "Podstawowa (szybka)")
+
+        assert first == second == "🔍 **ANALIZA:** Wynik"
+        mock_openai.chat.completions.create.assert_called_once()
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    @patch('smartflowai.ai.init_ai_cache')
+    def test_errors_are_not_cached(self, mock_init_cache, mock_openai, tmp_path):
+        """Błędy API nie trafiają do cache"""
+        from smartflowai.ai import analyze_with_ai
+
+        cache = AICache(str(tmp_path / "cache.sqlite3"))
+        mock_init_cache.return_value = cache
+        mock_openai.chat.completions.create.side_effect = Exception("API Error")
+
+        with pytest.raises(AnalysisError):
+            analyze_with_ai("Faktury", "Ręczne wystawianie faktur")
+
+        assert cache.stats()["entries"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
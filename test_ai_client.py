@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Plik: test_ai_client.py
+# test_ai_client.py - Testy współdzielonego klienta OpenAI
+
+"""
+Testy dla ai_client.py - limity czasu zależne od głębokości analizy,
+konfiguracja puli połączeń, ograniczenie liczby równoległych zapytań,
+ponowienia (Retry-After, backoff) i limiter RPM/TPM.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import httpx
+import openai
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ai_client
+
+
+class TestTimeouts:
+    """Testy limitów czasu"""
+
+    def test_timeout_grows_with_depth(self):
+        """Głębsza analiza ma dłuższy limit odczytu, połączenie - krótki"""
+        quick = ai_client.request_timeout("Podstawowa (szybka)")
+        expert = ai_client.request_timeout("Ekspercka (pełna analiza)")
+
+        assert quick.read < expert.read
+        assert quick.connect == expert.connect == ai_client.DEFAULT_CONNECT_TIMEOUT
+        assert ai_client.request_timeout("Nieznana").read == ai_client.DEFAULT_READ_TIMEOUT
+
+
+class TestClients:
+    """Testy tworzenia klientów"""
+
+    def test_sync_client_uses_pooled_http_client(self):
+        """Klient synchroniczny ma własny klient HTTP z limitami puli"""
+        with patch.dict(os.environ, {"OPENAI_MAX_CONNECTIONS": "7"}), \
+                patch.object(openai, "DefaultHttpxClient", wraps=openai.DefaultHttpxClient) as http_client:
+            client = ai_client.create_openai_client("sk-test")
+
+        assert isinstance(client, openai.OpenAI)
+        limits = http_client.call_args[1]['limits']
+        assert limits.max_connections == 7
+        assert limits.max_keepalive_connections == ai_client.DEFAULT_MAX_KEEPALIVE
+
+    def test_async_client_shared_per_event_loop(self):
+        """W obrębie jednej pętli zdarzeń używany jest jeden klient asynchroniczny"""
+        async def get_twice():
+            return ai_client.get_async_openai_client("sk-test"), ai_client.get_async_openai_client("sk-test")
+
+        first, second = asyncio.run(get_twice())
+        other, _ = asyncio.run(get_twice())
+
+        assert isinstance(first, openai.AsyncOpenAI)
+        assert first is second
+        assert other is not first
+
+    def test_lazy_client_not_built_by_introspection(self):
+        """mock.patch i inspect nie tworzą klienta - dopiero użycie atrybutu (chat)"""
+        factory = Mock(return_value=Mock(chat="chat"))
+        holder = Mock(client=ai_client.LazyClient(factory))
+
+        with patch.object(holder, "client"):
+            pass
+        assert not hasattr(holder.client, "__func__")
+        factory.assert_not_called()
+
+        assert holder.client.chat == "chat"
+        factory.assert_called_once()
+
+
+class TestConcurrency:
+    """Testy ograniczenia równoległych zapytań"""
+
+    def test_concurrency_slot_bounds_threads(self):
+        """Nie więcej zapytań naraz niż wynosi limit"""
+        state = {"active": 0, "max": 0}
+        lock = threading.Lock()
+
+        def call():
+            with ai_client.concurrency_slot():
+                with lock:
+                    state["active"] += 1
+                    state["max"] = max(state["max"], state["active"])
+                time.sleep(0.02)
+                with lock:
+                    state["active"] -= 1
+
+        with patch.object(ai_client, "_semaphore", threading.BoundedSemaphore(2)):
+            threads = [threading.Thread(target=call) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert state["max"] == 2
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    def test_analysis_passes_depth_timeout(self, mock_openai):
+        """analyze_with_ai przekazuje limit czasu dla wybranej głębokości"""
+        from smartflowai.ai import analyze_with_ai
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Analiza"
+        mock_openai.chat.completions.create.return_value = mock_response
+
+        analyze_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu", "Ekspercka (pełna analiza)")
+
+        timeout = mock_openai.chat.completions.create.call_args[1]['timeout']
+        assert timeout == ai_client.request_timeout("Ekspercka (pełna analiza)")
+
+
+def api_error(error_class, status_code, headers=None):
+    """Błąd API OpenAI z odpowiedzią HTTP o podanym kodzie i nagłówkach"""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return error_class("error", response=response, body=None)
+
+
+class FakeClock:
+    """Zegar sterowany ręcznie - sleep przesuwa czas zamiast czekać"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRetry:
+    """Testy ponowień zapytań"""
+
+    def test_retry_after_header_honoured(self):
+        """Po 429 czekamy tyle, ile wskazał serwer, i ponawiamy"""
+        clock = FakeClock()
+        request = Mock(side_effect=[api_error(openai.RateLimitError, 429, {"retry-after": "7"}), "odpowiedź"])
+
+        with patch.object(ai_client, "rate_limiter", ai_client.RateLimiter(0, 0, clock)):
+            assert ai_client.call_with_retry(request, 100, max_retries=3, sleep=clock.sleep) == "odpowiedź"
+
+        assert request.call_count == 2
+        assert clock.sleeps == [7.0]
+
+    def test_retry_after_ms_and_http_date(self):
+        """Obsługa retry-after-ms i daty HTTP, limit maksymalnego oczekiwania"""
+        assert ai_client.retry_after(api_error(openai.RateLimitError, 429, {"retry-after-ms": "1500"})) == 1.5
+        assert ai_client.retry_after(api_error(openai.RateLimitError, 429, {"retry-after": "3600"})) == ai_client.MAX_RETRY_AFTER
+        assert ai_client.retry_after(api_error(openai.RateLimitError, 429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+        assert ai_client.retry_after(api_error(openai.InternalServerError, 500)) is None
+
+    def test_backoff_grows_with_jitter(self):
+        """Opóźnienie rośnie wykładniczo, z losowym rozrzutem w górnej połowie"""
+        for attempt in range(4):
+            expected = ai_client.BACKOFF_BASE * 2 ** attempt
+            delays = {ai_client.backoff_delay(attempt) for _ in range(20)}
+            assert all(expected / 2 <= delay <= expected for delay in delays)
+            assert len(delays) > 1
+        assert ai_client.backoff_delay(50) <= ai_client.BACKOFF_MAX
+
+    def test_permanent_error_not_retried(self):
+        """Błąd trwały (401) zgłaszany od razu jako AnalysisError"""
+        request = Mock(side_effect=api_error(openai.AuthenticationError, 401))
+
+        with pytest.raises(ai_client.AnalysisError, match="Błąd analizy") as error:
+            ai_client.call_with_retry(request, 100, max_retries=3, sleep=Mock())
+
+        assert request.call_count == 1
+        assert error.value.retryable is False
+
+    def test_retries_exhausted(self):
+        """Po wyczerpaniu prób błąd przejściowy zgłaszany jest jako AnalysisError"""
+        sleep = Mock()
+        request = Mock(side_effect=api_error(openai.InternalServerError, 503))
+
+        with pytest.raises(ai_client.AnalysisError) as error:
+            ai_client.call_with_retry(request, 100, max_retries=2, sleep=sleep)
+
+        assert request.call_count == 3
+        assert sleep.call_count == 2
+        assert error.value.retryable is True
+
+    def test_async_retry(self):
+        """Asynchroniczne ponowienie po zerwanym połączeniu"""
+        answers = iter([openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com")), "odpowiedź"])
+
+        async def request():
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        with patch.object(ai_client, "backoff_delay", return_value=0):
+            assert asyncio.run(ai_client.acall_with_retry(request, 100, max_retries=1)) == "odpowiedź"
+
+
+class TestRateLimiter:
+    """Testy limitera RPM/TPM"""
+
+    def test_requests_per_minute(self):
+        """Zapytania ponad limit RPM czekają na uzupełnienie wiadra"""
+        clock = FakeClock()
+        limiter = ai_client.RateLimiter(60, 0, clock)
+
+        waits = [limiter.reserve(1) for _ in range(62)]
+
+        assert waits[:60] == [0.0] * 60
+        assert waits[60] == pytest.approx(1.0)
+        assert waits[61] == pytest.approx(2.0)
+
+    def test_tokens_per_minute_and_settle(self):
+        """Limit TPM liczony z szacunku, korygowany faktycznym zużyciem"""
+        clock = FakeClock()
+        limiter = ai_client.RateLimiter(0, 6000, clock)
+
+        assert limiter.reserve(6000) == 0.0
+        assert limiter.reserve(1000) == pytest.approx(10.0)
+        limiter.settle(6000, 1000)
+        assert limiter.reserve(1000) == 0.0
+
+    def test_pause_shared_by_all_callers(self):
+        """Retry-After wstrzymuje wszystkie zapytania, nie tylko to, które dostało 429"""
+        clock = FakeClock()
+        limiter = ai_client.RateLimiter(0, 0, clock)
+
+        limiter.pause(5)
+        clock.now = 2
+
+        assert limiter.reserve(1) == pytest.approx(3.0)
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    def test_analysis_never_returns_error_text(self, mock_openai):
+        """analyze_with_ai ponawia 429 i zwraca prawdziwą analizę"""
+        from smartflowai.ai import analyze_with_ai
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Analiza"
+        mock_openai.chat.completions.create.side_effect = [
+            api_error(openai.RateLimitError, 429, {"retry-after-ms": "1"}), mock_response
+        ]
+
+        assert analyze_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu") == "Analiza"
+        assert mock_openai.chat.completions.create.call_count == 2
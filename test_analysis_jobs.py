@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+# Plik: test_analysis_jobs.py
+# test_analysis_jobs.py - Testy kolejki analiz w tle
+
+"""
+Testy dla analysis_jobs.py - zgłoszenie, atomowe przejęcie zadania,
+zapis wyniku lub błędu oraz ograniczenie liczby równoległych analiz.
+Baza zastąpiona prostą tabelą w pamięci z tym samym API zapytań.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import analysis_jobs
+from ai_client import AnalysisError
+from analysis_output import AnalysisResult
+from analysis_jobs import AnalysisWorker, enqueue_analysis, claim_job, run_job, requeue_stale_jobs
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440001"
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Zapytanie do tabeli w pamięci (select/insert/update z filtrami)"""
+
+    def __init__(self, rows, ids):
+        self.rows = rows
+        self.ids = ids
+        self.filters = []
+        self.operation = "select"
+        self.payload = None
+        self.row_limit = None
+
+    def select(self, columns="*"):
+        return self
+
+    def insert(self, payload):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) < value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def execute(self):
+        if self.operation == "insert":
+            row = dict(self.payload, id=next(self.ids))
+            self.rows.append(row)
+            return FakeResponse([row])
+        matched = [row for row in self.rows if all(f(row) for f in self.filters)]
+        if self.operation == "update":
+            for row in matched:
+                row.update(self.payload)
+        return FakeResponse(matched[:self.row_limit] if self.row_limit else matched)
+
+
+class FakeClient:
+    def __init__(self):
+        self.rows = []
+        self.ids = itertools.count(1)
+
+    def table(self, name):
+        return FakeQuery(self.rows, self.ids)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestQueue:
+    """Testy zgłaszania i przejmowania zadań"""
+
+    def test_enqueue_creates_pending_row(self):
+        """Zgłoszenie zapisuje proces bez analizy, z parametrami analizy"""
+        client = FakeClient()
+        job_id = enqueue_analysis(client, USER_ID, "Faktury", "Opis procesu fakturowania", "Ekspercka (pełna analiza)",
+                                  "1-10 osób", "Księgowość", "do 500 zł/mies")
+
+        row = client.rows[0]
+        assert job_id == row['id']
+        assert row['analysis_status'] == analysis_jobs.STATUS_PENDING
+        assert 'ai_analysis' not in row
+        assert row['analysis_params']['industry'] == "Księgowość"
+        assert row['industry'] == "Księgowość"
+
+    def test_claim_is_exclusive(self):
+        """Tylko pierwszy worker przejmuje zadanie"""
+        client = FakeClient()
+        enqueue_analysis(client, USER_ID, "Faktury", "Opis", "Podstawowa (szybka)")
+        job = analysis_jobs.fetch_pending(client, 10)[0]
+
+        assert claim_job(client, job) is True
+        assert claim_job(client, job) is False
+        assert client.rows[0]['analysis_status'] == analysis_jobs.STATUS_RUNNING
+        assert client.rows[0]['analysis_attempts'] == 1
+
+    def test_stale_job_requeued(self):
+        """Zadanie porzucone przez worker wraca do kolejki"""
+        client = FakeClient()
+        enqueue_analysis(client, USER_ID, "Faktury", "Opis", "Podstawowa (szybka)")
+        client.rows[0].update(analysis_status=analysis_jobs.STATUS_RUNNING,
+                              analysis_started_at="2020-01-01T00:00:00+00:00", analysis_attempts=1)
+
+        requeue_stale_jobs(client)
+
+        assert client.rows[0]['analysis_status'] == analysis_jobs.STATUS_PENDING
+
+
+class TestRunJob:
+    """Testy wykonania zadania"""
+
+    def _claimed_job(self, client):
+        enqueue_analysis(client, USER_ID, "Faktury", "Opis procesu", "Ekspercka (pełna analiza)", "1-10 osób", "IT", "")
+        job = analysis_jobs.fetch_pending(client, 1)[0]
+        claim_job(client, job)
+        return job
+
+    def test_success_writes_analysis(self):
+        """Wynik analizy zapisywany jest ze statusem 'completed'"""
+        client = FakeClient()
+        job = self._claimed_job(client)
+        calls = []
+
+        def analyze(*args):
+            calls.append(args)
+            return "Analiza procesu"
+
+        assert run_job(client, job, analyze) is True
+        assert calls == [("Faktury", "Opis procesu", "Ekspercka (pełna analiza)", "1-10 osób", "IT", "")]
+        assert client.rows[0]['ai_analysis'] == "Analiza procesu"
+        assert client.rows[0]['analysis_status'] == analysis_jobs.STATUS_COMPLETED
+
+    def test_metrics_saved_with_analysis(self):
+        """Metryki z ustrukturyzowanej odpowiedzi zapisywane są w kolumnach procesu"""
+        client = FakeClient()
+        job = self._claimed_job(client)
+
+        run_job(client, job, lambda *args: AnalysisResult("Analiza", {"automation_potential": 80, "time_savings_hours": 6.5}))
+
+        assert client.rows[0]['ai_analysis'] == "Analiza"
+        assert type(client.rows[0]['ai_analysis']) is str
+        assert client.rows[0]['automation_potential'] == 80
+        assert client.rows[0]['time_savings_hours'] == 6.5
+
+    def test_error_not_saved_as_analysis(self):
+        """Tekst błędu nie trafia do ai_analysis"""
+        client = FakeClient()
+        job = self._claimed_job(client)
+
+        def analyze(*args):
+            raise AnalysisError("Błąd analizy: Rate limit")
+
+        assert run_job(client, job, analyze) is False
+        assert 'ai_analysis' not in client.rows[0]
+        assert client.rows[0]['analysis_status'] == analysis_jobs.STATUS_FAILED
+        assert "Rate limit" in client.rows[0]['analysis_error']
+
+    def test_result_not_written_after_status_change(self):
+        """Zadanie zmienione w trakcie analizy (np. ponownie zakolejkowane) nie jest nadpisywane"""
+        client = FakeClient()
+        job = self._claimed_job(client)
+        client.rows[0]['analysis_status'] = analysis_jobs.STATUS_PENDING
+
+        run_job(client, job, lambda *args: "Spóźniona analiza")
+
+        assert 'ai_analysis' not in client.rows[0]
+
+
+class TestWorker:
+    """Testy puli workera"""
+
+    def test_concurrency_bounded_by_workers(self):
+        """Worker uruchamia najwyżej tyle analiz, ile ma wątków"""
+        client = FakeClient()
+        for i in range(5):
+            enqueue_analysis(client, USER_ID, f"Proces {i}", "Opis procesu", "Podstawowa (szybka)")
+        release = threading.Event()
+        worker = AnalysisWorker(client, lambda *args: release.wait(5) and "Analiza", workers=2)
+
+        try:
+            assert worker.poll_once() == 2
+            assert worker.poll_once() == 0
+            assert sum(row['analysis_status'] == analysis_jobs.STATUS_RUNNING for row in client.rows) == 2
+            release.set()
+            # Kolejne cykle przejmują pozostałe zadania w miarę zwalniania wątków
+            assert wait_for(lambda: worker.poll_once() >= 0 and all(
+                row['analysis_status'] == analysis_jobs.STATUS_COMPLETED for row in client.rows))
+        finally:
+            release.set()
+            worker.stop()
+
+    def test_background_thread_processes_queue(self):
+        """Worker w tle wykonuje zadania dodane po starcie (notify)"""
+        client = FakeClient()
+        worker = AnalysisWorker(client, lambda *args: "Analiza", workers=2, poll_interval=5).start()
+
+        try:
+            enqueue_analysis(client, USER_ID, "Faktury", "Opis procesu", "Podstawowa (szybka)")
+            worker.notify()
+            assert wait_for(lambda: client.rows[0]['analysis_status'] == analysis_jobs.STATUS_COMPLETED)
+        finally:
+            worker.stop()
+
+    def test_first_poll_picks_up_jobs_after_restart(self):
+        """Nowy worker od razu podejmuje zadania 'pending' i porzucone 'running' sprzed restartu"""
+        client = FakeClient()
+        for title in ("Oczekujący", "Porzucony"):
+            enqueue_analysis(client, USER_ID, title, "Opis procesu", "Podstawowa (szybka)")
+        client.rows[1].update(analysis_status=analysis_jobs.STATUS_RUNNING,
+                              analysis_started_at="2020-01-01T00:00:00+00:00", analysis_attempts=1)
+        worker = AnalysisWorker(client, lambda *args: "Analiza", workers=2)
+
+        try:
+            assert worker.poll_once() == 2
+            assert wait_for(lambda: all(row['analysis_status'] == analysis_jobs.STATUS_COMPLETED for row in client.rows))
+        finally:
+            worker.stop()
+
+    def test_heartbeat_keeps_long_analysis_running(self):
+        """Analiza dłuższa niż STALE_JOB_SECONDS nie wraca do kolejki - worker odświeża analysis_started_at"""
+        client = FakeClient()
+        enqueue_analysis(client, USER_ID, "Faktury", "Opis procesu", "Ekspercka (pełna analiza)")
+        release = threading.Event()
+        worker = AnalysisWorker(client, lambda *args: release.wait(5) and "Analiza", workers=1)
+
+        try:
+            assert worker.poll_once() == 1
+            client.rows[0]['analysis_started_at'] = "2020-01-01T00:00:00+00:00"
+            with patch.object(analysis_jobs, "HEARTBEAT_SECONDS", 0):
+                worker.poll_once()
+
+            assert client.rows[0]['analysis_status'] == analysis_jobs.STATUS_RUNNING
+            assert client.rows[0]['analysis_started_at'] > "2020-01-01T00:00:00+00:00"
+            assert client.rows[0]['analysis_attempts'] == 1
+        finally:
+            release.set()
+            worker.stop()
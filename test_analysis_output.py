@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Plik: test_analysis_output.py
+# test_analysis_output.py - Testy ustrukturyzowanej odpowiedzi analizy AI
+
+"""
+Testy dla analysis_output.py - walidacja metryk z odpowiedzi JSON,
+zgodność ze starymi odpowiedziami tekstowymi i przyrostowe wyciąganie
+tekstu analizy ze strumienia.
+"""
+
+import json
+import os
+import random
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analysis_output import AnalysisResult, AnalysisStreamExtractor, RESPONSE_FORMAT, parse_analysis
+
+RESPONSE = {
+    "analysis": "🔍 **ANALIZA:** Proces \"fakturowania\"\n⚡ **PIERWSZE KROKI:** 1. Zapier\t2. Test 😀",
+    "automation_potential": 85,
+    "time_savings_hours": 12.5,
+    "cost_savings_annual": 24000,
+    "implementation_difficulty": "Średnia",
+    "recommended_tools": ["Zapier", "Airtable"],
+    "next_steps": ["Załóż konto Zapier", "Skonfiguruj workflow"]
+}
+
+
+def split_randomly(text, seed):
+    """Dzieli tekst na losowe fragmenty (jak delty strumienia)"""
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(text)), min(30, len(text) - 1)))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+class TestParseAnalysis:
+    """Testy walidacji odpowiedzi"""
+
+    def test_metrics_extracted(self):
+        """Analiza i metryki w formacie kolumn business_processes"""
+        result = parse_analysis(json.dumps(RESPONSE))
+
+        assert isinstance(result, str)
+        assert result == RESPONSE["analysis"]
+        assert result.metrics == {
+            "automation_potential": 85,
+            "time_savings_hours": 12.5,
+            "cost_savings_annual": 24000.0,
+            "implementation_difficulty": "Średnia",
+            "recommended_tools": "Zapier, Airtable",
+            "next_steps": "Załóż konto Zapier\nSkonfiguruj workflow"
+        }
+
+    def test_values_clamped_and_invalid_skipped(self):
+        """Wartości spoza zakresu kolumn przycinane, złe typy pomijane"""
+        response = dict(RESPONSE, automation_potential=140, time_savings_hours=-3,
+                        cost_savings_annual="dużo", recommended_tools=[])
+
+        metrics = parse_analysis(json.dumps(response)).metrics
+
+        assert metrics["automation_potential"] == 100
+        assert metrics["time_savings_hours"] == 0
+        assert "cost_savings_annual" not in metrics
+        assert "recommended_tools" not in metrics
+
+    def test_plain_text_is_analysis_without_metrics(self):
+        """Odpowiedź tekstowa (np. stary wpis cache) to sama analiza"""
+        result = parse_analysis("🔍 **ANALIZA:** Tekst")
+
+        assert result == "🔍 **ANALIZA:** Tekst"
+        assert result.metrics == {}
+
+    def test_truncated_json_keeps_analysis_text(self):
+        """Odpowiedź ucięta przez max_tokens - zachowany tekst analizy"""
+        result = parse_analysis('{"analysis": "Początek analizy\\nciąg dalszy')
+
+        assert result == "Początek analizy\nciąg dalszy"
+        assert result.metrics == {}
+
+    def test_missing_content(self):
+        """Brak treści (np. odmowa modelu) daje pustą analizę"""
+        assert parse_analysis(None) == ""
+        assert isinstance(parse_analysis(None), AnalysisResult)
+
+    def test_schema_is_strict(self):
+        """Schemat wymaga wszystkich pól, analiza jest pierwsza"""
+        schema = RESPONSE_FORMAT["json_schema"]["schema"]
+
+        assert RESPONSE_FORMAT["json_schema"]["strict"] is True
+        assert list(schema["properties"])[0] == "analysis"
+        assert set(schema["required"]) == set(schema["properties"])
+
+
+class TestStreamExtractor:
+    """Testy przyrostowego wyciągania tekstu analizy"""
+
+    def test_any_split_gives_full_text(self):
+        """Niezależnie od podziału na fragmenty (także w środku sekwencji \\uXXXX)"""
+        for ensure_ascii in (True, False):
+            raw = json.dumps(RESPONSE, ensure_ascii=ensure_ascii)
+            for seed in range(50):
+                extractor = AnalysisStreamExtractor()
+                text = "".join(extractor.feed(part) for part in split_randomly(raw, seed))
+                assert text == RESPONSE["analysis"]
+                assert extractor.done
+
+    def test_plain_text_passthrough(self):
+        """Odpowiedź, która nie jest JSON-em, przekazywana jest bez zmian"""
+        extractor = AnalysisStreamExtractor()
+
+        assert [extractor.feed(part) for part in ["  ", "🔍 **ANALIZA:** ", "tekst"]] == ["", "  🔍 **ANALIZA:** ", "tekst"]
+
+
+class TestStructuredAnalysis:
+    """Testy analizy AI z odpowiedzią JSON"""
+
+    @staticmethod
+    def _chunk(text):
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = text
+        return chunk
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    def test_analyze_requests_schema_and_returns_metrics(self, mock_openai):
+        """analyze_with_ai prosi o JSON schema i zwraca tekst analizy z metrykami"""
+        from smartflowai.ai import analyze_with_ai
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(RESPONSE)
+        mock_openai.chat.completions.create.return_value = mock_response
+
+        result = analyze_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu")
+
+        assert mock_openai.chat.completions.create.call_args[1]['response_format'] == RESPONSE_FORMAT
+        assert result == RESPONSE["analysis"]
+        assert result.metrics["automation_potential"] == 85
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    def test_stream_shows_only_analysis_text(self, mock_openai):
+        """Strumień wyświetla tekst analizy, metryki trafiają do słownika po zakończeniu"""
+        from smartflowai.ai import stream_analysis_with_ai
+        mock_openai.chat.completions.create.return_value = iter(
+            self._chunk(part) for part in split_randomly(json.dumps(RESPONSE), 1)
+        )
+        metrics = {}
+
+        text = "".join(stream_analysis_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu", metrics=metrics))
+
+        assert text == RESPONSE["analysis"]
+        assert metrics["implementation_difficulty"] == "Średnia"
+        assert metrics["recommended_tools"] == "Zapier, Airtable"
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Plik: test_batch_analysis.py
+# test_batch_analysis.py - Testy wsadowej analizy procesów
+
+import pytest
+import asyncio
+import os
+import sys
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+# Setup path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import batch_analysis
+from batch_analysis import parse_batch_file, run_batch, run_batch_async
+from ai_client import AnalysisError
+
+
+class TestParseBatchFile:
+    """Testy wczytywania plików wsadowych"""
+
+    def test_parse_csv_with_semicolon(self):
+        """CSV ze średnikiem (polski Excel) z BOM"""
+        data = ("﻿title;description;industry\n"
+                "Faktury;Ręczne wystawianie faktur w Excelu co miesiąc;Księgowość\n").encode("utf-8")
+
+        rows, errors = parse_batch_file(data, "procesy.csv")
+
+        assert errors == []
+        assert rows == [{"row": 1, "title": "Faktury",
+                         "description": "Ręczne wystawianie faktur w Excelu co miesiąc",
+                         "industry": "Księgowość"}]
+
+    def test_parse_json_with_invalid_rows(self):
+        """JSON - błędne wiersze są raportowane i pomijane"""
+        data = json.dumps({"processes": [
+            {"title": "Faktury", "description": "Ręczne wystawianie faktur w Excelu"},
+            {"title": "", "description": "Brak nazwy procesu w tym wierszu"},
+            {"title": "Krótki", "description": "za krótki"},
+        ]})
+
+        rows, errors = parse_batch_file(data, "procesy.json")
+
+        assert [r["title"] for r in rows] == ["Faktury"]
+        assert len(errors) == 2
+        assert errors[0].startswith("Wiersz 2")
+
+
+class TestRunBatch:
+    """Testy równoległej analizy wsadowej"""
+
+    def _rows(self, count):
+        return [{"row": i, "title": f"Proces {i}", "description": "Opis procesu do analizy AI"}
+                for i in range(1, count + 1)]
+
+    def test_concurrency_is_bounded(self):
+        """Liczba jednoczesnych analiz nie przekracza limitu"""
+        lock = threading.Lock()
+        state = {"active": 0, "max": 0}
+
+        def analyze(*args):
+            with lock:
+                state["active"] += 1
+                state["max"] = max(state["max"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return "Analiza"
+
+        results = run_batch(self._rows(12), analyze, concurrency=3)
+
+        assert len(results) == 12
+        assert state["max"] <= 3
+        assert [r["row"] for r in results] == list(range(1, 13))
+
+    def test_retries_failed_rows(self):
+        """Wiersz z błędem przejściowym jest ponawiany, pusta odpowiedź nie jest traktowana jak analiza"""
+        analyze = Mock(side_effect=[AnalysisError("Błąd analizy: 429", retryable=True), "", "Analiza OK"])
+
+        results = run_batch(self._rows(1), analyze, retries=2, retry_delay=0)
+
+        assert results[0]["ai_analysis"] == "Analiza OK"
+        assert results[0]["attempts"] == 3
+
+    def test_progress_and_failures(self):
+        """Postęp raportowany dla każdego wiersza, wyczerpane ponowienia dają błąd"""
+        progress = []
+        analyze = Mock(side_effect=Exception("API Error"))
+
+        results = run_batch(self._rows(2), analyze, retries=1, retry_delay=0,
+                            progress_callback=lambda done, total, r: progress.append((done, total)))
+
+        assert progress == [(1, 2), (2, 2)]
+        assert all(r["ai_analysis"] is None for r in results)
+        assert "API Error" in results[0]["error"]
+        assert analyze.call_count == 4
+
+    def test_permanent_error_not_retried(self):
+        """Błąd trwały (np. nieprawidłowy klucz API) kończy wiersz bez ponowień"""
+        analyze = Mock(side_effect=AnalysisError("Błąd analizy: Invalid API key", retryable=False))
+
+        results = run_batch(self._rows(1), analyze, retries=2, retry_delay=0)
+
+        assert results[0]["ai_analysis"] is None
+        assert results[0]["attempts"] == 1
+        assert "Invalid API key" in results[0]["error"]
+
+    def test_default_depth_and_row_context(self):
+        """Wiersz może nadpisać domyślną głębokość analizy"""
+        analyze = Mock(return_value="Analiza")
+        rows = self._rows(1)
+        rows[0].update({"analysis_depth": "Ekspercka (pełna analiza)", "industry": "Logistyka"})
+
+        run_batch(rows, analyze, default_depth="Podstawowa (szybka)")
+
+        analyze.assert_called_once_with("Proces 1", "Opis procesu do analizy AI",
+                                        "Ekspercka (pełna analiza)", "", "Logistyka", "")
+
+
+class TestRunBatchAsync:
+    """Testy analizy wsadowej w pętli zdarzeń (CLI)"""
+
+    def _rows(self, count):
+        return [{"row": i, "title": f"Proces {i}", "description": "Opis procesu do analizy AI"}
+                for i in range(1, count + 1)]
+
+    def test_concurrency_is_bounded(self):
+        """Liczba jednoczesnych korutyn analizy nie przekracza limitu"""
+        state = {"active": 0, "max": 0}
+
+        async def analyze(*args):
+            state["active"] += 1
+            state["max"] = max(state["max"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return "Analiza"
+
+        results = asyncio.run(run_batch_async(self._rows(10), analyze, concurrency=3))
+
+        assert state["max"] == 3
+        assert [r["row"] for r in results] == list(range(1, 11))
+        assert all(r["ai_analysis"] == "Analiza" for r in results)
+
+    def test_retries_and_progress(self):
+        """Błąd przejściowy jest ponawiany, postęp raportowany dla każdego wiersza"""
+        answers = iter([AnalysisError("Błąd analizy: 429", retryable=True), "Analiza OK"])
+        progress = []
+
+        async def analyze(*args):
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        results = asyncio.run(run_batch_async(self._rows(1), analyze, retries=1, retry_delay=0,
+                                              progress_callback=lambda done, total, r: progress.append((done, total))))
+
+        assert results[0]["ai_analysis"] == "Analiza OK"
+        assert results[0]["attempts"] == 2
+        assert progress == [(1, 1)]
+
+
+class TestBulkSave:
+    """Test zbiorczego zapisu wyników"""
+
+    @patch('smartflowai.storage.supabase')
+    def test_single_bulk_insert(self, mock_supabase):
+        """Wszystkie procesy zapisywane są jednym insertem"""
+        from smartflowai.storage import save_processes_bulk
+
+        processes = [{"title": f"Proces {i}", "description": "Opis", "ai_analysis": "Analiza"} for i in range(3)]
+
+        saved = save_processes_bulk(processes, user_email="test@smartflowai.com")
+
+        assert saved == 3
+        mock_supabase.table.assert_called_once_with('business_processes')
+        inserted = mock_supabase.table.return_value.insert.call_args[0][0]
+        assert len(inserted) == 3
+        assert all(row['user_id'] == "550e8400-e29b-41d4-a716-446655440001" for row in inserted)
+
+    @patch('smartflowai.storage.supabase')
+    def test_depth_and_industry_saved(self, mock_supabase):
+        """Głębokość analizy i branża z pliku trafiają do kolumn (dla statystyk dashboardu)"""
+        from smartflowai.storage import save_processes_bulk
+        rows = [{"row": 1, "title": "Faktury", "description": "Opis", "industry": "Księgowość"},
+                {"row": 2, "title": "Rekrutacja", "description": "Opis", "analysis_depth": "Podstawowa (szybka)"}]
+
+        results = run_batch(rows, lambda *args: "Analiza", retry_delay=0)
+        save_processes_bulk(results, user_email="test@smartflowai.com")
+
+        first, second = mock_supabase.table.return_value.insert.call_args[0][0]
+        assert first['industry'] == "Księgowość"
+        assert first['analysis_depth'] == batch_analysis.DEFAULT_ANALYSIS_DEPTH
+        assert second['analysis_depth'] == "Podstawowa (szybka)"
+        assert 'industry' not in second
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
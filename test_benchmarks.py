@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Plik: test_benchmarks.py
+# test_benchmarks.py - Testy fałszywego serwera OpenAI i porównania wyników benchmarków
+
+"""
+Testy zestawu benchmarków: fake_openai.py odpowiada w formacie zgodnym z SDK
+openai (zwykła odpowiedź, strumień SSE z usage, 429), a porównanie wyników
+JSON wykrywa regresje zgodnie z kierunkiem metryki.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import analysis_output
+from fake_openai import FakeOpenAIServer, LatencyProfile
+from harness import compare_results, metric
+
+openai = pytest.importorskip("openai")
+
+
+@pytest.fixture
+def server():
+    with FakeOpenAIServer(LatencyProfile(time_scale=0), seed=1) as server:
+        yield server
+
+
+def client_for(server):
+    return openai.OpenAI(api_key="sk-bench", base_url=server.base_url, max_retries=0)
+
+
+class TestFakeOpenAI:
+    """Testy lokalnego serwera chat.completions"""
+
+    def test_completion_matches_analysis_format(self, server):
+        """Odpowiedź JSON z analizą i metrykami, usage w granicach max_tokens"""
+        response = client_for(server).chat.completions.create(
+            model="gpt-4o", messages=[{"role": "user", "content": "Fakturowanie"}], max_tokens=1000)
+
+        result = analysis_output.parse_analysis(response.choices[0].message.content)
+
+        assert "ANALIZA" in result
+        assert result.metrics["automation_potential"] == 70
+        assert 0 < response.usage.completion_tokens <= 1000
+        assert server.stats()["requests"] == 1
+
+    def test_stream_with_usage(self, server):
+        """Strumień SSE składa się w tę samą treść JSON, ostatni fragment zawiera usage"""
+        chunks = list(client_for(server).chat.completions.create(
+            model="gpt-4o", messages=[{"role": "user", "content": "Fakturowanie"}], max_tokens=500,
+            stream=True, stream_options={"include_usage": True}))
+
+        content = "".join(chunk.choices[0].delta.content or "" for chunk in chunks if chunk.choices)
+
+        assert json.loads(content)["implementation_difficulty"] == "Średnia"
+        assert chunks[-1].choices == [] and chunks[-1].usage.completion_tokens > 0
+
+    def test_rate_limit(self):
+        """rate_limit_ratio=1 - każde zapytanie kończy się 429"""
+        with FakeOpenAIServer(LatencyProfile(time_scale=0, rate_limit_ratio=1.0)) as server:
+            with pytest.raises(openai.RateLimitError):
+                client_for(server).chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "x"}])
+
+        assert server.stats()["rate_limited"] == 1
+
+
+class TestCompareResults:
+    """Testy porównania wyników z bazowymi"""
+
+    def test_regression_respects_direction(self):
+        """Czas dłuższy i przepustowość niższa to regresja; wartości informacyjne pomijane"""
+        baseline = {"suites": {"export": [
+            metric("pdf_export", 100.0, "ms", processes=100),
+            metric("pdf_processes_per_second", 1000.0, "1/s", lower_is_better=False, processes=100),
+            metric("server_requests", 10, "", lower_is_better=None),
+        ]}}
+        current = {"suites": {"export": [
+            metric("pdf_export", 110.0, "ms", processes=100),
+            metric("pdf_processes_per_second", 500.0, "1/s", lower_is_better=False, processes=100),
+            metric("server_requests", 50, "", lower_is_better=None),
+            metric("txt_export", 5.0, "ms", processes=100),
+        ]}}
+
+        rows = {key: (worse, regression) for key, _, _, worse, regression in compare_results(baseline, current, 0.2)}
+
+        assert rows["export/pdf_export[processes=100]"] == (pytest.approx(0.1), False)
+        assert rows["export/pdf_processes_per_second[processes=100]"] == (pytest.approx(0.5), True)
+        assert len(rows) == 2
@@ -25,10 +25,15 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import funkcji z głównej aplikacji
 try:
-    from streamlit_app import (
-        analyze_with_ai, save_process, get_processes, 
-        delete_process, update_process, initialize_database
+    from smartflowai.ai import analyze_with_ai, stream_analysis_with_ai
+    from smartflowai.storage import (
+        save_process, get_processes, 
+        delete_process, update_process, initialize_database,
+        get_current_user_id, set_logged_in_user,
+        get_processes_page, get_process_details, search_processes,
+        iter_processes_for_report, get_process_stats
     )
+    from ai_client import AnalysisError
 except ImportError as e:
     print(f"❌ Błąd importu: {e}")
     sys.exit(1)
@@ -67,7 +72,7 @@ class TestAnalyzeAI:
         os.environ['SUPABASE_URL'] = 'https://test.supabase.co'
         os.environ['SUPABASE_ANON_KEY'] = 'test-anon-key-12345'
     
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.ai.openai_client')
     def test_analyze_basic_success(self, mock_openai):
         """Test podstawowej analizy AI - sukces"""
         # Mock odpowiedzi OpenAI
@@ -93,7 +98,7 @@ class TestAnalyzeAI:
         assert "⚡ **PIERWSZE KROKI:**" in result
         mock_openai.chat.completions.create.assert_called_once()
     
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.ai.openai_client')
     def test_analyze_with_context(self, mock_openai):
         """Test analizy z kontekstem firmy"""
         mock_response = Mock()
@@ -119,7 +124,7 @@ class TestAnalyzeAI:
         assert "IT/Software" in prompt
         assert "500-2000 zł/mies" in prompt
     
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.ai.openai_client')
     def test_analyze_different_depths(self, mock_openai):
         """Test różnych głębokości analizy"""
         mock_response = Mock()
@@ -133,17 +138,72 @@ class TestAnalyzeAI:
             result = analyze_with_ai("Test", "Description", analysis_depth=depth)
             assert result == "Test response"
     
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.ai.openai_client')
     def test_analyze_error_handling(self, mock_openai):
         """Test obsługi błędów analizy AI"""
         # Mock błędu
         mock_openai.chat.completions.create.side_effect = Exception("API Error")
         
-        # Test
-        result = analyze_with_ai("Test", "Description")
+        # Test - błąd nie może zostać zwrócony (i zapisany) jako analiza
+        with pytest.raises(AnalysisError, match="API Error"):
+            analyze_with_ai("Test", "Description")
+
+@pytest.mark.usefixtures("live_ai_mode")
+class TestStreamingAnalysis:
+    """Testy strumieniowej analizy AI"""
+    
+    @staticmethod
+    def _chunk(text):
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = text
+        return chunk
+    
+    @patch('smartflowai.ai.openai_client')
+    def test_stream_yields_deltas(self, mock_openai):
+        """Test przekazywania kolejnych fragmentów odpowiedzi"""
+        mock_openai.chat.completions.create.return_value = iter([
+            self._chunk("🔍 **ANALIZA:** "), self._chunk(None), self._chunk("Proces do automatyzacji")
+        ])
+        
+        chunks = list(stream_analysis_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu"))
+        
+        assert chunks == ["🔍 **ANALIZA:** ", "Proces do automatyzacji"]
+        call_kwargs = mock_openai.chat.completions.create.call_args[1]
+        assert call_kwargs['stream'] is True
+        assert "Faktury" in call_kwargs['messages'][0]['content']
+    
+    @patch('smartflowai.ai.openai_client')
+    def test_stream_same_prompt_as_blocking(self, mock_openai):
+        """Tryb strumieniowy używa tego samego promptu i parametrów co analyze_with_ai"""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Analiza"
+        mock_openai.chat.completions.create.return_value = mock_response
+        analyze_with_ai("Test", "Description", "Ekspercka (pełna analiza)", "1-10 osób", "Logistyka", "do 500 zł/mies")
+        blocking_kwargs = mock_openai.chat.completions.create.call_args[1]
         
-        # Sprawdzenie
-        assert "Błąd analizy" in result or "Error" in result
+        mock_openai.chat.completions.create.return_value = iter([self._chunk("Analiza")])
+        list(stream_analysis_with_ai("Test", "Description", "Ekspercka (pełna analiza)", "1-10 osób", "Logistyka", "do 500 zł/mies"))
+        stream_kwargs = mock_openai.chat.completions.create.call_args[1]
+        
+        stream_kwargs.pop('stream')
+        stream_kwargs.pop('stream_options')
+        assert stream_kwargs == blocking_kwargs
+    
+    @patch('smartflowai.ai.openai_client')
+    def test_stream_error_handling(self, mock_openai):
+        """Test obsługi błędu w trakcie strumienia"""
+        def broken_stream():
+            yield self._chunk("Początek analizy")
+            raise Exception("Connection reset")
+        mock_openai.chat.completions.create.return_value = broken_stream()
+        
+        stream = stream_analysis_with_ai("Test", "Description")
+        
+        assert next(stream) == "Początek analizy"
+        with pytest.raises(AnalysisError, match="Błąd analizy: Connection reset"):
+            next(stream)
 
 class TestDatabaseOperations:
     """Unit testy operacji bazodanowych"""
@@ -153,8 +213,8 @@ class TestDatabaseOperations:
         os.environ['SUPABASE_URL'] = 'https://test.supabase.co'
         os.environ['SUPABASE_ANON_KEY'] = 'test-anon-key'
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_save_process_success(self, mock_st, mock_supabase):
         """Test zapisu procesu - sukces"""
         # Mock session state
@@ -179,8 +239,8 @@ class TestDatabaseOperations:
         assert insert_call['description'] == "Test description"
         assert insert_call['ai_analysis'] == "Test analysis"
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_save_process_error(self, mock_st, mock_supabase):
         """Test zapisu procesu - błąd"""
         mock_st.session_state.user = "test@smartflowai.com"
@@ -189,8 +249,8 @@ class TestDatabaseOperations:
         result = save_process("Test", "Description", "Analysis")
         assert result == False
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_get_processes_success(self, mock_st, mock_supabase):
         """Test pobierania procesów - sukces"""
         mock_st.session_state.user = "test@smartflowai.com"
@@ -230,8 +290,8 @@ class TestDatabaseOperations:
         # Sprawdź wywołania Supabase
         mock_supabase.table.assert_called_with('processes')
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_get_processes_error(self, mock_st, mock_supabase):
         """Test pobierania procesów - błąd"""
         mock_st.session_state.user = "test@smartflowai.com"
@@ -240,77 +300,423 @@ class TestDatabaseOperations:
         result = get_processes()
         assert result == []
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_delete_process_success(self, mock_st, mock_supabase):
         """Test usuwania procesu - sukces"""
         mock_st.session_state.user = "test@smartflowai.com"
         
-        # Mock sprawdzenia właściciela
-        mock_check_result = Mock()
-        mock_check_result.data = [{'id': 1}]
-        
-        # Mock usuwania
+        # Mock usuwania - zwraca usunięty wiersz
         mock_delete_result = Mock()
-        
-        # Konfiguracja mocków
-        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = mock_check_result
-        mock_supabase.table.return_value.delete.return_value.eq.return_value.execute.return_value = mock_delete_result
+        mock_delete_result.data = [{'id': 1}]
+        mock_supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value.execute.return_value = mock_delete_result
         
         # Test
         result = delete_process(1)
         
-        # Sprawdzenia
+        # Sprawdzenia - jedno zapytanie filtrowane po id i user_id
         assert result == True
+        mock_supabase.table.return_value.select.assert_not_called()
+        delete_query = mock_supabase.table.return_value.delete.return_value
+        delete_query.eq.assert_called_once_with('id', 1)
+        delete_query.eq.return_value.eq.assert_called_once_with('user_id', "550e8400-e29b-41d4-a716-446655440001")
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_delete_process_unauthorized(self, mock_st, mock_supabase):
         """Test usuwania procesu - brak uprawnień"""
         mock_st.session_state.user = "test@smartflowai.com"
         
         # Mock braku uprawnień
-        mock_check_result = Mock()
-        mock_check_result.data = []  # Brak danych = brak uprawnień
-        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = mock_check_result
+        mock_delete_result = Mock()
+        mock_delete_result.data = []  # Brak usuniętych wierszy = brak uprawnień
+        mock_supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value.execute.return_value = mock_delete_result
         
         result = delete_process(1)
         assert result == False
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_update_process_success(self, mock_st, mock_supabase):
         """Test aktualizacji procesu - sukces"""
         mock_st.session_state.user = "test@smartflowai.com"
         
-        # Mock sprawdzenia właściciela
-        mock_check_result = Mock()
-        mock_check_result.data = [{'id': 1}]
-        
-        # Mock aktualizacji
+        # Mock aktualizacji - zwraca zaktualizowany wiersz
         mock_update_result = Mock()
-        
-        # Konfiguracja mocków
-        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = mock_check_result
-        mock_supabase.table.return_value.update.return_value.eq.return_value.execute.return_value = mock_update_result
+        mock_update_result.data = [{'id': 1}]
+        mock_supabase.table.return_value.update.return_value.eq.return_value.eq.return_value.execute.return_value = mock_update_result
         
         # Test
         result = update_process(1, "Updated Title", "Updated Description", "Updated Analysis")
         
-        # Sprawdzenia
+        # Sprawdzenia - bez osobnego zapytania sprawdzającego właściciela
         assert result == True
+        mock_supabase.table.return_value.select.assert_not_called()
         
         # Sprawdź dane przekazane do update
         update_call = mock_supabase.table.return_value.update.call_args[0][0]
         assert update_call['title'] == "Updated Title"
         assert update_call['description'] == "Updated Description"
         assert update_call['ai_analysis'] == "Updated Analysis"
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_update_process_unauthorized(self, mock_st, mock_supabase):
+        """Test aktualizacji cudzego procesu - brak zmienionych wierszy"""
+        mock_st.session_state.user = "test@smartflowai.com"
+        
+        mock_update_result = Mock()
+        mock_update_result.data = []
+        mock_supabase.table.return_value.update.return_value.eq.return_value.eq.return_value.execute.return_value = mock_update_result
+        
+        result = update_process(1, "Updated Title", "Updated Description", "Updated Analysis")
+        assert result == False
+
+class SessionState(dict):
+    """Minimalny odpowiednik st.session_state (dostęp przez atrybuty i klucze)"""
+    __getattr__ = dict.get
+    __setattr__ = dict.__setitem__
+
+class TestSessionIdentity:
+    """Testy ustalania user_id raz na sesję"""
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_user_id_resolved_once_per_session(self, mock_st, mock_supabase):
+        """Zapytanie do tabeli users wykonywane jest tylko raz"""
+        mock_st.session_state = SessionState(user="jan@firma.pl")
+        mock_result = Mock()
+        mock_result.data = [{'id': 'uuid-jan'}]
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_result
+        
+        ids = [get_current_user_id() for _ in range(3)]
+        
+        assert ids == ['uuid-jan'] * 3
+        mock_supabase.table.assert_called_once_with('users')
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_login_stores_user_id(self, mock_st, mock_supabase):
+        """Logowanie zapisuje user_id w sesji - bez zapytań przy operacjach CRUD"""
+        mock_st.session_state = SessionState(user=None)
+        mock_result = Mock()
+        mock_result.data = []
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_result
+        auth_user = Mock()
+        auth_user.id = 'auth-uuid'
+        
+        set_logged_in_user("nowy@firma.pl", auth_user)
+        mock_supabase.reset_mock()
+        
+        assert mock_st.session_state.user == "nowy@firma.pl"
+        assert get_current_user_id() == 'auth-uuid'
+        get_processes()
+        table_names = [c.args[0] for c in mock_supabase.table.call_args_list]
+        assert 'users' not in table_names
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_user_change_resolves_again(self, mock_st, mock_supabase):
+        """Zmiana zalogowanego użytkownika unieważnia zapamiętany user_id"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        assert get_current_user_id() == "550e8400-e29b-41d4-a716-446655440001"
+        
+        mock_st.session_state.user = "demo@smartflowai.com"
+        assert get_current_user_id() == "550e8400-e29b-41d4-a716-446655440003"
+
+class TestAdminAccess:
+    """Testy dostępu do strony wydajności"""
+    
+    @patch('smartflowai.storage.st')
+    def test_admin_emails(self, mock_st):
+        """Domyślnie tylko admin@smartflowai.com; ADMIN_EMAILS nadpisuje listę (bez rozróżniania wielkości liter)"""
+        from smartflowai.storage import is_admin_user
+        
+        with patch.dict(os.environ, {}, clear=True):
+            mock_st.session_state = SessionState(user="admin@smartflowai.com")
+            assert is_admin_user() is True
+            mock_st.session_state = SessionState(user="test@smartflowai.com")
+            assert is_admin_user() is False
+            mock_st.session_state = SessionState(user=None)
+            assert is_admin_user() is False
+        
+        with patch.dict(os.environ, {'ADMIN_EMAILS': "ops@firma.pl, Jan@Firma.pl"}):
+            mock_st.session_state = SessionState(user="jan@firma.pl")
+            assert is_admin_user() is True
+            mock_st.session_state = SessionState(user="admin@smartflowai.com")
+            assert is_admin_user() is False
+
+class TestProcessCache:
+    """Testy cache listy procesów w obrębie sesji"""
+    
+    def _mock_list(self, mock_supabase, data):
+        mock_result = Mock()
+        mock_result.data = data
+        mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.execute.return_value = mock_result
+        return mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.execute
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_processes_fetched_once_per_session(self, mock_st, mock_supabase):
+        """Kolejne zakładki korzystają z jednego pobrania listy"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        execute = self._mock_list(mock_supabase, [{'id': 1, 'title': 'Proces 1'}])
+        
+        first = get_processes()
+        second = get_processes()
+        
+        assert first == second == [{'id': 1, 'title': 'Proces 1'}]
+        assert execute.call_count == 1
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_mutations_invalidate_cache(self, mock_st, mock_supabase):
+        """save_process, update_process i delete_process unieważniają cache"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        execute = self._mock_list(mock_supabase, [])
+        changed = Mock()
+        changed.data = [{'id': 1}]
+        mock_supabase.table.return_value.update.return_value.eq.return_value.eq.return_value.execute.return_value = changed
+        mock_supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value.execute.return_value = changed
+        
+        get_processes()
+        assert save_process("Proces", "Opis procesu", "Analiza") == True
+        get_processes()
+        assert update_process(1, "Proces", "Opis procesu", "Analiza") == True
+        get_processes()
+        assert delete_process(1) == True
+        get_processes()
+        
+        assert execute.call_count == 4
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_failed_delete_keeps_cache(self, mock_st, mock_supabase):
+        """Nieudane usunięcie nie wymusza ponownego pobrania listy"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        execute = self._mock_list(mock_supabase, [])
+        not_deleted = Mock()
+        not_deleted.data = []
+        mock_supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value.execute.return_value = not_deleted
+        
+        get_processes()
+        assert delete_process(99) == False
+        get_processes()
+        
+        assert execute.call_count == 1
+
+class TestPagination:
+    """Testy stronicowania keyset i pobierania szczegółów na żądanie"""
+    
+    def _rows(self, count):
+        return [{'id': 100 - i, 'title': f'Proces {i}', 'created_at': f'2025-06-{28 - i:02d}T12:00:00+00:00'}
+                for i in range(count)]
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_first_page_projection_and_next_cursor(self, mock_st, mock_supabase):
+        """Pierwsza strona pobiera tylko kolumny listy i zwraca kursor następnej"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        mock_result = Mock()
+        mock_result.data = self._rows(3)
+        query.order.return_value.order.return_value.limit.return_value.execute.return_value = mock_result
+        
+        processes, next_cursor = get_processes_page(None, 2)
+        
+        mock_supabase.table.return_value.select.assert_called_once_with('id,title,created_at')
+        query.or_.assert_not_called()
+        query.order.return_value.order.return_value.limit.assert_called_once_with(3)
+        assert [p['id'] for p in processes] == [100, 99]
+        assert next_cursor == ('2025-06-27T12:00:00+00:00', 99)
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_next_page_uses_keyset_filter(self, mock_st, mock_supabase):
+        """Kolejna strona filtruje po (created_at, id) zamiast OFFSET"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        mock_result = Mock()
+        mock_result.data = self._rows(1)
+        query.or_.return_value.order.return_value.order.return_value.limit.return_value.execute.return_value = mock_result
+        
+        processes, next_cursor = get_processes_page(('2025-06-27T12:00:00+00:00', 99), 2)
+        
+        query.or_.assert_called_once_with(
+            'created_at.lt."2025-06-27T12:00:00+00:00",and(created_at.eq."2025-06-27T12:00:00+00:00",id.lt."99")'
+        )
+        assert len(processes) == 1
+        assert next_cursor is None
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_details_fetched_on_demand(self, mock_st, mock_supabase):
+        """Opis i analiza pobierane są dla jednego procesu, z kontrolą właściciela"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        query = mock_supabase.table.return_value.select.return_value
+        mock_result = Mock()
+        mock_result.data = [{'id': 7, 'title': 'Proces', 'description': 'Opis', 'ai_analysis': 'Analiza'}]
+        query.eq.return_value.eq.return_value.limit.return_value.execute.return_value = mock_result
+        
+        process = get_process_details(7)
+        get_process_details(7)
+        
+        assert process['ai_analysis'] == 'Analiza'
+        mock_supabase.table.return_value.select.assert_called_once_with('id,title,description,ai_analysis,created_at,analysis_status,analysis_error,automation_potential,time_savings_hours,cost_savings_annual,implementation_difficulty')
+        query.eq.assert_called_once_with('id', 7)
+        query.eq.return_value.eq.assert_called_once_with('user_id', "550e8400-e29b-41d4-a716-446655440001")
+
+class TestReportData:
+    """Testy pobierania danych do raportu PDF porcjami"""
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_report_iterates_all_chunks(self, mock_st, mock_supabase):
+        """Wszystkie procesy pobierane są kolejnymi porcjami keyset, bez cache sesji"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        first = Mock()
+        first.data = [{'id': 3, 'created_at': '2025-06-03'}, {'id': 2, 'created_at': '2025-06-02'},
+                      {'id': 1, 'created_at': '2025-06-01'}]
+        second = Mock()
+        second.data = [{'id': 1, 'created_at': '2025-06-01'}]
+        query.order.return_value.order.return_value.limit.return_value.execute.return_value = first
+        query.or_.return_value.order.return_value.order.return_value.limit.return_value.execute.return_value = second
+        
+        processes = list(iter_processes_for_report(chunk_size=2))
+        
+        assert [p['id'] for p in processes] == [3, 2, 1]
+        mock_supabase.table.return_value.select.assert_called_with('id,title,description,ai_analysis,created_at')
+        query.or_.assert_called_once_with('created_at.lt."2025-06-02",and(created_at.eq."2025-06-02",id.lt."2")')
+        assert 'process_cache' not in mock_st.session_state
+
+class TestSearch:
+    """Testy wyszukiwania pełnotekstowego po stronie serwera"""
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_search_calls_ranked_rpc(self, mock_st, mock_supabase):
+        """Wyszukiwanie wywołuje funkcję bazy z frazą, user_id i limitem"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        mock_result = Mock()
+        mock_result.data = [{'id': 3, 'title': 'Faktury', 'created_at': '2025-06-20T12:00:00+00:00', 'rank': 0.6}]
+        mock_supabase.rpc.return_value.execute.return_value = mock_result
+        
+        results = search_processes("  faktury  ")
+        search_processes("faktury")
+        
+        assert results[0]['id'] == 3
+        mock_supabase.rpc.assert_called_once_with('search_business_processes_fts', {
+            'search_term': 'faktury',
+            'user_uuid': "550e8400-e29b-41d4-a716-446655440001",
+            'result_limit': 50
+        })
+        mock_supabase.table.assert_not_called()
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_search_too_short_query(self, mock_st, mock_supabase):
+        """Zbyt krótka fraza nie odpytuje bazy"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        
+        assert search_processes(" a ") == []
+        mock_supabase.rpc.assert_not_called()
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_search_error(self, mock_st, mock_supabase):
+        """Błąd bazy zwraca pustą listę"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        mock_supabase.rpc.side_effect = Exception("function does not exist")
+        
+        assert search_processes("faktury") == []
+
+class TestDashboardStats:
+    """Testy statystyk dashboardu liczonych w bazie"""
+    
+    STATS = {
+        'total_processes': 3,
+        'avg_automation_potential': 70.0,
+        'total_time_savings': 24.5,
+        'total_cost_savings': 36000,
+        'per_month': [{'month': '2025-06', 'count': 3}],
+        'per_depth': [{'analysis_depth': 'Podstawowa (szybka)', 'count': 3}],
+        'per_industry': [{'industry': 'Księgowość', 'count': 3}]
+    }
+    
+    def _mock_stats(self, mock_supabase):
+        mock_result = Mock()
+        mock_result.data = self.STATS
+        mock_supabase.rpc.return_value.execute.return_value = mock_result
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_stats_from_rpc(self, mock_st, mock_supabase):
+        """Statystyki pochodzą z jednej funkcji bazy, bez pobierania wierszy procesów"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        self._mock_stats(mock_supabase)
+        
+        stats = get_process_stats()
+        
+        assert stats == self.STATS
+        mock_supabase.rpc.assert_called_once_with('get_process_stats', {
+            'user_uuid': "550e8400-e29b-41d4-a716-446655440001",
+            'month_limit': 12,
+            'industry_limit': 10
+        })
+        mock_supabase.table.assert_not_called()
+    
+    @patch('process_repository.time.monotonic')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_stats_cached_for_ttl(self, mock_st, mock_supabase, mock_monotonic):
+        """Wynik ważny przez STATS_CACHE_TTL sekund, zapis procesu unieważnia go od razu"""
+        from smartflowai import storage
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        self._mock_stats(mock_supabase)
+        
+        mock_monotonic.return_value = 100.0
+        get_process_stats()
+        mock_monotonic.return_value = 100.0 + storage.STATS_CACHE_TTL - 1
+        get_process_stats()
+        assert mock_supabase.rpc.call_count == 1
+        
+        mock_monotonic.return_value = 100.0 + storage.STATS_CACHE_TTL
+        get_process_stats()
+        assert mock_supabase.rpc.call_count == 2
+        
+        save_process("Proces", "Opis procesu", "Analiza")
+        get_process_stats()
+        assert mock_supabase.rpc.call_count == 3
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_save_stores_depth_and_industry(self, mock_st, mock_supabase):
+        """Głębokość analizy i branża z formularza zapisywane są w kolumnach"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        
+        save_process("Proces", "Opis procesu", "Analiza", None, "Ekspercka (pełna analiza)", "Księgowość")
+        save_process("Proces", "Opis procesu", "Analiza", None, "Podstawowa (szybka)", "")
+        
+        first, second = [call[0][0] for call in mock_supabase.table.return_value.insert.call_args_list]
+        assert first['analysis_depth'] == "Ekspercka (pełna analiza)"
+        assert first['industry'] == "Księgowość"
+        assert 'industry' not in second
+    
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_stats_error(self, mock_st, mock_supabase):
+        """Błąd bazy (np. brak funkcji) ukrywa panel zamiast przerywać dashboard"""
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        mock_supabase.rpc.side_effect = Exception("function get_process_stats does not exist")
+        
+        assert get_process_stats() is None
 
 class TestSecurity:
     """Testy bezpieczeństwa"""
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_user_isolation(self, mock_st, mock_supabase):
         """Test izolacji danych użytkowników"""
         # Test że użytkownik widzi tylko swoje procesy
@@ -329,7 +735,7 @@ class TestSecurity:
     def test_input_validation(self):
         """Test walidacji danych wejściowych"""
         # Test pustych stringów
-        with patch('streamlit_app.openai_client') as mock_openai:
+        with patch('smartflowai.ai.openai_client') as mock_openai:
             mock_response = Mock()
             mock_response.choices = [Mock()]
             mock_response.choices[0].message.content = "Test response"
@@ -347,7 +753,7 @@ class TestSecurity:
 class TestPerformance:
     """Testy wydajności"""
     
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.ai.openai_client')
     def test_analyze_response_time(self, mock_openai):
         """Test czasu odpowiedzi analizy AI"""
         import time
@@ -368,9 +774,9 @@ class TestPerformance:
 class TestIntegration:
     """Testy integracyjne"""
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.openai_client')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.ai.openai_client')
+    @patch('smartflowai.storage.st')
     def test_full_workflow(self, mock_st, mock_openai, mock_supabase):
         """Test pełnego workflow: analiza AI + zapis + odczyt"""
         # Setup
@@ -413,7 +819,7 @@ class TestIntegration:
         assert processes[0]['title'] == 'Test Process'
         assert processes[0]['ai_analysis'] == ai_result
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_database_initialization(self, mock_supabase):
         """Test inicjalizacji bazy danych"""
         # Mock sprawdzenia tabeli (tabela istnieje)
@@ -434,7 +840,7 @@ class TestIntegration:
 class TestEdgeCases:
     """Testy przypadków brzegowych"""
     
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.ai.openai_client')
     def test_empty_ai_response(self, mock_openai):
         """Test pustej odpowiedzi AI"""
         mock_response = Mock()
@@ -445,8 +851,8 @@ class TestEdgeCases:
         result = analyze_with_ai("Test", "Description")
         assert isinstance(result, str)
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.st')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
     def test_empty_database(self, mock_st, mock_supabase):
         """Test pustej bazy danych"""
         mock_st.session_state.user = "test@smartflowai.com"
@@ -460,7 +866,7 @@ class TestEdgeCases:
     
     def test_unicode_handling(self):
         """Test obsługi znaków Unicode"""
-        with patch('streamlit_app.openai_client') as mock_openai:
+        with patch('smartflowai.ai.openai_client') as mock_openai:
             mock_response = Mock()
             mock_response.choices = [Mock()]
             mock_response.choices[0].message.content = "Analiza z polskimi znakami: ąćęłńóśźż"
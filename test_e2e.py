@@ -31,7 +31,7 @@ class TestE2ELogin:
         os.environ['SUPABASE_URL'] = 'https://test.supabase.co'
         os.environ['SUPABASE_ANON_KEY'] = 'test-anon-key-12345'
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_login_flow(self, mock_supabase):
         """Test przepływu logowania"""
         # Mock successful login
@@ -59,7 +59,7 @@ class TestE2ELogin:
         # Po zalogowaniu powinien pokazać dashboard
         # (Sprawdzenie zależy od struktury aplikacji)
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_registration_flow(self, mock_supabase):
         """Test przepływu rejestracji"""
         # Mock successful registration
@@ -83,12 +83,12 @@ class TestE2EProcessManagement:
         os.environ['SUPABASE_URL'] = 'https://test.supabase.co'
         os.environ['SUPABASE_ANON_KEY'] = 'test-anon-key-12345'
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.ai.openai_client')
     def test_add_process_flow(self, mock_openai, mock_supabase):
         """Test dodawania nowego procesu"""
         # Mock zalogowanego użytkownika
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock AI response
@@ -133,10 +133,10 @@ class TestE2EProcessManagement:
                     # Sprawdź czy pokazuje wyniki analizy
                     # (Sprawdzenie zależy od implementacji)
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_process_list_display(self, mock_supabase):
         """Test wyświetlania listy procesów"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock processes data
@@ -170,10 +170,10 @@ class TestE2EProcessManagement:
 class TestE2EAdvancedFeatures:
     """Testy E2E zaawansowanych funkcji"""
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_process_editing(self, mock_supabase):
         """Test edycji procesu"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock process data
@@ -197,10 +197,10 @@ class TestE2EAdvancedFeatures:
             # Test edycji przez interfejs
             # (Implementacja zależy od struktury interfejsu)
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_process_deletion(self, mock_supabase):
         """Test usuwania procesu"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock check ownership
@@ -219,10 +219,10 @@ class TestE2EAdvancedFeatures:
 class TestE2EPDFGeneration:
     """Testy E2E generowania PDF"""
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_pdf_generation_flow(self, mock_supabase):
         """Test generowania PDF"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock processes for PDF
@@ -270,7 +270,7 @@ class TestE2EUserExperience:
     
     def test_navigation_flow(self):
         """Test nawigacji między zakładkami"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             at = AppTest.from_file("streamlit_app.py")
@@ -279,11 +279,11 @@ class TestE2EUserExperience:
             # Sprawdź czy są dostępne zakładki
             # (Implementacja zależy od struktury interfejsu)
     
-    @patch('streamlit_app.supabase')
-    @patch('streamlit_app.openai_client')
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.ai.openai_client')
     def test_error_handling_ui(self, mock_openai, mock_supabase):
         """Test obsługi błędów w interfejsie"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock błędu AI
@@ -314,10 +314,10 @@ class TestE2EPerformance:
         # Aplikacja powinna uruchomić się w rozsądnym czasie (< 10 sekund)
         assert startup_time < 10.0, f"Aplikacja uruchamiała się zbyt długo: {startup_time:.2f}s"
     
-    @patch('streamlit_app.supabase')
+    @patch('smartflowai.storage.supabase')
     def test_large_dataset_handling(self, mock_supabase):
         """Test obsługi dużej ilości danych"""
-        with patch('streamlit_app.st') as mock_st:
+        with patch('smartflowai.storage.st') as mock_st:
             mock_st.session_state.user = "test@smartflowai.com"
             
             # Mock dużej ilości procesów
@@ -366,7 +366,7 @@ def find_button_by_text(at, button_text):
 @pytest.fixture
 def mock_logged_user():
     """Mock zalogowanego użytkownika"""
-    with patch('streamlit_app.st') as mock_st:
+    with patch('smartflowai.storage.st') as mock_st:
         mock_st.session_state.user = "test@smartflowai.com"
         yield mock_st
 
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Plik: test_pdf_report.py
+# test_pdf_report.py - Testy strumieniowego raportu PDF
+
+"""
+Testy dla pdf_report.py - poprawność struktury PDF, brak obcinania treści
+i zapis stron na bieżąco (bez trzymania całego dokumentu w pamięci) - oraz
+dla smartflowai/reports.py (raporty pobierane z aplikacji).
+"""
+
+import io
+import os
+import re
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_report import StreamingPDFWriter, write_process_report
+from smartflowai import reports
+
+
+def make_processes(count, words=50):
+    """Generator przykładowych procesów"""
+    for i in range(count):
+        yield {
+            "title": f"Proces {i}",
+            "description": " ".join(f"opis{i}_{w}" for w in range(words)),
+            "ai_analysis": " ".join(f"analiza{i}_{w}" for w in range(words))
+        }
+
+
+def page_texts(data: bytes):
+    """Rozpakowuje strumienie treści stron"""
+    streams = re.findall(rb"/FlateDecode >>\nstream\n(.*?)\nendstream", data, re.S)
+    return [zlib.decompress(stream).decode("latin-1") for stream in streams]
+
+
+class TestStreamingPDFWriter:
+    """Testy zapisu PDF"""
+
+    def test_valid_structure_and_xref(self):
+        """Offsety w tabeli xref wskazują na początki obiektów"""
+        output = io.BytesIO()
+        stats = write_process_report(make_processes(3), "Nagłówek", "Stopka", output)
+        data = output.getvalue()
+
+        assert data.startswith(b"%PDF-1.4")
+        assert data.rstrip().endswith(b"%%EOF")
+        assert stats == {"processes": 3, "pages": 1}
+
+        xref_position = int(re.search(rb"startxref\n(\d+)\n", data).group(1))
+        assert data[xref_position:].startswith(b"xref\n")
+        entries = re.findall(rb"(\d{10}) 00000 n ", data[xref_position:])
+        for obj_id, offset in enumerate(entries, 1):
+            assert data[int(offset):].startswith(f"{obj_id} 0 obj".encode())
+        assert f"/Count {stats['pages']}".encode() in data
+
+    def test_full_content_without_truncation(self):
+        """Wszystkie procesy i cała treść trafiają do raportu (dawniej tylko 10 i limit znaków)"""
+        output = io.BytesIO()
+        stats = write_process_report(make_processes(30, words=400), "Raport", "Stopka", output)
+        text = "".join(page_texts(output.getvalue()))
+
+        assert stats["processes"] == 30
+        assert stats["pages"] > 10
+        assert "30. Proces 29" in text
+        assert "opis29_399" in text
+        assert "analiza29_399" in text
+
+    def test_pages_written_incrementally(self):
+        """Zapełnione strony trafiają do pliku zanim skończy się iterator procesów"""
+        output = io.BytesIO()
+        sizes = []
+
+        def processes():
+            for process in make_processes(40, words=400):
+                sizes.append(len(output.getvalue()))
+                yield process
+
+        write_process_report(processes(), "Raport", "Stopka", output)
+
+        assert sizes[-1] > sizes[0]
+        assert sizes[-1] < len(output.getvalue())
+
+    def test_long_word_wrapped(self):
+        """Słowo szersze niż linia dzielone jest po znakach"""
+        writer = StreamingPDFWriter(io.BytesIO())
+        lines = list(writer.wrap("x" * 1000, "", 9))
+
+        assert len(lines) > 1
+        assert "".join(lines) == "x" * 1000
+
+    def test_empty_report(self):
+        """Raport bez procesów to poprawny jednostronicowy PDF"""
+        output = io.BytesIO()
+        stats = write_process_report(iter([]), "Raport", "Stopka", output)
+
+        assert stats == {"processes": 0, "pages": 1}
+        assert output.getvalue().rstrip().endswith(b"%%EOF")
+
+
+class TestAppReports:
+    """Testy raportów do pobrania z zakładki 'Zestawienie PDF'"""
+
+    def test_text_report(self):
+        """Raport tekstowy z numeracją procesów, stopką i datą"""
+        text = reports.build_text_report(make_processes(2, words=3), "Raport", "Stopka", "2025-06-01")
+
+        assert text.startswith("Raport\n" + "=" * 50 + "\n\n1. Proces 0\n")
+        assert "2. Proces 1\n" in text
+        assert "OPIS:\nopis1_0 opis1_1 opis1_2\n\nANALIZA AI:\nanaliza1_0" in text
+        assert text.endswith("\nStopka\nWygenerowano: 2025-06-01")
+
+    def test_text_file_matches_text_report(self):
+        """Plik .txt zapisywany fragmentami to ten sam raport w UTF-8, również z generatora procesów"""
+        data = reports.write_text_report(make_processes(3, words=3), "Raport ąę", "Stopka", "2025-06-01")
+        text = reports.build_text_report(make_processes(3, words=3), "Raport ąę", "Stopka", "2025-06-01")
+
+        assert data == text.encode("utf-8")
+        assert "3. Proces 2\n" in text
+
+    def test_pdf_report_as_bytes(self):
+        """PDF zwracany jako bytes dla st.download_button"""
+        data, stats = reports.write_pdf_report(make_processes(3), "Raport", "Stopka")
+
+        assert isinstance(data, bytes)
+        assert data.startswith(b"%PDF") and data.rstrip().endswith(b"%%EOF")
+        assert stats["processes"] == 3
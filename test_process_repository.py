@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# Plik: test_process_repository.py
+# test_process_repository.py - Testy warstwy dostępu do procesów
+
+"""
+Testy dla process_repository.py - semantyka lokalnego repozytorium SQLite
+(własność procesów, stronicowanie keyset, wyszukiwanie, statystyki),
+dekorator cache odczytów i pomiar zapytań do bazy.
+"""
+
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import process_views
+import telemetry
+from process_repository import CachingProcessRepository, SQLiteProcessRepository, SupabaseProcessRepository, TimedProcessRepository
+
+
+@pytest.fixture
+def repository():
+    repo = SQLiteProcessRepository(":memory:")
+    yield repo
+    repo.close()
+
+
+def add_processes(repository, user_id, count, **values):
+    rows = [{'user_id': user_id, 'title': f"Proces {i}", 'description': f"Opis {i}", 'ai_analysis': f"Analiza {i}", **values}
+            for i in range(count)]
+    return repository.insert_processes(rows)
+
+
+class TestSQLiteRepository:
+    """Testy repozytorium SQLite"""
+
+    def test_users_and_projection(self, repository):
+        """Użytkownik z tabeli users, lista zwraca tylko kolumny widoku od najnowszego"""
+        user_id = repository.add_user("jan@firma.pl")
+        repository.insert_process({'user_id': user_id, 'title': "Faktury", 'description': "Opis", 'ai_analysis': "Analiza"})
+        repository.insert_process({'user_id': user_id, 'title': "Rekrutacja", 'description': "Opis", 'ai_analysis': "Analiza"})
+
+        processes = repository.list_processes(user_id, process_views.LIST)
+
+        assert repository.find_user_id("jan@firma.pl") == user_id
+        assert repository.find_user_id("brak@firma.pl") is None
+        assert [p['title'] for p in processes] == ["Rekrutacja", "Faktury"]
+        assert set(processes[0]) == set(process_views.fields(process_views.LIST))
+
+    def test_ownership_checked_on_every_operation(self, repository):
+        """Cudzego procesu nie można odczytać, zmienić ani usunąć"""
+        owner = repository.add_user("jan@firma.pl")
+        other = repository.add_user("anna@firma.pl")
+        add_processes(repository, owner, 1)
+        process_id = repository.list_processes(owner)[0]['id']
+
+        assert repository.get_process(other, process_id) is None
+        assert repository.update_process(other, process_id, {'title': "Zmiana"}) is False
+        assert repository.delete_process(other, process_id) is False
+        assert repository.list_processes(other) == []
+
+        assert repository.update_process(owner, process_id, {'title': "Zmiana"}) is True
+        assert repository.get_process(owner, process_id)['title'] == "Zmiana"
+        assert repository.delete_process(owner, process_id) is True
+        assert repository.list_processes(owner) == []
+
+    def test_keyset_pages_cover_all_rows_once(self, repository):
+        """Kolejne strony po kursorze zwracają każdy proces dokładnie raz"""
+        user_id = repository.add_user("jan@firma.pl")
+        add_processes(repository, user_id, 25)
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = repository.list_page(user_id, process_views.LIST, cursor, 10)
+            seen.extend(p['id'] for p in page)
+            if not cursor:
+                break
+
+        assert len(seen) == len(set(seen)) == 25
+        assert seen == [p['id'] for p in repository.list_processes(user_id)]
+
+    def test_unknown_column_rejected(self, repository):
+        """Kolumna spoza business_processes to błąd, nie cichy zapis"""
+        user_id = repository.add_user("jan@firma.pl")
+
+        with pytest.raises(ValueError):
+            repository.insert_process({'user_id': user_id, 'title': "T", 'description': "O", 'user_email': "jan@firma.pl"})
+
+    def test_search_ranks_title_first(self, repository):
+        """Wszystkie słowa muszą wystąpić, dopasowanie w tytule wyżej niż w analizie"""
+        user_id = repository.add_user("jan@firma.pl")
+        repository.insert_processes([
+            {'user_id': user_id, 'title': "Obieg dokumentów", 'description': "Faktury kosztowe", 'ai_analysis': "Zapier"},
+            {'user_id': user_id, 'title': "Faktury sprzedażowe", 'description': "Wystawianie dokumentów", 'ai_analysis': "Make"},
+            {'user_id': user_id, 'title': "Rekrutacja", 'description': "CV", 'ai_analysis': "Brak"},
+        ])
+
+        results = repository.search(user_id, "faktury dokumentów", 10)
+
+        assert [r['title'] for r in results] == ["Faktury sprzedażowe", "Obieg dokumentów"]
+        assert set(results[0]) == {'id', 'title', 'created_at', 'rank'}
+
+    def test_stats_aggregates(self, repository):
+        """Statystyki w formacie funkcji get_process_stats"""
+        user_id = repository.add_user("jan@firma.pl")
+        add_processes(repository, user_id, 2, industry="Księgowość", time_savings_hours=10, cost_savings_annual=1200,
+                      automation_potential=80)
+        add_processes(repository, user_id, 1, analysis_depth="Ekspercka (pełna analiza)", automation_potential=60)
+
+        stats = repository.stats(user_id, 12, 10)
+
+        assert stats['total_processes'] == 3
+        assert stats['avg_automation_potential'] == pytest.approx(73.3)
+        assert stats['total_time_savings'] == 20
+        assert stats['total_cost_savings'] == 2400
+        assert stats['per_month'] == [{'month': stats['per_month'][0]['month'], 'count': 3}]
+        assert {'analysis_depth': "Ekspercka (pełna analiza)", 'count': 1} in stats['per_depth']
+        assert stats['per_industry'] == [{'industry': "Księgowość", 'count': 2}, {'industry': "Nie podano", 'count': 1}]
+
+    def test_file_database_persists(self, tmp_path):
+        """Baza w pliku zachowuje dane między połączeniami"""
+        path = str(tmp_path / "dane" / "smartflowai.sqlite3")
+        first = SQLiteProcessRepository(path)
+        user_id = first.add_user("jan@firma.pl")
+        add_processes(first, user_id, 3)
+        first.close()
+
+        second = SQLiteProcessRepository(path)
+        assert len(second.list_processes(second.find_user_id("jan@firma.pl"))) == 3
+        second.close()
+
+
+class TestCachingRepository:
+    """Testy dekoratora cache"""
+
+    def test_reads_cached_until_write(self, repository):
+        """Odczyty z cache, udany zapis czyści cache, nieudany nie"""
+        user_id = repository.add_user("jan@firma.pl")
+        inner = Mock(wraps=repository)
+        cached = CachingProcessRepository(inner, {})
+
+        cached.list_processes(user_id)
+        cached.list_processes(user_id)
+        assert inner.list_processes.call_count == 1
+
+        assert cached.delete_process(user_id, "nie-istnieje") is False
+        cached.list_processes(user_id)
+        assert inner.list_processes.call_count == 1
+
+        cached.insert_process({'user_id': user_id, 'title': "Faktury", 'description': "Opis"})
+        assert len(cached.list_processes(user_id)) == 1
+        assert inner.list_processes.call_count == 2
+
+    def test_stats_expire_after_ttl(self):
+        """Statystyki odświeżane po stats_ttl sekundach"""
+        inner = Mock()
+        inner.stats.return_value = {'total_processes': 1}
+        now = [0.0]
+        cached = CachingProcessRepository(inner, {}, stats_ttl=60, clock=lambda: now[0])
+
+        cached.stats("u1", 12, 10)
+        now[0] = 59.0
+        cached.stats("u1", 12, 10)
+        assert inner.stats.call_count == 1
+
+        now[0] = 60.0
+        cached.stats("u1", 12, 10)
+        assert inner.stats.call_count == 2
+
+
+class TestTimedRepository:
+    """Testy pomiaru zapytań do bazy"""
+
+    def test_round_trips_counted_below_cache(self, repository):
+        """Spany repo.* tylko dla odczytów nieobsłużonych z cache, trafienia zapisywane jako cache.session_hit"""
+        user_id = repository.add_user("jan@firma.pl")
+        registry = telemetry.SpanRegistry(enabled=True, log_spans=False)
+        cached = CachingProcessRepository(TimedProcessRepository(repository), {})
+
+        with patch.object(telemetry, "registry", registry), telemetry.count_spans("repo.") as queries:
+            cached.list_processes(user_id)
+            cached.list_processes(user_id)
+            cached.insert_process({'user_id': user_id, 'title': "Faktury", 'description': "Opis"})
+            assert [p['title'] for p in cached.list_processes(user_id)] == ["Faktury"]
+
+        assert queries.count == 3
+        assert sorted(name for name, _ in registry.samples()) == ["repo.insert_process", "repo.list_processes"]
+        assert registry.values("cache.session_hit") == {("cache.session_hit", ()): [0, 1, 0]}
+
+
+class TestSupabaseRepository:
+    """Testy implementacji Supabase"""
+
+    def test_find_user_id(self):
+        """user_id z tabeli users po emailu"""
+        client = Mock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{'id': "u1"}]
+
+        assert SupabaseProcessRepository(client).find_user_id("jan@firma.pl") == "u1"
+        client.table.assert_called_once_with('users')
+        client.table.return_value.select.return_value.eq.assert_called_once_with('email', "jan@firma.pl")
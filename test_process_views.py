@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Plik: test_process_views.py
+# test_process_views.py - Testy projekcji kolumn zapytań o procesy
+
+"""
+Testy dla process_views.py - listy kolumn generowane dla widoków
+i ich użycie w zapytaniach aplikacji oraz kolejki analiz.
+"""
+
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import process_views
+from process_views import PROCESS_COLUMNS, VIEWS, columns
+
+
+class SessionState(dict):
+    """Minimalny odpowiednik st.session_state (dostęp przez atrybuty i klucze)"""
+    __getattr__ = dict.get
+    __setattr__ = dict.__setitem__
+
+
+class TestColumns:
+    """Testy generowanych list kolumn"""
+
+    def test_generated_column_lists(self):
+        """Każdy widok daje dokładnie swoją listę kolumn"""
+        assert columns(process_views.LIST) == "id,title,created_at"
+        assert columns(process_views.EXPORT) == "id,title,description,ai_analysis,created_at"
+        assert columns(process_views.DETAIL) == (
+            "id,title,description,ai_analysis,created_at,analysis_status,analysis_error,"
+            "automation_potential,time_savings_hours,cost_savings_annual,implementation_difficulty"
+        )
+        assert columns(process_views.JOB_STATUS) == "id,title,analysis_status,analysis_error"
+        assert columns(process_views.JOB_QUEUE) == "id,title,description,analysis_params,analysis_attempts"
+
+    def test_views_use_existing_columns(self):
+        """Widoki zawierają tylko kolumny tabeli, bez '*' i powtórzeń"""
+        for view, view_fields in VIEWS.items():
+            assert "*" not in columns(view)
+            assert set(view_fields) <= set(PROCESS_COLUMNS), view
+            assert len(set(view_fields)) == len(view_fields), view
+
+    def test_list_view_without_large_text(self):
+        """Lista i status zadań nie pobierają opisu ani analizy AI"""
+        for view in (process_views.LIST, process_views.JOB_STATUS):
+            assert "description" not in VIEWS[view]
+            assert "ai_analysis" not in VIEWS[view]
+
+    def test_unknown_view(self):
+        """Nieznany widok to błąd programisty, nie cichy select('*')"""
+        with pytest.raises(ValueError):
+            columns("wszystko")
+
+
+class TestQueries:
+    """Testy projekcji w zapytaniach"""
+
+    @patch('smartflowai.storage.supabase')
+    @patch('smartflowai.storage.st')
+    def test_get_processes_selects_view_columns(self, mock_st, mock_supabase):
+        """get_processes pobiera tylko kolumny widoku, cache osobno dla każdego widoku"""
+        from smartflowai.storage import get_processes
+        mock_st.session_state = SessionState(user="test@smartflowai.com")
+        mock_result = Mock()
+        mock_result.data = [{'id': 1, 'title': 'Faktury', 'created_at': '2025-06-01T10:00:00+00:00'}]
+        mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.execute.return_value = mock_result
+
+        get_processes()
+        get_processes(process_views.LIST)
+        get_processes(process_views.EXPORT)
+
+        selected = [call[0][0] for call in mock_supabase.table.return_value.select.call_args_list]
+        assert selected == ["id,title,created_at", "id,title,description,ai_analysis,created_at"]
+
+    def test_job_queries_use_projections(self):
+        """Status zadań i kolejka workera pobierają tylko swoje kolumny"""
+        from analysis_jobs import fetch_pending, get_job_statuses
+        client = Mock()
+        client.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value.execute.return_value.data = []
+
+        get_job_statuses(client, "user-1", [1])
+        fetch_pending(client, 5)
+
+        selected = [call[0][0] for call in client.table.return_value.select.call_args_list]
+        assert selected == [columns(process_views.JOB_STATUS), columns(process_views.JOB_QUEUE)]
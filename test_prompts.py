@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Plik: test_prompts.py
+# test_prompts.py - Testy szablonów promptów analizy
+
+"""
+Testy dla prompts.py - stały prefiks (prompt caching po stronie OpenAI),
+dane procesu na końcu promptu i wersjonowanie szablonów.
+"""
+
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import prompts
+from prompts import PromptTemplate, render_analysis_prompt, template_for
+
+DEPTHS = ["Podstawowa (szybka)", "Pogłębiona (z wyszukiwaniem)", "Ekspercka (pełna analiza)"]
+
+
+class TestTemplates:
+    """Testy szablonów"""
+
+    def test_static_prefix_identical_across_calls(self):
+        """Różne procesy i konteksty - ten sam początek promptu dla głębokości"""
+        for depth in DEPTHS:
+            first = render_analysis_prompt("Faktury", "Ręczne faktury w Excelu", depth)
+            second = render_analysis_prompt("Rekrutacja", "Zbieranie CV mailem", depth, "11-50 osób", "IT/Software", "do 500 zł/mies")
+            prefix = template_for(depth).prefix
+
+            assert first.startswith(prefix)
+            assert second.startswith(prefix)
+            assert "Faktury" not in prefix
+
+    def test_process_data_at_the_end(self):
+        """Dane procesu, kontekst firmy i uwagi branżowe trafiają do sufiksu"""
+        prompt = render_analysis_prompt("Faktury", "Ręczne faktury w Excelu", "Ekspercka (pełna analiza)",
+                                        "1-10 osób", "Księgowość", "do 500 zł/mies")
+        suffix = prompt[len(template_for("Ekspercka (pełna analiza)").prefix):]
+
+        assert "**Nazwa procesu:** Faktury" in suffix
+        assert "**Wielkość firmy:** 1-10 osób" in suffix
+        assert prompts.INDUSTRY_NOTES["Księgowość"] in suffix
+
+    def test_no_company_context_when_empty(self):
+        """Bez kontekstu firmy nie ma sekcji KONTEKST FIRMY ani uwag branżowych"""
+        prompt = render_analysis_prompt("Faktury", "Opis", "Podstawowa (szybka)", industry="Inna")
+
+        assert "KONTEKST FIRMY" in prompt
+        assert "UWAGI BRANŻOWE" not in prompt
+        assert "KONTEKST FIRMY" not in render_analysis_prompt("Faktury", "Opis", "Podstawowa (szybka)")
+
+    def test_user_braces_not_formatted(self):
+        """Nawiasy klamrowe w opisie użytkownika wstawiane są dosłownie"""
+        prompt = render_analysis_prompt("Szablon {title}", "Pole {description} i {0}", "Podstawowa (szybka)")
+
+        assert "PROCES: Szablon {title}" in prompt
+        assert "OPIS: Pole {description} i {0}" in prompt
+
+    def test_compiled_fields_and_versions(self):
+        """Sufiks kompilowany raz, każdy szablon ma unikalny klucz z wersją"""
+        template = PromptTemplate("test", "3", "STAŁE\n", "A={a}, B={b}.")
+
+        assert template.fields == ["a", "b"]
+        assert template.render(a="1", b="2") == "STAŁE\nA=1, B=2."
+        keys = [template_for(depth).key for depth in DEPTHS]
+        assert len(set(keys)) == 3
+        assert template_for("Nieznana") is prompts.DEEP_PROMPT
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    def test_analysis_sends_template_prompt(self, mock_openai):
+        """analyze_with_ai wysyła jedną wiadomość zaczynającą się stałym prefiksem"""
+        from smartflowai.ai import analyze_with_ai
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Analiza"
+        mock_openai.chat.completions.create.return_value = mock_response
+
+        analyze_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu", "Pogłębiona (z wyszukiwaniem)")
+
+        messages = mock_openai.chat.completions.create.call_args[1]['messages']
+        assert len(messages) == 1
+        assert messages[0]['content'].startswith(prompts.DEEP_PROMPT.prefix)
@@ -39,8 +39,8 @@ def test_imports():
     except ImportError as e:
         pytest.fail(f"Błąd importu biblioteki: {e}")
 
-@patch('streamlit_app.openai')
-@patch('streamlit_app.supabase')
+@patch('smartflowai.ai.openai_client')
+@patch('smartflowai.storage.supabase')
 def test_mock_ai_analysis(mock_supabase, mock_openai):
     """Test analizy AI z mockami"""
     # Ustaw zmienne środowiskowe
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# Plik: test_sqlite_backend.py
+# test_sqlite_backend.py - Testy lokalnego backendu SQLite
+
+"""
+Testy dla sqlite_backend.py - zapytania table(...) z filtrami jak w PostgREST,
+kolejka analiz na prawdziwej bazie (atomowe przejęcie zadania przez wiele
+wątków), lokalne logowanie i wybór backendu ze zmiennych środowiskowych.
+"""
+
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import analysis_jobs
+import process_views
+import sqlite_backend
+from process_repository import SQLiteProcessRepository
+from sqlite_backend import AuthError, SQLiteClient, TEST_USERS, seed_test_users
+
+USER_ID = TEST_USERS["test@smartflowai.com"]
+OTHER_ID = TEST_USERS["demo@smartflowai.com"]
+
+
+@pytest.fixture
+def client():
+    client = SQLiteClient(SQLiteProcessRepository(":memory:"))
+    for email, user_id in TEST_USERS.items():
+        client.repository.add_user(email, user_id=user_id)
+    yield client
+    client.close()
+
+
+def add_process(client, user_id=USER_ID, **values):
+    row = {'user_id': user_id, 'title': "Faktury", 'description': "Ręczne faktury", **values}
+    return client.table('business_processes').insert(row).execute().data[0]
+
+
+class TestQueryBuilder:
+    """Testy zapytań table(...)"""
+
+    def test_filters_order_and_limit(self, client):
+        """Filtry zawężają wynik (MockSupabase je ignorował), sortowanie i limit jak w PostgREST"""
+        for potential in (30, 60, 90):
+            add_process(client, title=f"Proces {potential}", automation_potential=potential)
+        add_process(client, user_id=OTHER_ID, automation_potential=99)
+
+        query = client.table('business_processes').select('title, automation_potential').eq('user_id', USER_ID)
+        result = query.gte('automation_potential', 60).order('automation_potential', desc=True).limit(1).execute()
+
+        assert result.data == [{'title': "Proces 90", 'automation_potential': 90}]
+        assert client.table('business_processes').select('id').neq('user_id', USER_ID).execute().count == 1
+        assert client.table('business_processes').select('id').in_('id', []).execute().data == []
+
+    def test_update_and_delete_return_changed_rows(self, client):
+        """update/delete zwracają tylko dopasowane wiersze - pusta lista oznacza brak zmian"""
+        process = add_process(client)
+
+        foreign = client.table('business_processes').update({'title': "Zmiana"}).eq('id', process['id']).eq('user_id', OTHER_ID).execute()
+        own = client.table('business_processes').update({'title': "Zmiana"}).eq('id', process['id']).eq('user_id', USER_ID).execute()
+
+        assert foreign.data == []
+        assert own.data[0]['title'] == "Zmiana"
+        assert client.repository.get_process(USER_ID, process['id'])['title'] == "Zmiana"
+        assert client.table('business_processes').delete().eq('id', process['id']).execute().data[0]['id'] == process['id']
+        assert client.repository.list_processes(USER_ID) == []
+
+    def test_json_and_boolean_columns(self, client):
+        """analysis_params zapisywane jako JSON, is_active odczytywane jako bool"""
+        add_process(client, analysis_params={'budget': "do 10 000 zł", 'industry': "IT"})
+
+        row = client.table('business_processes').select('analysis_params,is_active').execute().data[0]
+
+        assert row == {'analysis_params': {'budget': "do 10 000 zł", 'industry': "IT"}, 'is_active': True}
+
+    def test_unknown_columns_and_tables_rejected(self, client):
+        """Nazwy kolumn trafiają do SQL - dozwolone są tylko kolumny tabeli"""
+        with pytest.raises(ValueError):
+            client.table('business_processes').select('id; DROP TABLE users')
+        with pytest.raises(ValueError):
+            client.table('business_processes').eq('user_email', "jan@firma.pl")
+        with pytest.raises(ValueError):
+            client.table('processes')
+
+    def test_rpc_functions(self, client):
+        """search_business_processes_fts i get_process_stats z lokalnej bazy"""
+        add_process(client, title="Faktury kosztowe", industry="Księgowość")
+
+        found = client.rpc('search_business_processes_fts', {'search_term': "faktury", 'user_uuid': USER_ID, 'result_limit': 5}).execute()
+        stats = client.rpc('get_process_stats', {'user_uuid': USER_ID, 'month_limit': 12, 'industry_limit': 10}).execute()
+
+        assert [row['title'] for row in found.data] == ["Faktury kosztowe"]
+        assert stats.data['total_processes'] == 1
+
+
+class TestAnalysisQueue:
+    """Kolejka analiz (analysis_jobs) na lokalnej bazie"""
+
+    def test_job_lifecycle(self, client):
+        """Zgłoszenie, przejęcie, wynik i status - te same funkcje co dla Supabase"""
+        job_id = analysis_jobs.enqueue_analysis(client, USER_ID, "Faktury", "Ręczne faktury w Excelu",
+                                                "Podstawowa (szybka)", "Mała", "IT", "do 10 000 zł")
+
+        [job] = analysis_jobs.fetch_pending(client, 5)
+        assert job['id'] == job_id
+        assert job['analysis_params']['budget'] == "do 10 000 zł"
+        assert analysis_jobs.claim_job(client, job) is True
+        assert analysis_jobs.claim_job(client, job) is False
+
+        assert analysis_jobs.run_job(client, job, lambda *args: "🔍 **ANALIZA:** Gotowe") is True
+        status = analysis_jobs.get_job_statuses(client, USER_ID, [job_id])[job_id]
+        assert status['analysis_status'] == analysis_jobs.STATUS_COMPLETED
+        assert analysis_jobs.get_job_statuses(client, OTHER_ID, [job_id]) == {}
+
+    def test_claim_exclusive_across_connections(self, tmp_path):
+        """Wiele wątków (osobne połączenia z puli) - każde zadanie przejęte dokładnie raz"""
+        client = SQLiteClient(SQLiteProcessRepository(str(tmp_path / "kolejka.sqlite3")))
+        client.repository.add_user("test@smartflowai.com", user_id=USER_ID)
+        for i in range(20):
+            analysis_jobs.enqueue_analysis(client, USER_ID, f"Proces {i}", "Opis procesu", "Podstawowa (szybka)", "", "", "")
+        jobs = analysis_jobs.fetch_pending(client, 20)
+        claimed = []
+        barrier = threading.Barrier(4)
+
+        def worker():
+            barrier.wait()
+            for job in jobs:
+                if analysis_jobs.claim_job(client, job):
+                    claimed.append(job['id'])
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.close()
+
+        assert sorted(claimed) == sorted(job['id'] for job in jobs)
+
+
+class TestLocalAuth:
+    """Testy logowania na tabeli users"""
+
+    def test_sign_up_and_sign_in(self, client):
+        """Rejestracja zapisuje hash hasła, logowanie sprawdza hasło"""
+        user = client.auth.sign_up({"email": "jan@firma.pl", "password": "tajne123"}).user
+
+        assert client.auth.sign_in_with_password({"email": "jan@firma.pl", "password": "tajne123"}).user.id == user.id
+        assert client.repository.find_user_id("jan@firma.pl") == user.id
+        stored = client.table('users').select('password_hash').eq('id', user.id).execute().data[0]['password_hash']
+        assert "tajne123" not in stored
+        with pytest.raises(AuthError, match="Invalid login credentials"):
+            client.auth.sign_in_with_password({"email": "jan@firma.pl", "password": "zle-haslo"})
+        with pytest.raises(AuthError, match="already registered"):
+            client.auth.sign_up({"email": "jan@firma.pl", "password": "inne123"})
+
+    def test_seeded_test_users(self):
+        """Użytkownicy testowi z UUID jak w supabase_setup.sql, seed idempotentny"""
+        client = SQLiteClient(SQLiteProcessRepository(":memory:"))
+
+        assert seed_test_users(client, "haslo123") == 3
+        assert seed_test_users(client, "haslo123") == 0
+        response = client.auth.sign_in_with_password({"email": "admin@smartflowai.com", "password": "haslo123"})
+        assert response.user.id == TEST_USERS["admin@smartflowai.com"]
+        client.close()
+
+
+class TestBackendSelection:
+    """Testy wyboru backendu"""
+
+    @pytest.mark.parametrize("env, expected", [
+        ({"ENVIRONMENT": "test"}, "sqlite"),
+        ({"ENVIRONMENT": "offline"}, "sqlite"),
+        ({"ENVIRONMENT": "production"}, "supabase"),
+        ({"ENVIRONMENT": "test", "DATABASE_BACKEND": "supabase"}, "supabase"),
+        ({"DATABASE_BACKEND": "SQLite"}, "sqlite"),
+    ])
+    def test_backend_from_env(self, env, expected):
+        """DATABASE_BACKEND ma pierwszeństwo przed ENVIRONMENT"""
+        with patch.dict(os.environ, env, clear=True):
+            assert sqlite_backend.backend_from_env() == expected
+
+    def test_unknown_backend(self):
+        """Literówka w konfiguracji to błąd, nie cichy wybór Supabase"""
+        with patch.dict(os.environ, {"DATABASE_BACKEND": "postgress"}, clear=True):
+            with pytest.raises(ValueError):
+                sqlite_backend.backend_from_env()
+
+    def test_app_uses_local_repository(self, client):
+        """Aplikacja z klientem SQLite korzysta bezpośrednio z repozytorium (stronicowanie keyset w SQL)"""
+        from smartflowai import storage
+        add_process(client)
+
+        with patch('smartflowai.storage.supabase', client):
+            repository = storage.get_repository()
+
+        assert repository is client.repository
+        assert [p['title'] for p in repository.list_processes(USER_ID, process_views.LIST)] == ["Faktury"]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Plik: test_startup.py
+# test_startup.py - Budżet czasu importu aplikacji
+
+"""
+Testy zimnego startu streamlit_app.py (python -X importtime w osobnym
+procesie): ciężkie pakiety OpenAI, Supabase i PDF nie są ładowane przy
+starcie, import aplikacji mieści się w budżecie czasu, a warstwy pakietu
+smartflowai bez interfejsu (ai, storage, reports) nie ładują stron Streamlit.
+"""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Ładowane dopiero przy pierwszej analizie, raporcie PDF lub połączeniu z Supabase
+LAZY_MODULES = ("openai", "supabase", "fpdf", "pdf_report")
+# Czas importu streamlit_app bez pakietu streamlit (przed leniwym ładowaniem: ok. 1400 ms)
+IMPORT_BUDGET_MS = 500
+
+
+def import_times(tmp_path, script: str = "import streamlit, streamlit_app") -> dict:
+    """Skumulowany czas importu (ms) modułów ładowanych przez skrypt (domyślnie streamlit_app)"""
+    env = dict(os.environ, ENVIRONMENT="test", DATABASE_BACKEND="sqlite",
+               SQLITE_PATH=str(tmp_path / "startup.sqlite3"), OPENAI_API_KEY="sk-test")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+class TestStartup:
+    """Testy zimnego startu"""
+
+    def test_heavy_modules_loaded_lazily(self, tmp_path):
+        """Strona logowania nie wymaga openai, supabase (baza lokalna) ani fpdf"""
+        times = import_times(tmp_path)
+
+        assert "streamlit_app" in times
+        assert [name for name in LAZY_MODULES if name in times] == []
+
+    def test_import_within_budget(self, tmp_path):
+        """Import aplikacji (przy istniejącej bazie) mieści się w IMPORT_BUDGET_MS"""
+        import_times(tmp_path)  # Pierwsze uruchomienie zakłada bazę i konta testowe
+
+        assert import_times(tmp_path)["streamlit_app"] < IMPORT_BUDGET_MS
+
+    def test_non_ui_layers_without_pages(self, tmp_path):
+        """CLI i worker importują ai/storage/reports bez modułu stron (smartflowai.ui)"""
+        times = import_times(tmp_path, "import smartflowai.ai, smartflowai.storage, smartflowai.reports")
+
+        assert "smartflowai.storage" in times
+        assert "smartflowai.ui" not in times
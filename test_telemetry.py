@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# Plik: test_telemetry.py
+# test_telemetry.py - Testy pomiaru czasu operacji
+
+"""
+Testy dla telemetry.py - spany z dekoratora (funkcje, async, generatory),
+percentyle p50/p95/p99, wartości z observe() i liczniki spanów na przebieg
+strony, eksport w formacie Prometheus, log JSON oraz brak pomiarów przy
+wyłączonej telemetrii.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import telemetry
+from telemetry import SpanRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = SpanRegistry(enabled=True, log_spans=False)
+    with patch.object(telemetry, "registry", registry):
+        yield registry
+
+
+class TestPercentiles:
+    """Testy agregacji czasów"""
+
+    def test_nearest_rank(self):
+        """p50/p95/p99 metodą najbliższej rangi"""
+        summary = telemetry.summarize([float(ms) for ms in range(100, 0, -1)])
+
+        assert summary["count"] == 100
+        assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50.0, 95.0, 99.0)
+        assert summary["max_ms"] == 100.0
+        assert telemetry.summarize([7.0])["p99_ms"] == 7.0
+
+    def test_summary_per_series_and_window(self):
+        """Osobna seria dla każdej wartości etykiet, percentyle tylko z okna ostatnich próbek"""
+        registry = SpanRegistry(enabled=True, window=3, log_spans=False)
+        for ms in (100.0, 1.0, 2.0, 3.0):
+            registry.record("ai.analyze", ms, {"analysis_depth": "Podstawowa (szybka)"})
+        registry.record("ai.analyze", 50.0, {"analysis_depth": "Pogłębiona"}, error=True)
+
+        rows = {row["labels"]["analysis_depth"]: row for row in registry.summary()}
+
+        assert rows["Podstawowa (szybka)"]["count"] == 3
+        assert rows["Podstawowa (szybka)"]["max_ms"] == 3.0
+        assert rows["Pogłębiona"]["errors"] == 1
+
+    def test_summary_since(self):
+        """Filtr czasu (since) - starsze próbki pomijane"""
+        registry = SpanRegistry(enabled=True, log_spans=False)
+        with patch("telemetry.time.time", return_value=1000.0):
+            registry.record("db.get_processes", 5.0)
+        with patch("telemetry.time.time", return_value=2000.0):
+            registry.record("db.get_processes", 7.0)
+
+        assert [row["count"] for row in registry.summary(since=1500.0)] == [1]
+        assert registry.samples("db.get_processes", since=1500.0) == {("db.get_processes", ()): [7.0]}
+
+
+class TestTimed:
+    """Testy dekoratora timed"""
+
+    def test_function_with_labels(self, registry):
+        """Etykiety z argumentów (także domyślnych), wynik funkcji bez zmian"""
+        @telemetry.timed("db.get_processes", labels=("view",))
+        def get_processes(view="list"):
+            return [view]
+
+        assert get_processes() == ["list"]
+        assert get_processes(view="export") == ["export"]
+
+        assert sorted(dict(labels)["view"] for _, labels in registry.samples()) == ["export", "list"]
+
+    def test_exception_counted_as_error(self, registry):
+        """Wyjątek przekazywany dalej i liczony jako błąd"""
+        @telemetry.timed("db.delete_process")
+        def delete_process():
+            raise RuntimeError("brak połączenia")
+
+        with pytest.raises(RuntimeError):
+            delete_process()
+
+        assert registry.summary()[0]["errors"] == 1
+
+    def test_async_and_generator(self, registry):
+        """Async mierzone do końca await, generator do wyczerpania strumienia"""
+        @telemetry.timed("ai.analyze_async")
+        async def analyze():
+            await asyncio.sleep(0.01)
+            return "analiza"
+
+        @telemetry.timed("ai.stream")
+        def stream():
+            yield "a"
+            yield "b"
+
+        assert asyncio.run(analyze()) == "analiza"
+        chunks = stream()
+        assert registry.samples("ai.stream") == {}  # Span zaczyna się przy pobieraniu
+        assert list(chunks) == ["a", "b"]
+
+        assert registry.samples("ai.analyze_async")[("ai.analyze_async", ())][0] >= 10
+        assert len(registry.samples("ai.stream")[("ai.stream", ())]) == 1
+
+    def test_disabled_records_nothing(self):
+        """Wyłączona telemetria - funkcja wywoływana bezpośrednio, bez pomiaru"""
+        registry = SpanRegistry(enabled=False)
+        with patch.object(telemetry, "registry", registry):
+            @telemetry.timed("report.pdf")
+            def build():
+                return b"%PDF"
+
+            with telemetry.span("report.txt"):
+                pass
+
+            assert build() == b"%PDF"
+        assert registry.summary() == []
+
+    def test_app_functions_instrumented(self, registry):
+        """Raport tekstowy aplikacji zapisuje span report.txt"""
+        from smartflowai import reports
+
+        reports.build_text_report([{"title": "Faktury"}], "Raport", "Stopka")
+
+        assert [row["span"] for row in registry.summary()] == ["report.txt"]
+
+
+class TestObservations:
+    """Testy wartości innych niż czas i liczników spanów"""
+
+    def test_observe_separate_from_spans(self, registry):
+        """observe() zapisuje osobne serie - nie trafiają do percentyli czasów"""
+        telemetry.observe("cache.ai_hit", 1)
+        telemetry.observe("cache.ai_hit", 0)
+
+        assert registry.values("cache.ai_hit") == {("cache.ai_hit", ()): [1, 0]}
+        assert registry.summary() == []
+        assert 'smartflowai_value_count{name="cache.ai_hit"} 2' in registry.prometheus_text()
+
+    def test_count_spans_per_context(self, registry):
+        """Licznik widzi tylko spany z prefiksem zapisane w swoim wątku"""
+        other_thread = threading.Thread(target=lambda: registry.record("repo.stats", 1.0))
+
+        with telemetry.count_spans("repo.") as queries:
+            registry.record("repo.list_page", 1.0)
+            registry.record("db.get_processes_page", 2.0)
+            other_thread.start()
+            other_thread.join()
+        registry.record("repo.search", 1.0)
+
+        assert queries.count == 1
+
+    def test_histogram_and_grouping(self):
+        """Przedziały histogramu (ostatni otwarty) i łączenie serii według etykiety"""
+        series = {("openai.request", (("analysis_depth", "Pogłębiona"), ("mode", "sync"))): [0.5, 1.5],
+                  ("openai.request", (("analysis_depth", "Pogłębiona"), ("mode", "stream"))): [75.0],
+                  ("openai.request", (("analysis_depth", "Ekspercka"), ("mode", "sync"))): []}
+
+        grouped = telemetry.group_by_label(series, "analysis_depth")
+
+        assert grouped == {"Pogłębiona": [0.5, 1.5, 75.0]}
+        assert telemetry.histogram(grouped["Pogłębiona"], (1, 2, 60)) == [("≤ 1", 1), ("≤ 2", 1), ("≤ 60", 0), ("> 60", 1)]
+
+
+class TestExport:
+    """Testy eksportu spanów"""
+
+    def test_prometheus_text_and_file(self, tmp_path):
+        """Summary z kwantylami, _sum, _count i licznik błędów; znaki specjalne w etykietach"""
+        registry = SpanRegistry(enabled=True, log_spans=False)
+        registry.record("ai.analyze", 10.0, {"analysis_depth": 'Ekspercka "pełna"'})
+        registry.record("ai.analyze", 30.0, {"analysis_depth": 'Ekspercka "pełna"'}, error=True)
+        path = tmp_path / "metrics" / "smartflowai.prom"
+
+        assert registry.export_prometheus(str(path)) is True
+        text = path.read_text(encoding="utf-8")
+
+        labels = 'span="ai.analyze",analysis_depth="Ekspercka \\"pełna\\""'
+        assert "# TYPE smartflowai_span_duration_milliseconds summary" in text
+        assert f'smartflowai_span_duration_milliseconds{{{labels},quantile="0.5"}} 10.000' in text
+        assert f"smartflowai_span_duration_milliseconds_sum{{{labels}}} 40.000" in text
+        assert f"smartflowai_span_duration_milliseconds_count{{{labels}}} 2" in text
+        assert f"smartflowai_span_errors_total{{{labels}}} 1" in text
+
+    def test_json_log_round_trip(self, tmp_path):
+        """Linie JSON z loggera spanów dają te same percentyle co rejestr"""
+        registry = SpanRegistry(enabled=True)
+        with patch.object(telemetry.span_logger, "info") as log:
+            for ms in (5.0, 15.0, 25.0):
+                registry.record("report.pdf", ms)
+        lines = [call.args[0] for call in log.call_args_list]
+
+        assert json.loads(lines[0])["span"] == "report.pdf"
+        assert telemetry.summary_from_log(lines + ["nie-json"]) == registry.summary()
+
+    def test_registry_from_env(self, tmp_path):
+        """Domyślnie wyłączona; TELEMETRY_* ustawiają okno i eksport"""
+        with patch.dict(os.environ, {}, clear=True):
+            assert telemetry.registry_from_env().enabled is False
+
+        env = {"TELEMETRY_ENABLED": "true", "TELEMETRY_JSON_LOGS": "false", "TELEMETRY_WINDOW": "50",
+               "TELEMETRY_PROMETHEUS_PATH": str(tmp_path / "app.prom")}
+        with patch.dict(os.environ, env, clear=True):
+            registry = telemetry.registry_from_env()
+
+        assert (registry.enabled, registry.log_spans, registry.window) == (True, False, 50)
+        assert registry.prometheus_path == str(tmp_path / "app.prom")
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Plik: test_text_sanitizer.py
+# test_text_sanitizer.py - Testy czyszczenia tekstu do eksportu
+
+"""
+Testy dla text_sanitizer.py - wynik zgodny z dotychczasowym safe_text
+(pętla str.replace + filtr znak po znaku) dla PDF oraz czyszczenie TXT/CLI.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from text_sanitizer import safe_text, flatten_text, clean_text, POLISH_TO_ASCII, EMOJI_LABELS
+
+
+def legacy_safe_text(text):
+    """Dotychczasowa implementacja - punkt odniesienia"""
+    if not text:
+        return ""
+    clean = str(text)
+    for polish, ascii_char in POLISH_TO_ASCII.items():
+        clean = clean.replace(polish, ascii_char)
+    for emoji, replacement in EMOJI_LABELS.items():
+        clean = clean.replace(emoji, replacement)
+    chars = []
+    for char in clean:
+        if 32 <= ord(char) <= 126:
+            chars.append(char)
+        elif char in ['\n', '\r', '\t']:
+            chars.append(' ')
+    return ''.join(chars)
+
+
+class TestSafeText:
+    """Testy tekstu ASCII dla PDF"""
+
+    def test_polish_and_emoji(self):
+        """Polskie znaki na ASCII, emoji na opis"""
+        assert safe_text("Zażółć 🔍 gęślą") == "Zazolc  [ANALIZA]  gesla"
+
+    def test_matches_legacy_implementation(self):
+        """Ten sam wynik co poprzednia wersja dla typowej analizy AI"""
+        sample = (
+            "🔍 **ANALIZA PROCESU:**\r\nŻmudne wprowadzanie faktur ⚠️ błędy\t(30%)\n"
+            "🛠️ Rozwiązanie: Make.com → Fakturownia 💰 500 zł/mies ⏱️ 10h/tydz\n"
+            "✏️ 🗑️ 📋 ⚡ 🎯 🤖 ✅ ❌ 📄 💾 🚀 📊 🔧 📈 💡 🎉 — „cudzysłów” 😀 ÀÉ"
+        )
+        assert safe_text(sample) == legacy_safe_text(sample)
+        assert all(32 <= ord(char) <= 126 for char in safe_text(sample))
+
+    def test_empty(self):
+        """Pusty tekst i None"""
+        assert safe_text("") == ""
+        assert safe_text(None) == ""
+
+
+class TestFlattenAndClean:
+    """Testy spłaszczania (PDF) i czyszczenia (TXT/CLI)"""
+
+    def test_flatten_not_truncated_by_default(self):
+        """Długi tekst nie jest skracany, białe znaki są spłaszczane"""
+        flat = flatten_text("słowo\n" * 2000)
+        assert flat.count("słowo") == 2000
+        assert "\n" not in flat
+        assert flatten_text("abcdef", 3) == "abc..."
+
+    def test_clean_text_keeps_unicode_and_lines(self):
+        """TXT zachowuje polskie znaki, emoji i podział na linie"""
+        assert clean_text("Łódź 🔍\r\nlinia\ttab\rkoniec") == "Łódź 🔍\nlinia\ttab\nkoniec"
+
+    def test_clean_text_removes_control_chars(self):
+        """Znaki sterujące i BOM są usuwane"""
+        assert clean_text("﻿a\x00b\x1bc\x7f") == "abc"
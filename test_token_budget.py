@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Plik: test_token_budget.py
+# test_token_budget.py - Testy liczenia tokenów i budżetu analizy
+
+"""
+Testy dla token_budget.py - przycinanie opisów, budżet odpowiedzi
+dla głębokości analizy i rejestr zużycia tokenów z odpowiedzi API.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import token_budget
+from token_budget import UsageLedger, count_tokens, trim_text
+
+
+class TestTrimming:
+    """Testy przycinania tekstu"""
+
+    def test_short_text_unchanged(self):
+        """Tekst w limicie nie jest zmieniany"""
+        text = "Ręczne wystawianie faktur w Excelu"
+        assert trim_text(text, 100) == text
+
+    def test_long_text_trimmed_deterministically(self):
+        """Długi opis skracany do limitu, zawsze tak samo, z początkiem i końcem"""
+        text = "Początek opisu. " + " ".join(f"krok{i}" for i in range(5000)) + " Koniec opisu."
+
+        first = trim_text(text, 500)
+
+        assert first == trim_text(text, 500)
+        assert count_tokens(first) <= 500
+        assert first.startswith("Początek opisu.")
+        assert first.endswith("Koniec opisu.")
+        assert token_budget.TRIM_MARKER in first
+
+    def test_prompt_contains_trimmed_description(self):
+        """Prompt analizy nie rośnie z długością opisu ponad limit"""
+        from smartflowai.ai import build_analysis_prompt
+        description = "Opis procesu. " * 20000
+
+        with patch.dict(os.environ, {"MAX_DESCRIPTION_TOKENS": "300"}):
+            prompt = build_analysis_prompt("Faktury", description, "Podstawowa (szybka)")
+            short_prompt = build_analysis_prompt("Faktury", "Opis procesu.", "Podstawowa (szybka)")
+
+        assert count_tokens(prompt) <= count_tokens(short_prompt) + 300
+
+
+class TestBudget:
+    """Testy budżetu odpowiedzi"""
+
+    def test_completion_budget_per_depth(self):
+        """Szybka analiza ma mniejszy limit odpowiedzi niż pogłębiona"""
+        assert token_budget.completion_budget("Podstawowa (szybka)") < token_budget.completion_budget("Ekspercka (pełna analiza)")
+        assert token_budget.completion_budget("Nieznana") == token_budget.DEFAULT_COMPLETION_BUDGET
+
+    def test_fallback_count_overestimates(self):
+        """Bez tiktoken liczba tokenów szacowana jest ze znaków, zaokrąglona w górę"""
+        with patch.object(token_budget, "_encoding", return_value=None):
+            assert count_tokens("abcd") == 2
+            assert count_tokens("") == 0
+
+
+class TestUsageLedger:
+    """Testy rejestru zużycia tokenów"""
+
+    def test_averages_per_depth(self):
+        """Średnie liczone osobno dla każdej głębokości"""
+        ledger = UsageLedger()
+        ledger.record("Podstawowa (szybka)", 200, 800, counted_prompt_tokens=210)
+        ledger.record("Podstawowa (szybka)", 400, 1200, counted_prompt_tokens=390)
+        ledger.record("Ekspercka (pełna analiza)", 1000, 3000)
+
+        averages = ledger.averages()
+
+        quick = averages["Podstawowa (szybka)"]
+        assert quick["analyses"] == 2
+        assert quick["prompt_tokens"] == 300
+        assert quick["completion_tokens"] == 1000
+        assert quick["total_tokens"] == 1300
+        assert quick["counted_prompt_tokens"] == 300
+        assert quick["cost_usd"] == pytest.approx(token_budget.estimate_cost(300, 1000))
+        assert averages["Ekspercka (pełna analiza)"]["analyses"] == 1
+
+    def test_response_without_usage_ignored(self):
+        """Odpowiedź bez usage (np. mock) nie zmienia rejestru"""
+        ledger = UsageLedger()
+
+        assert ledger.record_response("Podstawowa (szybka)", None) is False
+        assert ledger.record_response("Podstawowa (szybka)", Mock()) is False
+        assert ledger.averages() == {}
+
+    @pytest.mark.usefixtures("live_ai_mode")
+    @patch('smartflowai.ai.openai_client')
+    def test_analysis_records_usage(self, mock_openai):
+        """analyze_with_ai zapisuje tokeny z odpowiedzi API"""
+        from smartflowai.ai import analyze_with_ai
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Analiza"
+        mock_response.usage = SimpleNamespace(prompt_tokens=512, completion_tokens=1024, total_tokens=1536)
+        mock_openai.chat.completions.create.return_value = mock_response
+
+        with patch.object(token_budget, "usage_ledger", UsageLedger()) as ledger:
+            analyze_with_ai("Faktury", "Ręczne tworzenie faktur w Excelu", "Ekspercka (pełna analiza)")
+
+        averages = ledger.averages()["Ekspercka (pełna analiza)"]
+        assert averages["prompt_tokens"] == 512
+        assert averages["completion_tokens"] == 1024
+        assert mock_openai.chat.completions.create.call_args[1]['max_tokens'] == token_budget.completion_budget("Ekspercka (pełna analiza)")
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Plik: text_sanitizer.py
+# text_sanitizer.py - Wspólne czyszczenie tekstu dla eksportu PDF, TXT i CLI
+
+"""
+Czyszczenie tekstu analiz przed eksportem.
+
+Tabela str.translate i wyrażenia regularne budowane są raz, przy imporcie
+modułu. safe_text dzieli tekst skompilowanym wyrażeniem na fragmenty ASCII
+i ciągi znaków specjalnych - tylko te drugie trafiają do tabeli translate
+(z pamięcią podręczną), zamiast kilkudziesięciu str.replace i pętli po
+każdym znaku w Pythonie.
+
+- safe_text: ASCII dla czcionek wbudowanych PDF (polskie znaki bez ogonków, emoji jako [ETYKIETA])
+- flatten_text: jedna linia ze spłaszczonymi białymi znakami (opcjonalnie skrócona)
+- clean_text: tekst do TXT/konsoli - zachowuje Unicode i podział na linie, usuwa znaki sterujące
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+POLISH_TO_ASCII = {
+    'ą': 'a', 'ć': 'c', 'ę': 'e', 'ł': 'l', 'ń': 'n', 'ó': 'o', 'ś': 's', 'ź': 'z', 'ż': 'z',
+    'Ą': 'A', 'Ć': 'C', 'Ę': 'E', 'Ł': 'L', 'Ń': 'N', 'Ó': 'O', 'Ś': 'S', 'Ź': 'Z', 'Ż': 'Z'
+}
+
+# Emoji używane w analizach AI - zamieniane na opis zamiast usuwania
+EMOJI_LABELS = {
+    '🔍': ' [ANALIZA] ',
+    '⚠️': ' [PROBLEMY] ',
+    '🛠️': ' [ROZWIAZANIE] ',
+    '💰': ' [INWESTYCJA] ',
+    '⏱️': ' [OSZCZEDNOSCI] ',
+    '📋': ' [PLAN] ',
+    '⚡': ' [KROKI] ',
+    '🎯': ' [REZULTATY] ',
+    '🤖': ' [AI] ',
+    '✅': ' [OK] ',
+    '❌': ' [BLAD] ',
+    '📄': ' [PDF] ',
+    '✏️': ' [EDYTUJ] ',
+    '🗑️': ' [USUN] ',
+    '💾': ' [ZAPISZ] ',
+    '🚀': ' [START] ',
+    '📊': ' [DANE] ',
+    '🔧': ' [NARZEDZIA] ',
+    '📈': ' [WZROST] ',
+    '💡': ' [POMYSL] ',
+    '🎉': ' [SUKCES] '
+}
+
+VARIATION_SELECTOR = '\ufe0f'
+
+
+class _TranslationTable(dict):
+    """Tabela translate usuwająca znaki, których nie ma w tabeli"""
+
+    def __missing__(self, key):
+        return None
+
+
+def _build_ascii_table() -> _TranslationTable:
+    """Tabela translate: polskie znaki, emoji i białe znaki; pozostałe znaki są usuwane"""
+    table = dict(POLISH_TO_ASCII)
+    for emoji, label in EMOJI_LABELS.items():
+        # Emoji typu '⚠️' to znak bazowy + selektor wariantu (usuwany jako nieznany)
+        table[emoji.replace(VARIATION_SELECTOR, '')] = label
+    table.update({'\n': ' ', '\r': ' ', '\t': ' '})
+    return _TranslationTable(str.maketrans(table))
+
+
+_ASCII_TABLE = _build_ascii_table()
+# Ciągi znaków spoza drukowalnego ASCII - tylko one przechodzą przez tabelę translate
+_NON_PRINTABLE_RUN = re.compile(r'([^\x20-\x7e]+)')
+# Znaki sterujące poza \t i \n (w tym \r z plików Windows) - niebezpieczne w TXT i konsoli
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b-\x1f\x7f\ufeff]')
+_WINDOWS_NEWLINES = re.compile(r'\r\n?')
+
+
+@lru_cache(maxsize=4096)
+def _translate_run(run: str) -> str:
+    """Tłumaczy ciąg znaków specjalnych (te same ciągi, np. 'ó' czy '🔍', powtarzają się)"""
+    return run.translate(_ASCII_TABLE)
+
+
+def safe_text(text) -> str:
+    """Tekst bezpieczny dla czcionek wbudowanych PDF (ASCII 32-126)"""
+    if not text:
+        return ""
+    # split z grupą zwraca na przemian fragmenty ASCII i ciągi znaków specjalnych
+    parts = _NON_PRINTABLE_RUN.split(str(text))
+    parts[1::2] = map(_translate_run, parts[1::2])
+    return ''.join(parts)
+
+
+def flatten_text(text, max_length: Optional[int] = None) -> str:
+    """Spłaszcza białe znaki do pojedynczych spacji; skraca tylko gdy podano max_length"""
+    if not text:
+        return ""
+
+    flat = ' '.join(str(text).split())
+    if max_length and len(flat) > max_length:
+        flat = flat[:max_length] + "..."
+    return flat
+
+
+def clean_text(text) -> str:
+    """Tekst do eksportu TXT/CLI - Unicode i podział na linie zachowane, znaki sterujące usunięte"""
+    if not text:
+        return ""
+    return _CONTROL_CHARS.sub('', _WINDOWS_NEWLINES.sub('\n', str(text)))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Plik: token_budget.py
+# token_budget.py - Liczenie tokenów i budżet zapytań analizy AI
+
+"""
+Rozliczanie tokenów analiz AI.
+
+- count_tokens: liczba tokenów promptu liczona lokalnie, przed wysłaniem
+  (tiktoken, jeśli jest zainstalowany; w przeciwnym razie zawyżony szacunek
+  ze znaków - bezpieczny dla limitera TPM)
+- trim_text: deterministyczne skracanie zbyt długich opisów (początek
+  i koniec tekstu, środek zastąpiony znacznikiem) - ten sam opis daje
+  zawsze ten sam prompt, więc cache odpowiedzi nadal działa
+- completion_budget: max_tokens odpowiedzi dla głębokości analizy
+- usage_ledger: rejestr tokenów z odpowiedzi API ze średnimi na głębokość
+
+Rozmiar promptów bez wywołania API:
+python token_budget.py
+"""
+
+import logging
+import math
+import os
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4o"
+
+# Maksymalna długość odpowiedzi (max_tokens) dla głębokości analizy
+COMPLETION_BUDGETS = {
+    "Podstawowa (szybka)": 2000,
+    "Pogłębiona (z wyszukiwaniem)": 3000,
+    "Ekspercka (pełna analiza)": 3000,
+}
+DEFAULT_COMPLETION_BUDGET = 3000
+
+# Limity danych od użytkownika wstawianych do promptu
+DEFAULT_MAX_TITLE_TOKENS = 100
+DEFAULT_MAX_DESCRIPTION_TOKENS = 2000
+TRIM_MARKER = "\n[...]\n"
+
+# Szacunek bez tiktoken - polski tekst to ok. 3-4 znaki na token, zaokrąglamy w górę
+CHARS_PER_TOKEN = 3.0
+
+# Cennik gpt-4o w USD za 1M tokenów (do szacowania kosztów, nie do rozliczeń)
+PRICE_PER_MILLION = {"prompt": 2.50, "completion": 10.00}
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """Koder tiktoken dla modelu (None, gdy biblioteka lub plik słownika są niedostępne)"""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(MODEL)
+    except Exception as e:
+        logger.info(f"TOKEN_COUNT: tiktoken niedostępny, szacunek ze znaków ({str(e)})")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Liczba tokenów tekstu dla MODEL"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def trim_text(text: str, max_tokens: int) -> str:
+    """Skraca tekst do max_tokens zostawiając 2/3 początku i 1/3 końca"""
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+
+    budget = max(0, max_tokens - count_tokens(TRIM_MARKER))
+    head_size = budget * 2 // 3
+    tail_size = budget - head_size
+
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        head = encoding.decode(tokens[:head_size])
+        tail = encoding.decode(tokens[len(tokens) - tail_size:]) if tail_size else ""
+        # Cięcie w środku znaku wielobajtowego daje znak zastępczy
+        head, tail = head.rstrip("\ufffd"), tail.lstrip("\ufffd")
+    else:
+        head_chars = int(head_size * CHARS_PER_TOKEN)
+        tail_chars = int(tail_size * CHARS_PER_TOKEN)
+        head = text[:head_chars]
+        tail = text[len(text) - tail_chars:] if tail_chars else ""
+
+    return f"{head.rstrip()}{TRIM_MARKER}{tail.lstrip()}"
+
+
+def max_description_tokens() -> int:
+    return int(os.getenv("MAX_DESCRIPTION_TOKENS", DEFAULT_MAX_DESCRIPTION_TOKENS))
+
+
+def trim_process_input(title: str, description: str):
+    """Nazwa i opis procesu przycięte do limitów promptu"""
+    return trim_text(title, DEFAULT_MAX_TITLE_TOKENS), trim_text(description, max_description_tokens())
+
+
+def completion_budget(analysis_depth: str) -> int:
+    """max_tokens odpowiedzi dla głębokości analizy"""
+    return COMPLETION_BUDGETS.get(analysis_depth, DEFAULT_COMPLETION_BUDGET)
+
+
+def estimate_cost(prompt_tokens: float, completion_tokens: float) -> float:
+    """Szacowany koszt zapytania w USD"""
+    return (prompt_tokens * PRICE_PER_MILLION["prompt"] + completion_tokens * PRICE_PER_MILLION["completion"]) / 1_000_000
+
+
+class UsageLedger:
+    """Rejestr zużycia tokenów z odpowiedzi API, wspólny dla wątków procesu"""
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, analysis_depth: str, prompt_tokens: int, completion_tokens: int, counted_prompt_tokens: int = None):
+        """Zapisuje zużycie jednej analizy (counted_prompt_tokens - wynik count_tokens przed wysłaniem)"""
+        with self._lock:
+            totals = self._totals.setdefault(analysis_depth, {
+                "analyses": 0, "prompt_tokens": 0, "completion_tokens": 0, "counted_prompt_tokens": 0
+            })
+            totals["analyses"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["counted_prompt_tokens"] += counted_prompt_tokens if counted_prompt_tokens is not None else prompt_tokens
+
+    def record_response(self, analysis_depth: str, usage, counted_prompt_tokens: int = None) -> bool:
+        """Zapisuje usage z odpowiedzi OpenAI; False, gdy odpowiedź go nie zawiera"""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+            return False
+
+        self.record(analysis_depth, prompt_tokens, completion_tokens, counted_prompt_tokens)
+        logger.info(f"TOKEN_USAGE: {analysis_depth}: prompt={prompt_tokens} completion={completion_tokens}")
+        return True
+
+    def averages(self) -> dict:
+        """Średnie na analizę dla każdej głębokości: tokeny promptu, odpowiedzi, razem i koszt"""
+        with self._lock:
+            snapshot = {depth: dict(totals) for depth, totals in self._totals.items()}
+
+        result = {}
+        for depth, totals in snapshot.items():
+            count = totals["analyses"]
+            prompt = totals["prompt_tokens"] / count
+            completion = totals["completion_tokens"] / count
+            result[depth] = {
+                "analyses": count,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "total_tokens": prompt + completion,
+                "counted_prompt_tokens": totals["counted_prompt_tokens"] / count,
+                "cost_usd": estimate_cost(prompt, completion)
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+usage_ledger = UsageLedger()
+
+
+def main():
+    """Rozmiar promptu i budżet tokenów dla każdej głębokości (przykładowy proces)"""
+    from smartflowai.ai import build_analysis_prompt
+
+    title = "Wystawianie faktur"
+    description = "Co miesiąc ręcznie tworzę faktury w Excelu na podstawie zamówień z maila i wysyłam je klientom."
+    tokenizer = "tiktoken" if _encoding() is not None else f"szacunek ({CHARS_PER_TOKEN} znaki/token)"
+    print(f"Model: {MODEL}, liczenie: {tokenizer}")
+    for depth in COMPLETION_BUDGETS:
+        prompt_tokens = count_tokens(build_analysis_prompt(title, description, depth, "1-10 osób", "Księgowość", "do 500 zł/mies"))
+        completion_tokens = completion_budget(depth)
+        print(f"{depth:32} prompt: {prompt_tokens:6} max odpowiedź: {completion_tokens:6} "
+              f"maks. koszt: ${estimate_cost(prompt_tokens, completion_tokens):.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())